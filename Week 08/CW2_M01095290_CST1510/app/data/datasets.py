@@ -1,37 +1,43 @@
 import pandas as pd
-from app.data.db import connect_database
+from app.data.db import db_connection
+from app.data.lookups import code_map
+from app.data.pagination import keyset_page_query
 
 
 def insert_dataset(dataset_name, category, source, last_updated, record_count, file_size_mb):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO datasets_metadata
-        (dataset_name, category, source, last_updated, record_count, file_size_mb)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (dataset_name, category, source, last_updated, record_count, file_size_mb))
-    conn.commit()
-    dataset_id = cursor.lastrowid
-    conn.close()
-    return dataset_id
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO datasets_metadata
+            (dataset_name, category_id, source, last_updated, record_count, file_size_mb)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (dataset_name, code_map.encode(conn, "category", category),
+              source, last_updated, record_count, file_size_mb))
+        conn.commit()
+        return cursor.lastrowid
 
 
 def get_all_datasets():
-    conn = connect_database()
-    df = pd.read_sql_query(
-        "SELECT * FROM datasets_metadata ORDER BY id DESC",
-        conn
-    )
-    conn.close()
-    return df
+    with db_connection() as conn:
+        df = pd.read_sql_query(
+            "SELECT * FROM datasets_metadata ORDER BY id DESC",
+            conn
+        )
+    return code_map.decode_frame(df, "datasets_metadata")
+
+
+def get_datasets_page(after_id=None, page_size=50):
+    """Return up to page_size datasets with id < after_id, newest first."""
+    sql, params = keyset_page_query("datasets_metadata", after_id, page_size)
+    with db_connection() as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+    return code_map.decode_frame(df, "datasets_metadata")
 
 
 def delete_dataset(dataset_id):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "DELETE FROM datasets_metadata WHERE id = ?",
-        (dataset_id,)
-    )
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        conn.execute(
+            "DELETE FROM datasets_metadata WHERE id = ?",
+            (dataset_id,)
+        )
+        conn.commit()
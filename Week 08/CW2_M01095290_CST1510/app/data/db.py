@@ -1,17 +1,161 @@
 """Database Connection and Setup Module"""
 
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 # Define the database path
 DB_PATH = Path("DATA") / "intelligence_platform.db"
 
+# Connection tuning, applied once when a pooled connection is opened
+POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 16 * 1024
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
 
-def connect_database(db_path=DB_PATH):
-    """Connect to SQLite database. Creates file if it doesn't exist."""
-    # Ensure the DATA directory exists
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(str(db_path))
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._end_hooks = []
+
+    def on_transaction_end(self, callback):
+        """Call callback(committed) once the current transaction commits or rolls back."""
+        self._end_hooks.append(callback)
+
+    def _end_transaction(self, committed):
+        hooks, self._end_hooks = self._end_hooks, []
+        for hook in hooks:
+            hook(committed)
+
+    def commit(self):
+        super().commit()
+        self._end_transaction(True)
+
+    def rollback(self):
+        super().rollback()
+        self._end_transaction(False)
+
+    def close(self):
+        pool = getattr(self, "_pool", None)
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def force_close(self):
+        """Really close the underlying SQLite handle."""
+        self._pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Thread-aware pool of tuned SQLite connections for a single database file.
+    Each connection is lent to one borrower at a time, so it can safely move
+    between threads (check_same_thread is disabled for that reason).
+    """
+
+    def __init__(self, db_path, max_size=POOL_SIZE):
+        self.db_path = Path(db_path)
+        self.max_size = max_size
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        # Ensure the DATA directory exists (once, not on every connect)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _open(self):
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        # Rows removed by INSERT OR REPLACE fire DELETE triggers (e.g. the
+        # fuzzy trigram index) only with recursive triggers on
+        conn.execute("PRAGMA recursive_triggers = ON")
+        conn._pool = self
+        return conn
+
+    def acquire(self):
+        """Borrow an idle connection, opening a new one if none is free."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        conn._pool = self
+        conn._borrowed = True
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any open transaction."""
+        if not getattr(conn, "_borrowed", False):
+            return
+        conn._borrowed = False
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.force_close()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        """Close every idle connection (borrowed ones close when returned)."""
+        while True:
+            try:
+                self._idle.get_nowait().force_close()
+            except queue.Empty:
+                break
+
+
+def get_pool(db_path=None):
+    """Return the shared pool for db_path, creating it on first use."""
+    db_path = Path(db_path if db_path is not None else DB_PATH)
+    key = str(db_path.resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(db_path)
+    return pool
+
+
+def connect_database(db_path=None):
+    """
+    Borrow a pooled connection to the SQLite database (creates the file if
+    it doesn't exist). Calling close() on it returns it to the pool.
+    """
+    return get_pool(db_path).acquire()
+
+
+@contextmanager
+def db_connection(db_path=None):
+    """Borrow a pooled connection for the duration of a with-block."""
+    with get_pool(db_path).connection() as conn:
+        yield conn
 
 
 def close_database(conn):
@@ -20,6 +164,15 @@ def close_database(conn):
         conn.close()
 
 
+def close_all_connections():
+    """Close every pooled connection, e.g. before deleting the database file."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
 def setup_database():
     """
     Initializes the database structure by creating all necessary tables
@@ -0,0 +1,367 @@
+"""
+Typo-tolerant lookup for ticket subjects and usernames.
+
+Each column gets an FTS5 trigram index, kept in sync by triggers. The
+search text is split into segments: every word, plus its first and last
+three letters, or for words of 7+ letters the halves either side of the
+middle letter. A typo (a wrong, missing, extra or swapped letter) breaks at
+most one of those, so the right row still contains the other segments. A
+segment matches a row when the row has the trigrams that cover it.
+
+Lookups run in up to three passes:
+1. Rows matching one whole word and one segment of another word, plus rows
+   where a whole word sits next to the first or last letters of a short
+   word (4-6 letters) - one swap can break both ends of a short word, but
+   not its neighbour. At most one word has the typo, and these
+   intersections are small and cheap.
+2. Only if pass 1 finds nothing close enough: any two segments, including
+   both ends of a single word.
+3. Only if pass 2 finds nothing: any single trigram of the text. A typo
+   can break every segment of a short word ('Tciket' shares only 'ket'
+   with 'Ticket'). This pass reads at most CANDIDATE_ROWS rows, so on
+   large tables it is a best effort.
+Candidates are ordered by trigram overlap, then re-ranked by edit distance
+in Python. The indexes are built by create_all_tables, not on lookup.
+"""
+
+import itertools
+import re
+import sqlite3
+import time
+
+from app.data.db import db_connection
+
+# table -> text columns to index, first one present wins (older to_sql
+# imports of it_tickets have 'title' instead of 'subject')
+FUZZY_COLUMNS = {
+    "it_tickets": ("subject", "title"),
+    "users": ("username",),
+}
+
+# Rows read from the index per pass, and how many of them (most shared
+# trigrams first) are re-ranked by edit distance
+CANDIDATE_ROWS = 1000
+CANDIDATES = 200
+
+# SQLite VM steps between checks of a lookup's optional deadline
+DEADLINE_CHECK_STEPS = 100
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_table(table):
+    return f"{table}_trigram"
+
+
+def _indexed_column(conn, table):
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for column in FUZZY_COLUMNS[table]:
+        if column in existing:
+            return column
+    return None
+
+
+def create_fuzzy_index(conn, table):
+    """
+    Create the trigram index and its sync triggers for one table and fill
+    it from the existing rows. Returns the indexed column.
+    """
+    column = _indexed_column(conn, table)
+    if column is None:
+        return None
+    fts = _fts_table(table)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).fetchone()
+    if not exists:
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE {fts} USING fts5(
+                {column},
+                content='{table}',
+                content_rowid='rowid',
+                tokenize='trigram',
+                detail='none'
+            )
+        """)
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts} (rowid, {column}) VALUES (NEW.rowid, NEW.{column});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', OLD.rowid, OLD.{column});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {column} ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', OLD.rowid, OLD.{column});
+            INSERT INTO {fts} (rowid, {column}) VALUES (NEW.rowid, NEW.{column});
+        END
+    """)
+    conn.commit()
+    return column
+
+
+def create_fuzzy_indexes(conn):
+    for table in FUZZY_COLUMNS:
+        create_fuzzy_index(conn, table)
+    print(" Fuzzy lookup indexes created")
+
+
+def trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def substring_distance(query, text):
+    """
+    Edit distance between query and the closest substring of text, so
+    'john doe' matches 'Reset Password - John Doe' with distance 0. Swapping
+    two adjacent letters counts as one edit.
+
+    Uses the bit-parallel algorithm of Myers (1999) with Hyyro's (2003)
+    transposition extension: one pass over text, with bit i of each mask
+    standing for query[i].
+    """
+    query = query.lower()
+    text = text.lower()
+    if not query:
+        return 0
+    match_masks = {}
+    for i, char in enumerate(query):
+        match_masks[char] = match_masks.get(char, 0) | (1 << i)
+    mask = (1 << len(query)) - 1
+    last = 1 << (len(query) - 1)
+
+    vertical_up, vertical_down = mask, 0
+    diagonal_zero, previous_match = 0, 0
+    score = best = len(query)
+    for char in text:
+        match = match_masks.get(char, 0)
+        swapped = (((~diagonal_zero) & match) << 1) & previous_match
+        diagonal_zero = (((match & vertical_up) + vertical_up) ^ vertical_up) | match | vertical_down | swapped
+        horizontal_up = vertical_down | (~(diagonal_zero | vertical_up) & mask)
+        horizontal_down = vertical_up & diagonal_zero
+        if horizontal_up & last:
+            score += 1
+        elif horizontal_down & last:
+            score -= 1
+        # A match may start anywhere in text, so nothing is shifted in
+        horizontal_up = (horizontal_up << 1) & mask
+        horizontal_down = (horizontal_down << 1) & mask
+        vertical_up = horizontal_down | (~(diagonal_zero | horizontal_up) & mask)
+        vertical_down = horizontal_up & diagonal_zero
+        previous_match = match
+        best = min(best, score)
+    return best
+
+
+def _segments(text):
+    """One list per word: the word itself, then from 4 letters its two ends."""
+    words = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if len(word) < 3:
+            continue
+        segments = {word}
+        if len(word) >= 7:
+            # Leaving out the middle letter means one swap can't break both
+            middle = (len(word) - 1) // 2
+            segments.add(word[:middle])
+            segments.add(word[middle + 1:])
+        elif len(word) >= 4:
+            segments.add(word[:3])
+            segments.add(word[-3:])
+        words.append([word] + sorted(segments - {word}))
+    return words
+
+
+def _clause(segment):
+    """
+    FTS5 query for rows containing trigrams that cover segment: every third
+    one plus the last ('lintanpeka' -> lin, tan, pek, eka). Ranking checks
+    the whole text anyway, and fewer terms mean fewer index reads.
+    """
+    segment = segment.lower()
+    grams = sorted({segment[i:i + 3] for i in range(0, len(segment) - 2, 3)} | {segment[-3:]})
+    return "(" + " AND ".join('"' + g.replace('"', '""') + '"' for g in grams) + ")"
+
+
+def _word_clause(word):
+    """FTS5 query for rows containing word: all of its trigrams."""
+    segment = word.lower()
+    grams = sorted({segment[i:i + 3] for i in range(len(segment) - 2)})
+    return "(" + " AND ".join('"' + g.replace('"', '""') + '"' for g in grams) + ")"
+
+
+def _pairs_query(pairs):
+    return " OR ".join(f"({_clause(a)} AND {_clause(b)})" for a, b in pairs)
+
+
+def _whole_word_query(words):
+    """FTS5 query for rows with one whole word and a segment of another."""
+    terms = []
+    for i, word in enumerate(words):
+        # Rows with the other whole word also have its ends, so the ends suffice
+        others = [
+            segment
+            for j, other in enumerate(words) if j != i
+            for segment in (other[1:] or other)
+        ]
+        terms.append(f"({_word_clause(word[0])} AND ({' OR '.join(_clause(s) for s in others)}))")
+    return " OR ".join(terms)
+
+
+def _neighbour_query(text):
+    """
+    FTS5 query for rows where a word of text sits next to the first or
+    last letter of a short neighbour ('kuzo viar' -> 'kuzo v', 'kuzo i').
+    A swap inside a 4-6 letter word can break both of its ends, but leaves
+    the word next to it whole; the second letter covers a swap of the
+    first two. Returns '' when no word is short.
+    """
+    tokens = text.lower().split()
+    terms = set()
+    for left, right in zip(tokens, tokens[1:]):
+        if 4 <= len(right) < 7 and len(left) >= 3:
+            for char in dict.fromkeys(right[:2]):
+                terms.add(f"{left} {char}")
+        if 4 <= len(left) < 7 and len(right) >= 3:
+            for char in dict.fromkeys(left[-2:]):
+                terms.add(f"{char} {right}")
+    return " OR ".join(_clause(term) for term in sorted(terms))
+
+
+def _past(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+
+def _read_rows(conn, sql, params, deadline):
+    """
+    Run a query until it finishes or deadline (a time.perf_counter() value,
+    or None for no limit) passes; returns the rows read until then.
+    """
+    if deadline is None:
+        return conn.execute(sql, params).fetchall()
+    rows = []
+    conn.set_progress_handler(lambda: time.perf_counter() > deadline, DEADLINE_CHECK_STEPS)
+    try:
+        for row in conn.execute(sql, params):
+            rows.append(row)
+    except sqlite3.OperationalError as error:
+        if "interrupted" not in str(error):
+            raise
+    finally:
+        conn.set_progress_handler(None, 0)
+    return rows
+
+
+def _matching_rows(conn, table, column, match, deadline):
+    fts = _fts_table(table)
+    return _read_rows(conn, f"""
+        SELECT t.rowid, t.{column}
+        FROM {fts}
+        JOIN {table} AS t ON t.rowid = {fts}.rowid
+        WHERE {fts} MATCH ?
+        LIMIT ?
+    """, (match, CANDIDATE_ROWS), deadline)
+
+
+def _rank(text, rows, k):
+    """
+    The k closest (rowid, value, distance) for the rows, closest first.
+
+    Rows are tried in order of shared trigrams. One edit removes at most 4
+    of the query's trigrams, so a row sharing s of its t trigrams is at
+    least (t - s) / 4 edits away; once that bound passes the k-th best
+    distance found, no later row can get in and the rest are skipped.
+    """
+    query_grams = trigrams(text)
+    counted = []
+    for rowid, value in rows:
+        if value is None:
+            continue
+        # Substring tests are much cheaper than a trigram set per row
+        lowered = value.lower()
+        counted.append((sum(gram in lowered for gram in query_grams), rowid, value))
+    counted.sort(key=lambda row: row[0], reverse=True)
+
+    scored = []
+    for shared, rowid, value in counted[:CANDIDATES]:
+        if len(scored) >= k and -(-(len(query_grams) - shared) // 4) > scored[k - 1][2]:
+            break
+        scored.append((rowid, value, substring_distance(text, value)))
+        scored.sort(key=lambda row: (row[2], abs(len(row[1]) - len(text))))
+        del scored[k:]
+    return scored
+
+
+def max_distance(text):
+    """Distance below which a first-pass match is accepted (~1 typo per 5 chars)."""
+    return max(1, len(text) // 5)
+
+
+def fuzzy_find(text, k=10, table="it_tickets", deadline_ms=None):
+    """
+    Return up to k (rowid, value, distance) tuples for the rows of table
+    whose indexed column best matches text, closest first.
+
+    With deadline_ms, index reads stop that long after the lookup started
+    and only the rows read by then are ranked, so closer rows may be
+    missing. By default every pass runs to completion.
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+    deadline = None
+    if deadline_ms is not None:
+        deadline = time.perf_counter() + deadline_ms / 1000
+    with db_connection() as conn:
+        column = _indexed_column(conn, table)
+        if column is None:
+            return []
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (_fts_table(table),)
+        ).fetchone()
+        if not exists:
+            raise ValueError(f"Table '{table}' has no fuzzy index; run create_all_tables first")
+
+        words = _segments(text)
+        if not words:
+            # Too short for trigrams: plain prefix match on the table
+            rows = _read_rows(
+                conn,
+                f"SELECT rowid, {column} FROM {table} WHERE {column} LIKE ? LIMIT ?",
+                (f"{text}%", CANDIDATES),
+                deadline
+            )
+            return _rank(text, rows, k)
+
+        if len(words) > 1:
+            neighbours = _neighbour_query(text)
+            rows = _matching_rows(conn, table, column, neighbours, deadline) if neighbours else []
+            seen = {row[0] for row in rows}
+            rows += [
+                row for row in _matching_rows(conn, table, column, _whole_word_query(words), deadline)
+                if row[0] not in seen
+            ]
+            scored = _rank(text, rows, k)
+            if (scored and scored[0][2] <= max_distance(text)) or _past(deadline):
+                return scored
+
+        # Pairs of ends cover every pair that includes a whole word
+        segments = sorted({segment for word in words for segment in (word[1:] or word)})
+        if len(segments) > 1:
+            match = _pairs_query(itertools.combinations(segments, 2))
+            scored = _rank(text, _matching_rows(conn, table, column, match, deadline), k)
+            if scored or _past(deadline):
+                return scored
+
+        match = " OR ".join(_clause(gram) for gram in sorted(trigrams(text)))
+        return _rank(text, _matching_rows(conn, table, column, match, deadline), k)
@@ -1,60 +1,66 @@
 import pandas as pd
-from app.data.db import connect_database
+from app.data.db import db_connection
+from app.data.lookups import code_map
+from app.data.pagination import keyset_page_query
 
 
 def insert_incident(date, incident_type, severity, status, description, reported_by=None):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO cyber_incidents
-        (date, incident_type, severity, status, description, reported_by)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (date, incident_type, severity, status, description, reported_by)) # Fixed here!
-    conn.commit()
-    incident_id = cursor.lastrowid
-    conn.close()
-    return incident_id
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO cyber_incidents
+            (date, incident_type_id, severity_id, status_id, description, reported_by)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (date,
+              code_map.encode(conn, "incident_type", incident_type),
+              code_map.encode(conn, "severity", severity),
+              code_map.encode(conn, "status", status),
+              description, reported_by))
+        conn.commit()
+        return cursor.lastrowid
 
 
 def get_all_incidents():
-    conn = connect_database()
-    df = pd.read_sql_query(
-        "SELECT * FROM cyber_incidents ORDER BY id DESC",
-        conn
-    )
-    conn.close()
-    return df
+    with db_connection() as conn:
+        df = pd.read_sql_query(
+            "SELECT * FROM cyber_incidents ORDER BY id DESC",
+            conn
+        )
+    return code_map.decode_frame(df, "cyber_incidents")
+
+
+def get_incidents_page(after_id=None, page_size=50):
+    """Return up to page_size incidents with id < after_id, newest first."""
+    sql, params = keyset_page_query("cyber_incidents", after_id, page_size)
+    with db_connection() as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+    return code_map.decode_frame(df, "cyber_incidents")
 
 
 def update_incident_status(incident_id, new_status):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE cyber_incidents SET status = ? WHERE id = ?",
-        (new_status, incident_id)
-    )
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        conn.execute(
+            "UPDATE cyber_incidents SET status_id = ? WHERE id = ?",
+            (code_map.encode(conn, "status", new_status), incident_id)
+        )
+        conn.commit()
 
 
 def delete_incident(incident_id):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "DELETE FROM cyber_incidents WHERE id = ?",
-        (incident_id,)
-    )
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        conn.execute(
+            "DELETE FROM cyber_incidents WHERE id = ?",
+            (incident_id,)
+        )
+        conn.commit()
 
 
 def get_incidents_by_type():
-    conn = connect_database()
-    df = pd.read_sql_query("""
-        SELECT incident_type, COUNT(*) as count
-        FROM cyber_incidents
-        GROUP BY incident_type
-        ORDER BY count DESC
-    """, conn)
-    conn.close()
-    return df
+    with db_connection() as conn:
+        df = pd.read_sql_query("""
+            SELECT incident_type_id, COUNT(*) as count
+            FROM cyber_incidents
+            GROUP BY incident_type_id
+            ORDER BY count DESC
+        """, conn)
+    return code_map.decode_frame(df, "cyber_incidents")
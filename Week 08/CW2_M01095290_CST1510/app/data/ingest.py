@@ -0,0 +1,265 @@
+"""Chunked CSV ingestion into the tables declared in schema.py"""
+
+import csv
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from app.data.db import db_connection
+from app.data.lookups import CODED_COLUMNS, code_column, code_map
+
+# Rows parsed and written per transaction; bounds memory for any file size
+CHUNK_SIZE = 5000
+
+# Size of the byte ranges parsed by each worker in parallel mode
+RANGE_BYTES = 4 * 1024 * 1024
+
+
+def _kb_to_mb(value):
+    return round(float(value) / 1024, 3)
+
+
+# CSV column -> [(schema column, converter)] where the CSV exports in DATA/
+# don't use the names from schema.py. Columns not listed map by name.
+COLUMN_MAPPINGS = {
+    "it_tickets": {
+        "id": [("id", None), ("ticket_id", str)],
+        "title": [("subject", None)],
+    },
+    "datasets_metadata": {
+        "name": [("dataset_name", None)],
+        "size": [("file_size_mb", _kb_to_mb)],
+    },
+}
+
+# Default CSV file for each table
+CSV_FILES = {
+    "users": "users.csv",
+    "cyber_incidents": "cyber_incidents.csv",
+    "it_tickets": "it_tickets.csv",
+    "datasets_metadata": "datasets_metadata.csv",
+}
+
+
+def _schema_columns(conn, table):
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    if not columns:
+        raise ValueError(f"Table '{table}' does not exist; run create_all_tables first")
+    return columns
+
+
+def build_column_plan(header, table, schema_columns):
+    """
+    Work out which CSV column feeds which schema column.
+    Returns a list of (csv index, schema column, converter).
+    """
+    mappings = COLUMN_MAPPINGS.get(table, {})
+    plan = []
+    for index, name in enumerate(header):
+        targets = list(mappings.get(name, []))
+        # Label columns are stored as lookup codes
+        if name in CODED_COLUMNS.get(table, {}):
+            targets.append((code_column(name), None))
+        # Tables created by older to_sql loads still use the CSV names
+        if name not in (column for column, _ in targets):
+            targets.append((name, None))
+        for column, converter in targets:
+            if column in schema_columns:
+                plan.append((index, column, converter))
+    if not plan:
+        raise ValueError(f"No CSV columns match the '{table}' schema")
+    return plan
+
+
+def coded_positions(table, plan):
+    """
+    (position in the parameter tuple, lookup domain) for every plan column
+    that holds a lookup code. Labels are encoded by the writing connection so
+    codes stay consistent when rows are parsed in other processes.
+    """
+    domains = {code_column(column): domain
+               for column, domain in CODED_COLUMNS.get(table, {}).items()}
+    return [(position, domains[column])
+            for position, (_, column, _) in enumerate(plan) if column in domains]
+
+
+def convert_row(row, plan):
+    """Turn one parsed CSV row into a parameter tuple ('' becomes NULL)."""
+    values = []
+    for index, _, converter in plan:
+        value = row[index] if index < len(row) else ""
+        if value == "":
+            values.append(None)
+        elif converter is None:
+            values.append(value)
+        else:
+            values.append(converter(value))
+    return tuple(values)
+
+
+def insert_sql(table, plan):
+    # REPLACE deletes the conflicting row first; pooled connections turn on
+    # recursive_triggers so that delete reaches the table's triggers
+    columns = ", ".join(column for _, column, _ in plan)
+    placeholders = ", ".join("?" for _ in plan)
+    return f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})"
+
+
+def iter_chunks(reader, plan, chunk_size=CHUNK_SIZE):
+    """Yield lists of at most chunk_size converted rows from a csv reader."""
+    chunk = []
+    for row in reader:
+        if not row:
+            continue
+        chunk.append(convert_row(row, plan))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ingest_csv(csv_path, table, replace=True, chunk_size=CHUNK_SIZE):
+    """
+    Stream a CSV file into an existing table in chunks, one transaction per
+    chunk. With replace=True the table is emptied first (in the same
+    transaction as the first chunk), but its declared schema is kept.
+
+    Returns a dict with the row count, elapsed seconds and rows/sec.
+    """
+    csv_path = Path(csv_path)
+    start = time.perf_counter()
+    rows = 0
+
+    with db_connection() as conn, open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {"table": table, "rows": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+
+        plan = build_column_plan(header, table, _schema_columns(conn, table))
+        sql = insert_sql(table, plan)
+        positions = coded_positions(table, plan)
+
+        if replace:
+            conn.execute(f"DELETE FROM {table}")
+        for chunk in iter_chunks(reader, plan, chunk_size):
+            conn.executemany(sql, code_map.encode_rows(conn, chunk, positions))
+            conn.commit()
+            rows += len(chunk)
+        conn.commit()
+
+    seconds = time.perf_counter() - start
+    return {
+        "table": table,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else 0.0,
+    }
+
+
+def ingest_all(data_dir="DATA", tables=None, replace=True):
+    """Ingest every table's CSV from data_dir, printing a line per table."""
+    results = []
+    for table in tables or CSV_FILES:
+        csv_path = Path(data_dir) / CSV_FILES[table]
+        try:
+            result = ingest_csv(csv_path, table, replace=replace)
+            print(f" Loaded {result['rows']} rows into {table} "
+                  f"({result['rows_per_sec']:,.0f} rows/s)")
+            results.append(result)
+        except Exception as e:
+            print(f"  {table}: {e}")
+    return results
+
+
+def split_ranges(csv_path, range_bytes=RANGE_BYTES):
+    """
+    Split a CSV body into (start, end) byte ranges that each begin after the
+    header or a newline. Assumes no quoted field contains a line break,
+    which holds for the exports in DATA/.
+    """
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        ranges = []
+        while start < size:
+            f.seek(min(start + range_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_range(csv_path, start, end, plan):
+    """Parse one byte range into parameter tuples (runs in a worker process)."""
+    with open(csv_path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    return [convert_row(row, plan) for row in csv.reader(io.StringIO(text)) if row]
+
+
+def ingest_parallel(data_dir="DATA", tables=None, workers=4, replace=True,
+                    range_bytes=RANGE_BYTES):
+    """
+    Parse the CSVs for several tables concurrently in a process pool and
+    write the parsed batches through a single connection. At most
+    2 * workers batches are in flight, so memory stays bounded.
+
+    The DELETE (with replace=True) and every batch run in one transaction,
+    committed only after all batches are written: if any worker or insert
+    fails, everything is rolled back and the tables keep their old rows.
+    Readers see the old rows until the commit (WAL mode).
+
+    Returns a result dict per table like ingest_csv.
+    """
+    start = time.perf_counter()
+    results = {}
+    jobs = []
+
+    with db_connection() as conn:
+        for table in tables or CSV_FILES:
+            csv_path = Path(data_dir) / CSV_FILES[table]
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f), None)
+            results[table] = {"table": table, "rows": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+            if header is None:
+                continue
+            plan = build_column_plan(header, table, _schema_columns(conn, table))
+            sql = insert_sql(table, plan)
+            positions = coded_positions(table, plan)
+            for byte_range in split_ranges(csv_path, range_bytes):
+                jobs.append((table, sql, positions, csv_path, byte_range, plan))
+
+        if replace:
+            for table in results:
+                conn.execute(f"DELETE FROM {table}")
+
+        pending = {}
+        jobs.reverse()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while jobs or pending:
+                while jobs and len(pending) < 2 * workers:
+                    table, sql, positions, csv_path, (begin, end), plan = jobs.pop()
+                    future = pool.submit(parse_range, csv_path, begin, end, plan)
+                    pending[future] = (table, sql, positions)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table, sql, positions = pending.pop(future)
+                    rows = future.result()
+                    conn.executemany(sql, code_map.encode_rows(conn, rows, positions))
+                    results[table]["rows"] += len(rows)
+                    results[table]["seconds"] = time.perf_counter() - start
+
+        # Every batch is in; an exception above rolls the lot back
+        conn.commit()
+
+    for result in results.values():
+        if result["seconds"]:
+            result["rows_per_sec"] = result["rows"] / result["seconds"]
+    return list(results.values())
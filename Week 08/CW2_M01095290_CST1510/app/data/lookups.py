@@ -0,0 +1,259 @@
+"""
+Lookup tables for the low-cardinality columns.
+
+Severity, status, priority, category and incident type are stored as small
+integer codes (`<column>_id`) that reference one lookup table per domain,
+following the `statuses` table sketched in db.py. Codes are assigned from 0
+upwards so they can be handed straight to pandas.Categorical.from_codes.
+
+The CodeMap keeps every lookup table in memory; it is loaded once at
+startup. A new label is added to its lookup table inside the caller's
+transaction and only enters the CodeMap once that transaction commits, so
+a rolled-back insert cannot leave a code behind that the database no
+longer has. Severity, status and priority labels are normalized first
+('In Progress', 'in_progress' -> 'in-progress'), so differently cased
+spellings share one code.
+"""
+
+import threading
+
+import pandas as pd
+
+from app.data.db import PooledConnection, db_connection
+
+# domain -> lookup table
+LOOKUP_TABLES = {
+    "incident_type": "incident_type_lookup",
+    "severity": "severity_lookup",
+    "status": "status_lookup",
+    "priority": "priority_lookup",
+    "category": "category_lookup",
+}
+
+# table -> {label column: lookup domain}; stored as '<column>_id'
+CODED_COLUMNS = {
+    "cyber_incidents": {"incident_type": "incident_type", "severity": "severity", "status": "status"},
+    "it_tickets": {"priority": "priority", "status": "status", "category": "category"},
+    "datasets_metadata": {"category": "category"},
+}
+
+
+# Domains whose labels are stored in canonical form
+NORMALIZED_DOMAINS = ("severity", "status", "priority")
+
+
+def code_column(column):
+    return f"{column}_id"
+
+
+def normalize_label(value):
+    """Canonical form of a label; must match normalized_sql()."""
+    if value is None:
+        return None
+    return str(value).strip(" ").replace(" ", "-").replace("_", "-").lower()
+
+
+def normalized_sql(expression):
+    """SQL expression giving the canonical form of expression."""
+    return f"LOWER(REPLACE(REPLACE(TRIM({expression}), ' ', '-'), '_', '-'))"
+
+
+def create_lookup_tables(conn):
+    cursor = conn.cursor()
+    for table in LOOKUP_TABLES.values():
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL
+            )
+        """)
+    conn.commit()
+    print(" Lookup tables created")
+
+
+class CodeMap:
+    """In-process copy of the lookup tables: label <-> code per domain."""
+
+    def __init__(self):
+        self._codes = {}
+        self._labels = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load_domain(self, conn, domain):
+        rows = conn.execute(
+            f"SELECT id, name FROM {LOOKUP_TABLES[domain]} ORDER BY id"
+        ).fetchall()
+        self._labels[domain] = [name for _, name in rows]
+        self._codes[domain] = {name: code for code, name in rows}
+
+    def load(self, conn):
+        """(Re)read every lookup table."""
+        with self._lock:
+            for domain in LOOKUP_TABLES:
+                self._load_domain(conn, domain)
+            self._loaded = True
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            with db_connection() as conn:
+                self.load(conn)
+
+    def encode(self, conn, domain, label):
+        """
+        Return the code for label, adding it to the lookup table if new.
+
+        conn must be a pooled connection (app.data.db): a new label is
+        inserted in its open transaction and published to the CodeMap when
+        that transaction commits; on rollback it is forgotten.
+        """
+        if not isinstance(conn, PooledConnection):
+            raise TypeError(
+                "CodeMap.encode needs a pooled connection from app.data.db "
+                f"(connect_database or db_connection), not {type(conn).__name__}"
+            )
+        if label is None:
+            return None
+        if domain in NORMALIZED_DOMAINS:
+            label = normalize_label(label)
+        if not self._loaded:
+            self.load(conn)
+        code = self._codes[domain].get(label)
+        if code is not None:
+            return code
+
+        # Labels this connection added in its still-open transaction
+        pending = getattr(conn, "_pending_labels", None)
+        if pending is None:
+            pending = conn._pending_labels = {}
+        code = pending.get((domain, label))
+        if code is not None:
+            return code
+
+        table = LOOKUP_TABLES[domain]
+        # Codes stay contiguous from 0 (for Categorical.from_codes); MAX() is
+        # read inside the write transaction, so a rollback gives the code back
+        conn.execute(
+            f"INSERT OR IGNORE INTO {table} (id, name) "
+            f"VALUES ((SELECT COALESCE(MAX(id) + 1, 0) FROM {table}), ?)",
+            (label,)
+        )
+        code = conn.execute(
+            f"SELECT id FROM {table} WHERE name = ?", (label,)
+        ).fetchone()[0]
+        if not pending:
+            conn.on_transaction_end(lambda committed: self._end_transaction(conn, committed))
+        pending[(domain, label)] = code
+        return code
+
+    def _end_transaction(self, conn, committed):
+        pending, conn._pending_labels = conn._pending_labels, None
+        if not committed:
+            return
+        with self._lock:
+            for domain in {domain for domain, _ in pending}:
+                self._load_domain(conn, domain)
+
+    def encode_rows(self, conn, rows, positions):
+        """
+        Replace labels with codes in parameter tuples. positions is a list of
+        (index in the tuple, domain) pairs.
+        """
+        if not positions:
+            return rows
+        encoded = []
+        for row in rows:
+            row = list(row)
+            for index, domain in positions:
+                row[index] = self.encode(conn, domain, row[index])
+            encoded.append(tuple(row))
+        return encoded
+
+    def decode(self, domain, code):
+        if code is None:
+            return None
+        return self._labels[domain][code]
+
+    def categories(self, domain):
+        return list(self._labels[domain])
+
+    def categorical(self, domain, codes):
+        """Build a pandas Categorical straight from a column of codes."""
+        codes = pd.Series(codes).fillna(-1).astype("int64")
+        if len(codes) and codes.max() >= len(self._labels[domain]):
+            # Codes added by another process since we loaded
+            with db_connection() as conn:
+                self.load(conn)
+        return pd.Categorical.from_codes(codes, categories=self.categories(domain))
+
+    def decode_frame(self, df, table):
+        """
+        Turn every '<column>_id' column of a table's frame into a categorical
+        '<column>' column in the same position.
+        """
+        self.ensure_loaded()
+        for column, domain in CODED_COLUMNS.get(table, {}).items():
+            coded = code_column(column)
+            if coded not in df.columns:
+                continue
+            position = df.columns.get_loc(coded)
+            values = self.categorical(domain, df.pop(coded))
+            df.insert(position, column, values)
+        return df
+
+
+code_map = CodeMap()
+
+
+def _indexes_on(conn, table, column):
+    names = []
+    for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        if index[1].startswith("sqlite_autoindex"):
+            continue
+        columns = [row[2] for row in conn.execute(f"PRAGMA index_info({index[1]})")]
+        if column in columns:
+            names.append(index[1])
+    return names
+
+
+def migrate_text_columns(conn):
+    """
+    Convert TEXT label columns left by older layouts (e.g. pandas.to_sql
+    imports) into '<column>_id' codes, then VACUUM so the space is returned.
+    Returns the list of (table, column) pairs converted.
+    """
+    converted = []
+    for table, columns in CODED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, domain in columns.items():
+            coded = code_column(column)
+            if column not in existing or coded in existing:
+                continue
+
+            value = f"{table}.{column}"
+            if domain in NORMALIZED_DOMAINS:
+                value = normalized_sql(value)
+            labels = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT {value} FROM {table} WHERE {column} IS NOT NULL"
+            )]
+            for label in labels:
+                code_map.encode(conn, domain, label)
+
+            lookup = LOOKUP_TABLES[domain]
+            conn.execute(
+                f"ALTER TABLE {table} ADD COLUMN {coded} INTEGER REFERENCES {lookup}(id)"
+            )
+            conn.execute(f"""
+                UPDATE {table}
+                SET {coded} = (SELECT id FROM {lookup} WHERE name = {value})
+            """)
+            for index in _indexes_on(conn, table, column):
+                conn.execute(f"DROP INDEX {index}")
+            conn.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+            converted.append((table, column))
+
+    conn.commit()
+    if converted:
+        conn.execute("VACUUM")
+        print(f" Encoded {len(converted)} text columns as lookup codes")
+    return converted
@@ -0,0 +1,60 @@
+"""Keyset (seek) pagination helpers shared by the data modules."""
+
+
+def keyset_page_query(table, after_id=None, page_size=50, columns="*"):
+    """
+    Build a newest-first page query that seeks on the primary key instead
+    of using OFFSET, so every page costs the same however deep it is.
+    """
+    if after_id is None:
+        sql = f"SELECT {columns} FROM {table} ORDER BY id DESC LIMIT ?"
+        return sql, (page_size,)
+    sql = f"SELECT {columns} FROM {table} WHERE id < ? ORDER BY id DESC LIMIT ?"
+    return sql, (after_id, page_size)
+
+
+class PageCursor:
+    """
+    Next/previous navigation over a keyset-paginated fetch function such as
+    get_incidents_page. Keep one in st.session_state per table view.
+    """
+
+    def __init__(self, fetch_page, page_size=50):
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self._anchors = [None]  # after_id used for each visited page
+        self._last_id = None
+        self._has_next = False
+
+    @property
+    def page_number(self):
+        return len(self._anchors)
+
+    @property
+    def has_previous(self):
+        return len(self._anchors) > 1
+
+    @property
+    def has_next(self):
+        return self._has_next
+
+    def current(self):
+        """Fetch the current page (one extra row is read to detect a next page)."""
+        df = self.fetch_page(after_id=self._anchors[-1], page_size=self.page_size + 1)
+        self._has_next = len(df) > self.page_size
+        df = df.iloc[:self.page_size]
+        self._last_id = int(df["id"].iloc[-1]) if len(df) else None
+        return df
+
+    def next(self):
+        if self._has_next:
+            self._anchors.append(self._last_id)
+
+    def previous(self):
+        if self.has_previous:
+            self._anchors.pop()
+
+    def reset(self):
+        self._anchors = [None]
+        self._last_id = None
+        self._has_next = False
@@ -1,4 +1,50 @@
+import re
+import sqlite3
+
 from app.data.db import connect_database
+from app.data.fuzzy import create_fuzzy_indexes
+from app.data.lookups import code_map, create_lookup_tables, migrate_text_columns
+
+# (index name, table, columns, partial-index WHERE clause or None)
+# Label columns are stored as lookup codes ('<column>_id', see lookups.py)
+INDEXES = [
+    ("idx_users_role", "users", ("role",), None),
+    ("idx_incidents_status", "cyber_incidents", ("status_id",), None),
+    ("idx_incidents_type_severity", "cyber_incidents", ("incident_type_id", "severity_id"), None),
+    ("idx_incidents_severity_status", "cyber_incidents", ("severity_id", "status_id"), None),
+    ("idx_incidents_date", "cyber_incidents", ("date",), None),
+    ("idx_datasets_category", "datasets_metadata", ("category_id",), None),
+    ("idx_datasets_source", "datasets_metadata", ("source",), None),
+    ("idx_tickets_status_priority", "it_tickets", ("status_id", "priority_id"), None),
+    ("idx_tickets_priority", "it_tickets", ("priority_id",), None),
+    ("idx_tickets_category", "it_tickets", ("category_id",), None),
+    ("idx_tickets_created_date", "it_tickets", ("created_date",), None),
+    # Status codes are assigned at runtime, so open tickets are served by a
+    # (status, created_date) index rather than a partial one
+    ("idx_tickets_status_created", "it_tickets", ("status_id", "created_date"), None),
+]
+
+# Queries behind the dashboards; each must be answered from an index
+DASHBOARD_QUERIES = [
+    "SELECT severity_id, COUNT(*) FROM cyber_incidents GROUP BY severity_id",
+    "SELECT status_id, COUNT(*) FROM cyber_incidents GROUP BY status_id",
+    "SELECT incident_type_id, COUNT(*) FROM cyber_incidents GROUP BY incident_type_id",
+    "SELECT COUNT(*) FROM cyber_incidents WHERE severity_id = 0",
+    "SELECT COUNT(*) FROM cyber_incidents WHERE severity_id = 0 AND status_id = 0",
+    "SELECT date, COUNT(*) FROM cyber_incidents WHERE date >= '2024-01-01' GROUP BY date",
+    "SELECT * FROM cyber_incidents WHERE id < 100 ORDER BY id DESC LIMIT 50",
+    "SELECT status_id, COUNT(*) FROM it_tickets GROUP BY status_id",
+    "SELECT priority_id, COUNT(*) FROM it_tickets GROUP BY priority_id",
+    "SELECT category_id, COUNT(*) FROM it_tickets GROUP BY category_id",
+    "SELECT COUNT(*) FROM it_tickets WHERE status_id IN (0, 1) AND priority_id = 0",
+    "SELECT priority_id, COUNT(*) FROM it_tickets WHERE status_id = 0 GROUP BY priority_id",
+    "SELECT * FROM it_tickets WHERE status_id = 0 ORDER BY created_date LIMIT 20",
+    "SELECT * FROM it_tickets WHERE id < 100 ORDER BY id DESC LIMIT 50",
+    "SELECT category_id, COUNT(*) FROM datasets_metadata GROUP BY category_id",
+    "SELECT source, COUNT(*) FROM datasets_metadata GROUP BY source",
+    "SELECT * FROM datasets_metadata WHERE id < 100 ORDER BY id DESC LIMIT 50",
+    "SELECT role, COUNT(*) FROM users GROUP BY role",
+]
 
 
 def create_users_table(conn):
@@ -21,9 +67,9 @@ def create_cyber_incidents_table(conn):
         CREATE TABLE IF NOT EXISTS cyber_incidents (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             date TEXT,
-            incident_type TEXT,
-            severity TEXT,
-            status TEXT,
+            incident_type_id INTEGER REFERENCES incident_type_lookup(id),
+            severity_id INTEGER REFERENCES severity_lookup(id),
+            status_id INTEGER REFERENCES status_lookup(id),
             description TEXT,
             reported_by TEXT
         )
@@ -38,7 +84,7 @@ def create_datasets_metadata_table(conn):
         CREATE TABLE IF NOT EXISTS datasets_metadata (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             dataset_name TEXT NOT NULL,
-            category TEXT,
+            category_id INTEGER REFERENCES category_lookup(id),
             source TEXT,
             last_updated TEXT,
             record_count INTEGER,
@@ -55,9 +101,9 @@ def create_it_tickets_table(conn):
         CREATE TABLE IF NOT EXISTS it_tickets (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             ticket_id TEXT UNIQUE NOT NULL,
-            priority TEXT,
-            status TEXT,
-            category TEXT,
+            priority_id INTEGER REFERENCES priority_lookup(id),
+            status_id INTEGER REFERENCES status_lookup(id),
+            category_id INTEGER REFERENCES category_lookup(id),
             subject TEXT NOT NULL,
             description TEXT,
             created_date TEXT,
@@ -69,11 +115,116 @@ def create_it_tickets_table(conn):
     print(" IT tickets table created")
 
 
+def _table_columns(conn, table):
+    """Return {column name: is primary key} for an existing table."""
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return {row[1]: bool(row[5]) for row in rows}
+
+
+def create_indexes(conn):
+    """
+    Create the secondary indexes the dashboards rely on. Indexes on columns
+    a table doesn't have (older CSV-imported layouts) are skipped.
+    """
+    cursor = conn.cursor()
+    for table in {table for _, table, _, _ in INDEXES}:
+        columns = _table_columns(conn, table)
+        # Tables created by pandas.to_sql have a plain 'id' column, so the
+        # keyset pagination queries need an explicit index on it
+        if "id" in columns and not columns["id"]:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_id ON {table} (id)")
+
+    for name, table, columns, where in INDEXES:
+        if not set(columns) <= set(_table_columns(conn, table)):
+            continue
+        sql = f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        if where:
+            sql += f" WHERE {where}"
+        cursor.execute(sql)
+    conn.commit()
+    print(" Indexes created")
+
+
+def _query_table(sql):
+    return re.search(r"\bFROM\s+(\w+)", sql, re.IGNORECASE).group(1)
+
+
+def _is_partial_index(conn, name):
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None and re.search(r"\bWHERE\b", row[0] or "", re.IGNORECASE) is not None
+
+
+def _scan_is_acceptable(conn, sql, detail):
+    """
+    Whether a 'SCAN ...' step of sql's plan is acceptable. Only two are:
+    - a scan of a partial index, which holds just the rows it covers;
+    - a scan of an index by a query without WHERE (e.g. a GROUP BY count),
+      which has to read every row anyway; the index is narrower than the
+      table and already in group order.
+    A scan of the table itself, or of a whole index to filter rows, is not.
+    """
+    index = re.search(r"USING (?:COVERING )?INDEX (\w+)", detail)
+    if index is None:
+        return False
+    if re.search(r"\bWHERE\b", sql, re.IGNORECASE) is None:
+        return True
+    return _is_partial_index(conn, index.group(1))
+
+
+def verify_query_plans(conn, queries=DASHBOARD_QUERIES):
+    """
+    Run EXPLAIN QUERY PLAN on every dashboard query and raise if any of
+    them would scan a table, or scan a whole index to filter it, instead
+    of searching an index (see _scan_is_acceptable).
+
+    Queries on a table or column this database's layout doesn't have (older
+    CSV-imported layouts) are skipped and reported; any other error is
+    raised.
+    """
+    bad_plans = []
+    skipped = []
+    for sql in queries:
+        table = _query_table(sql)
+        columns = _table_columns(conn, table)
+        if not columns:
+            skipped.append(f"{sql}  ->  no table {table}")
+            continue
+        try:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        except sqlite3.OperationalError as error:
+            missing = re.match(r"no such column: (\w+)$", str(error))
+            if missing is None or missing.group(1) in columns:
+                raise
+            skipped.append(f"{sql}  ->  no column {table}.{missing.group(1)}")
+            continue
+        for row in plan:
+            detail = row[-1]
+            if detail.startswith("SCAN ") and not _scan_is_acceptable(conn, sql, detail):
+                bad_plans.append(f"{sql}  ->  {detail}")
+
+    if bad_plans:
+        raise RuntimeError(
+            "Dashboard queries are not served by an index:\n  "
+            + "\n  ".join(bad_plans)
+        )
+    print(f" Query plans verified ({len(queries) - len(skipped)} of {len(queries)} checked)")
+    if skipped:
+        print("   Skipped, not in this table layout:\n     " + "\n     ".join(skipped))
+
+
 def create_all_tables(conn):
+    create_lookup_tables(conn)
     create_users_table(conn)
     create_cyber_incidents_table(conn)
     create_datasets_metadata_table(conn)
     create_it_tickets_table(conn)
+    migrate_text_columns(conn)
+    code_map.load(conn)
+    create_indexes(conn)
+    create_fuzzy_indexes(conn)
+    verify_query_plans(conn)
 
 
 if __name__ == "__main__":
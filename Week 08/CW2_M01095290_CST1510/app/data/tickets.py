@@ -1,46 +1,73 @@
 import pandas as pd
-from app.data.db import connect_database
+from app.data.db import db_connection
+from app.data.fuzzy import fuzzy_find
+from app.data.lookups import code_map
+from app.data.pagination import keyset_page_query
 
 
 def insert_ticket(ticket_id, priority, status, category, subject, description, created_date, assigned_to=None):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO it_tickets
-        (ticket_id, priority, status, category, subject, description, created_date, assigned_to)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (ticket_id, priority, status, category, subject, description, created_date, assigned_to))
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        conn.execute("""
+            INSERT INTO it_tickets
+            (ticket_id, priority_id, status_id, category_id, subject, description, created_date, assigned_to)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (ticket_id,
+              code_map.encode(conn, "priority", priority),
+              code_map.encode(conn, "status", status),
+              code_map.encode(conn, "category", category),
+              subject, description, created_date, assigned_to))
+        conn.commit()
 
 
 def get_all_tickets():
-    conn = connect_database()
-    df = pd.read_sql_query(
-        "SELECT * FROM it_tickets ORDER BY id DESC",
-        conn
-    )
-    conn.close()
-    return df
+    with db_connection() as conn:
+        df = pd.read_sql_query(
+            "SELECT * FROM it_tickets ORDER BY id DESC",
+            conn
+        )
+    return code_map.decode_frame(df, "it_tickets")
+
+
+def get_tickets_page(after_id=None, page_size=50):
+    """Return up to page_size tickets with id < after_id, newest first."""
+    sql, params = keyset_page_query("it_tickets", after_id, page_size)
+    with db_connection() as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+    return code_map.decode_frame(df, "it_tickets")
+
+
+def find_tickets(text, k=10):
+    """Tickets whose subject best matches text (typos allowed), closest first."""
+    matches = fuzzy_find(text, k, table="it_tickets")
+    if not matches:
+        return pd.DataFrame()
+    rowids = [rowid for rowid, _, _ in matches]
+    placeholders = ", ".join("?" for _ in rowids)
+    with db_connection() as conn:
+        df = pd.read_sql_query(
+            f"SELECT rowid AS _rowid, * FROM it_tickets WHERE rowid IN ({placeholders})",
+            conn, params=rowids
+        )
+    found = df.pop("_rowid")
+    df["distance"] = found.map({rowid: distance for rowid, _, distance in matches})
+    # IN () returns rows in rowid order; restore the match order
+    df = df.iloc[found.map(rowids.index).argsort()]
+    return code_map.decode_frame(df.reset_index(drop=True), "it_tickets")
 
 
 def update_ticket_status(ticket_id, new_status):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE it_tickets SET status = ? WHERE ticket_id = ?",
-        (new_status, ticket_id)
-    )
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        conn.execute(
+            "UPDATE it_tickets SET status_id = ? WHERE ticket_id = ?",
+            (code_map.encode(conn, "status", new_status), ticket_id)
+        )
+        conn.commit()
 
 
 def delete_ticket(ticket_id):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "DELETE FROM it_tickets WHERE ticket_id = ?",
-        (ticket_id,)
-    )
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        conn.execute(
+            "DELETE FROM it_tickets WHERE ticket_id = ?",
+            (ticket_id,)
+        )
+        conn.commit()
@@ -1,41 +1,49 @@
-from app.data.db import connect_database
+from app.data.db import db_connection
+from app.data.fuzzy import fuzzy_find
 
 
 def get_user_by_username(username):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM users WHERE username = ?",
-        (username,)
-    )
-    user = cursor.fetchone()
-    conn.close()
-    return user
+    with db_connection() as conn:
+        cursor = conn.execute(
+            "SELECT * FROM users WHERE username = ?",
+            (username,)
+        )
+        return cursor.fetchone()
+
+
+def find_users(text, k=5):
+    """
+    Users whose username best matches text (partial or misspelt), closest
+    first, as (id, username, role) rows.
+    """
+    matches = fuzzy_find(text, k, table="users")
+    rows = []
+    with db_connection() as conn:
+        for rowid, _, _ in matches:
+            row = conn.execute(
+                "SELECT id, username, role FROM users WHERE rowid = ?", (rowid,)
+            ).fetchone()
+            if row is not None:
+                rows.append(row)
+    return rows
 
 
 def insert_user(username, password_hash, role='user'):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-        (username, password_hash, role)
-    )
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        conn.execute(
+            "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            (username, password_hash, role)
+        )
+        conn.commit()
 
 
 def get_all_users():
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, username, role FROM users")
-    users = cursor.fetchall()
-    conn.close()
-    return users
+    with db_connection() as conn:
+        cursor = conn.execute("SELECT id, username, role FROM users")
+        return cursor.fetchall()
 
 
 def delete_user(username):
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM users WHERE username = ?", (username,))
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        conn.execute("DELETE FROM users WHERE username = ?", (username,))
+        conn.commit()
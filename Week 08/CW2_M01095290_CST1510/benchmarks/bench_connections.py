@@ -0,0 +1,94 @@
+"""
+Micro-benchmark: per-call latency of insert_incident / get_all_incidents
+with a fresh sqlite3 connection per call (the old behaviour) versus the
+pooled, tuned connections behind connect_database.
+
+Run from the project folder:
+    python -m benchmarks.bench_connections
+"""
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app.data import db
+from app.data.incidents import insert_incident, get_all_incidents
+from app.data.schema import create_cyber_incidents_table
+
+CALLS = 500
+SEED_ROWS = 200
+INCIDENT = ("2024-11-05", "Phishing", "High", "Open", "Suspicious email detected", "bob")
+
+
+def unpooled_connect(db_path):
+    # What connect_database used to do on every call
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    return sqlite3.connect(str(db_path))
+
+
+def unpooled_insert(db_path):
+    conn = unpooled_connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO cyber_incidents
+        (date, incident_type, severity, status, description, reported_by)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, INCIDENT)
+    conn.commit()
+    conn.close()
+
+
+def unpooled_get_all(db_path):
+    conn = unpooled_connect(db_path)
+    df = pd.read_sql_query("SELECT * FROM cyber_incidents ORDER BY id DESC", conn)
+    conn.close()
+    return df
+
+
+def time_per_call(func, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def prepare(db_path):
+    conn = sqlite3.connect(str(db_path))
+    create_cyber_incidents_table(conn)
+    conn.executemany("""
+        INSERT INTO cyber_incidents
+        (date, incident_type, severity, status, description, reported_by)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [INCIDENT] * SEED_ROWS)
+    conn.commit()
+    conn.close()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = Path(tmp) / "before.db"
+        after_path = Path(tmp) / "after.db"
+        prepare(before_path)
+        prepare(after_path)
+
+        before_insert = time_per_call(lambda: unpooled_insert(before_path))
+        before_read = time_per_call(lambda: unpooled_get_all(before_path))
+
+        db.DB_PATH = after_path
+        after_insert = time_per_call(lambda: insert_incident(*INCIDENT))
+        after_read = time_per_call(get_all_incidents)
+        db.close_all_connections()
+
+    print(f"{'operation':<20}{'before (ms)':>14}{'after (ms)':>14}{'speed-up':>10}")
+    for name, before, after in [
+        ("insert_incident", before_insert, after_insert),
+        ("get_all_incidents", before_read, after_read),
+    ]:
+        print(f"{name:<20}{before:>14.3f}{after:>14.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
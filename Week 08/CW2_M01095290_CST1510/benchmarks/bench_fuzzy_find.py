@@ -0,0 +1,86 @@
+"""
+Benchmark: typo-tolerant fuzzy_find over generated ticket subjects,
+reporting lookup latency and how often the intended ticket is returned.
+
+Run from the project folder:
+    python -m benchmarks.bench_fuzzy_find --rows 1000000
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.data import db
+from app.data.fuzzy import create_fuzzy_index, fuzzy_find
+from app.data.lookups import create_lookup_tables
+from app.data.schema import create_it_tickets_table
+
+ACTIONS = ["Reset Password", "VPN not connecting", "Printer offline", "Laptop replacement",
+           "Email quota exceeded", "Software install", "Account locked", "Network drive access"]
+SYLLABLES = ["ka", "mi", "to", "ra", "ne", "lo", "sa", "vi", "de", "mo", "ha", "ri",
+             "bel", "tan", "ors", "gu", "fen", "is", "ad", "ku", "zo", "pe", "lin", "mar"]
+
+
+def name(rng, syllables):
+    return "".join(rng.choice(SYLLABLES) for _ in range(syllables)).capitalize()
+
+
+def subject(rng):
+    """e.g. 'Reset Password - Kamiad Belrazo'"""
+    full_name = f"{name(rng, rng.randint(2, 3))} {name(rng, rng.randint(2, 4))}"
+    return f"{rng.choice(ACTIONS)} - {full_name}"
+
+
+def with_typo(rng, text):
+    i = rng.randrange(len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        conn = sqlite3.connect(str(db_path))
+        create_lookup_tables(conn)
+        create_it_tickets_table(conn)
+        subjects = [subject(rng) for _ in range(args.rows)]
+        conn.executemany(
+            "INSERT INTO it_tickets (ticket_id, subject) VALUES (?, ?)",
+            ((str(i), s) for i, s in enumerate(subjects))
+        )
+        conn.commit()
+        start = time.perf_counter()
+        create_fuzzy_index(conn, "it_tickets")
+        print(f"index build: {time.perf_counter() - start:.1f} s for {args.rows:,} rows")
+        conn.close()
+
+        db.DB_PATH = db_path
+        timings = []
+        hits = 0
+        for _ in range(args.lookups):
+            # Agents type the requester's name, with a typo
+            full_name = rng.choice(subjects).split(" - ")[1]
+            query = with_typo(rng, full_name)
+            start = time.perf_counter()
+            results = fuzzy_find(query, k=10)
+            timings.append((time.perf_counter() - start) * 1000)
+            hits += any(value.endswith(full_name) for _, value, _ in results)
+        db.close_all_connections()
+
+    timings.sort()
+    print(f"median:  {statistics.median(timings):.1f} ms")
+    print(f"p95:     {timings[int(len(timings) * 0.95)]:.1f} ms")
+    print(f"found:   {hits}/{args.lookups} lookups had the intended name in the top 10")
+
+
+if __name__ == "__main__":
+    main()
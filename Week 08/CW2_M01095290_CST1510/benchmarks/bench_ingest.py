@@ -0,0 +1,76 @@
+"""
+Benchmark: stream a generated cyber_incidents.csv into SQLite with the
+chunked ingestion engine, reporting rows/sec and peak memory.
+
+Run from the project folder:
+    python -m benchmarks.bench_ingest --rows 5000000
+"""
+
+import argparse
+import csv
+import random
+import resource
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from app.data import db
+from app.data.ingest import ingest_csv
+from app.data.schema import create_cyber_incidents_table
+
+TYPES = ["Phishing", "Malware", "Ransomware", "DDoS", "Unauthorized Access"]
+SEVERITIES = ["low", "medium", "high", "critical"]
+STATUSES = ["open", "in-progress", "resolved", "closed"]
+
+
+def write_csv(path, rows):
+    rng = random.Random(42)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "date", "incident_type", "severity", "status",
+                         "description", "reported_by"])
+        for i in range(1, rows + 1):
+            writer.writerow([
+                i,
+                f"202{rng.randint(0, 4)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                rng.choice(TYPES),
+                rng.choice(SEVERITIES),
+                rng.choice(STATUSES),
+                f"Incident {i} - Security event detected",
+                f"user{rng.randint(1, 100)}",
+            ])
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "cyber_incidents.csv"
+        db_path = Path(tmp) / "bench.db"
+        write_csv(csv_path, args.rows)
+        size_mb = csv_path.stat().st_size / 1024 / 1024
+
+        conn = sqlite3.connect(str(db_path))
+        create_cyber_incidents_table(conn)
+        conn.close()
+
+        db.DB_PATH = db_path
+        rss_before = peak_rss_mb()
+        result = ingest_csv(csv_path, "cyber_incidents")
+        db.close_all_connections()
+
+    print(f"rows:        {result['rows']:,} ({size_mb:,.0f} MB of CSV)")
+    print(f"time:        {result['seconds']:.1f} s")
+    print(f"throughput:  {result['rows_per_sec']:,.0f} rows/s")
+    print(f"peak RSS:    {peak_rss_mb():,.0f} MB (was {rss_before:,.0f} MB before ingest)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: cyber_incidents stored with TEXT label columns vs lookup codes.
+Reports database size, DataFrame memory and group-by time for both layouts.
+
+Run from the project folder:
+    python -m benchmarks.bench_lookup_codes --rows 1000000
+"""
+
+import argparse
+import csv
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app.data import db
+from app.data.incidents import get_all_incidents
+from app.data.ingest import ingest_csv
+from app.data.lookups import create_lookup_tables
+from app.data.schema import create_cyber_incidents_table
+from benchmarks.bench_ingest import write_csv
+
+TEXT_SCHEMA = """
+    CREATE TABLE cyber_incidents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT,
+        incident_type TEXT,
+        severity TEXT,
+        status TEXT,
+        description TEXT,
+        reported_by TEXT
+    )
+"""
+
+
+def load_text_layout(csv_path, db_path):
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(TEXT_SCHEMA)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        conn.executemany("INSERT INTO cyber_incidents VALUES (?, ?, ?, ?, ?, ?, ?)", reader)
+    conn.commit()
+    df = pd.read_sql_query("SELECT * FROM cyber_incidents ORDER BY id DESC", conn)
+    conn.close()
+    return df
+
+
+def load_coded_layout(csv_path, db_path):
+    conn = sqlite3.connect(str(db_path))
+    create_lookup_tables(conn)
+    create_cyber_incidents_table(conn)
+    conn.close()
+
+    db.DB_PATH = db_path
+    ingest_csv(csv_path, "cyber_incidents")
+    df = get_all_incidents()
+    db.close_all_connections()
+    return df
+
+
+def time_group_by(df, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        df.groupby(["severity", "status"], observed=True).size()
+    return (time.perf_counter() - start) / repeat
+
+
+def report(name, db_path, df):
+    size_mb = db_path.stat().st_size / 1024 / 1024
+    memory_mb = df.memory_usage(index=True, deep=True).sum() / 1024 / 1024
+    group_ms = time_group_by(df) * 1000
+    print(f"{name:<8} db {size_mb:8.1f} MB   frame {memory_mb:8.1f} MB   "
+          f"group-by {group_ms:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "cyber_incidents.csv"
+        write_csv(csv_path, args.rows)
+
+        text_db = Path(tmp) / "text.db"
+        report("text", text_db, load_text_layout(csv_path, text_db))
+
+        coded_db = Path(tmp) / "coded.db"
+        report("coded", coded_db, load_coded_layout(csv_path, coded_db))
+
+
+if __name__ == "__main__":
+    main()
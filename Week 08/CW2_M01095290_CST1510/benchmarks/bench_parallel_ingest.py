@@ -0,0 +1,104 @@
+"""
+Benchmark: load generated users, cyber_incidents, it_tickets and
+datasets_metadata CSVs sequentially (ingest_all) and with the process-pool
+ingest at 1, 2, 4 and 8 workers.
+
+Run from the project folder:
+    python -m benchmarks.bench_parallel_ingest --rows 500000
+"""
+
+import argparse
+import csv
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from app.data import db
+from app.data.ingest import CSV_FILES, ingest_all, ingest_parallel
+from app.data.lookups import create_lookup_tables
+from app.data.schema import (
+    create_users_table, create_cyber_incidents_table,
+    create_datasets_metadata_table, create_it_tickets_table,
+)
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def generate_csvs(data_dir, rows):
+    rng = random.Random(42)
+    writers = {
+        "users": (["id", "username", "password_hash", "role"],
+                  lambda i: [i, f"user{i}", f"hash_{rng.randint(10000, 99999)}",
+                             rng.choice(["user", "analyst", "admin"])]),
+        "cyber_incidents": (["id", "date", "incident_type", "severity", "status",
+                             "description", "reported_by"],
+                            lambda i: [i, f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                                       rng.choice(["Phishing", "Malware", "DDoS"]),
+                                       rng.choice(["low", "medium", "high", "critical"]),
+                                       rng.choice(["open", "in-progress", "resolved"]),
+                                       f"Incident {i} - Security event detected",
+                                       f"user{rng.randint(1, 100)}"]),
+        "it_tickets": (["id", "title", "priority", "status", "created_date"],
+                       lambda i: [i, f"Ticket {i}", rng.choice(["low", "medium", "high"]),
+                                  rng.choice(["open", "in-progress", "resolved"]),
+                                  f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"]),
+        "datasets_metadata": (["id", "name", "source", "category", "size"],
+                              lambda i: [i, f"Dataset_{i}", rng.choice(["Internal", "API"]),
+                                         rng.choice(["Security", "Finance"]),
+                                         rng.randint(1000, 99999)]),
+    }
+    for table, (header, make_row) in writers.items():
+        with open(Path(data_dir) / CSV_FILES[table], "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(make_row(i) for i in range(1, rows + 1))
+
+
+def fresh_database(db_path):
+    db.close_all_connections()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    create_lookup_tables(conn)
+    create_users_table(conn)
+    create_cyber_incidents_table(conn)
+    create_datasets_metadata_table(conn)
+    create_it_tickets_table(conn)
+    conn.close()
+    db.DB_PATH = db_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=250_000, help="rows per table")
+    args = parser.parse_args()
+
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_csvs(tmp, args.rows)
+        db_path = Path(tmp) / "bench.db"
+
+        fresh_database(db_path)
+        start = time.perf_counter()
+        ingest_all(tmp)
+        timings.append(("sequential", time.perf_counter() - start))
+
+        for workers in WORKER_COUNTS:
+            fresh_database(db_path)
+            start = time.perf_counter()
+            ingest_parallel(tmp, workers=workers)
+            timings.append((f"{workers} workers", time.perf_counter() - start))
+        db.close_all_connections()
+
+    total_rows = args.rows * len(CSV_FILES)
+    print(f"\n{total_rows:,} rows across {len(CSV_FILES)} tables, {os.cpu_count()} CPU(s)")
+    print(f"{'mode':<14}{'seconds':>10}{'rows/s':>14}")
+    for mode, seconds in timings:
+        print(f"{mode:<14}{seconds:>10.2f}{total_rows / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
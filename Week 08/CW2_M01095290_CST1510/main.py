@@ -1,39 +1,20 @@
+import argparse
+
 from app.data.db import connect_database
+from app.data.ingest import ingest_all, ingest_parallel
 from app.data.schema import create_all_tables
 from app.services.user_service import register_user, login_user, migrate_users_from_file
 from app.data.incidents import insert_incident, get_all_incidents
-import pandas as pd
 
 
-def load_csv_data():
+def load_csv_data(workers=1):
     """Load CSV data into the database"""
-    try:
-        users_df = pd.read_csv('DATA/users.csv')
-        users_df.to_sql('users', connect_database(), if_exists='replace', index=False)
-        print(f" Loaded {len(users_df)} users")
-    except Exception as e:
-        print(f"  Users: {e}")
-    
-    try:
-        incidents_df = pd.read_csv('DATA/cyber_incidents.csv')
-        incidents_df.to_sql('cyber_incidents', connect_database(), if_exists='replace', index=False)
-        print(f" Loaded {len(incidents_df)} cyber incidents")
-    except Exception as e:
-        print(f"  Incidents: {e}")
-    
-    try:
-        tickets_df = pd.read_csv('DATA/it_tickets.csv')
-        tickets_df.to_sql('it_tickets', connect_database(), if_exists='replace', index=False)
-        print(f" Loaded {len(tickets_df)} IT tickets")
-    except Exception as e:
-        print(f"  Tickets: {e}")
-    
-    try:
-        datasets_df = pd.read_csv('DATA/datasets_metadata.csv')
-        datasets_df.to_sql('datasets_metadata', connect_database(), if_exists='replace', index=False)
-        print(f" Loaded {len(datasets_df)} datasets")
-    except Exception as e:
-        print(f"  Datasets: {e}")
+    if workers > 1:
+        for result in ingest_parallel('DATA', workers=workers):
+            print(f" Loaded {result['rows']} rows into {result['table']} "
+                  f"({result['rows_per_sec']:,.0f} rows/s)")
+    else:
+        ingest_all('DATA')
 
 
 def test_authentication():
@@ -66,7 +47,7 @@ def query_data():
     print(df.head(5))
 
 
-def main():
+def main(workers=1):
     print("=" * 60)
     print("Week 8: Database Demo")
     print("=" * 60)
@@ -77,7 +58,7 @@ def main():
     conn.close()
     
     print("\n[2/6] Loading CSV data...")
-    load_csv_data()
+    load_csv_data(workers)
     
     print("\n[3/6] Testing authentication...")
     test_authentication()
@@ -94,4 +75,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Week 8: Database Demo")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="processes used to parse the CSVs in parallel (1 = sequential)"
+    )
+    args = parser.parse_args()
+    main(args.workers)
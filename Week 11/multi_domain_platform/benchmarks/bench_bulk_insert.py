@@ -0,0 +1,79 @@
+"""Benchmark: bulk-inserting security incidents through DatabaseManager.
+
+Compares the old path (one execute_query, and so one commit, per row)
+with execute_many (one executemany inside a single transaction).
+
+Run from the project folder:
+    python -m benchmarks.bench_bulk_insert --rows 100000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from services.database_manager import DatabaseManager
+
+INSERT_SQL = (
+    "INSERT INTO security_incidents (incident_type, severity, status, description) "
+    "VALUES (?, ?, ?, ?)"
+)
+
+
+def make_db(path: Path) -> DatabaseManager:
+    db = DatabaseManager(str(path))
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS security_incidents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            incident_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            status TEXT DEFAULT 'Open',
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    return db
+
+
+def generate_rows(count: int):
+    severities = ["low", "medium", "high", "critical"]
+    for i in range(count):
+        yield ("Malware Detection", severities[i % 4], "Open", f"Generated incident {i}")
+
+
+def run_old(path: Path, rows: int) -> float:
+    db = make_db(path)
+    start = time.perf_counter()
+    for row in generate_rows(rows):
+        db.execute_query(INSERT_SQL, row)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def run_new(path: Path, rows: int) -> float:
+    db = make_db(path)
+    start = time.perf_counter()
+    db.execute_many(INSERT_SQL, generate_rows(rows))
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old = run_old(Path(tmp) / "old.db", args.rows)
+        new = run_new(Path(tmp) / "new.db", args.rows)
+
+    print(f"Inserted {args.rows:,} incidents")
+    print(f"  execute_query per row : {old:8.2f} s ({args.rows / old:>12,.0f} rows/s)")
+    print(f"  execute_many          : {new:8.2f} s ({args.rows / new:>12,.0f} rows/s)")
+    print(f"  speed-up              : {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark: memory and build time of SecurityIncident lists vs IncidentBatch.
+
+Compares, for the same rows:
+- the previous model layout (per-instance __dict__), kept here as
+  DictIncident for reference;
+- SecurityIncident with __slots__;
+- IncidentBatch, which holds each column in one array.
+Memory is what the container adds on top of the row tuples (which the
+query result already holds), measured with tracemalloc.
+
+Run from the project folder:
+    python -m benchmarks.bench_models --rows 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, List
+
+from models.security_incident import IncidentBatch, SecurityIncident
+
+
+class DictIncident:
+    """SecurityIncident as it was before __slots__."""
+
+    def __init__(self, incident_id, incident_type, severity, status, description):
+        self.__id = incident_id
+        self.__incident_type = incident_type
+        self.__severity = severity
+        self.__status = status
+        self.__description = description
+
+    def get_severity_level(self) -> int:
+        return {"low": 1, "medium": 2, "high": 3, "critical": 4}.get(self.__severity.lower(), 0)
+
+
+def generate_rows(count: int) -> List[tuple]:
+    types = ["Malware Detection", "SQL Injection", "DDoS Attack", "Unauthorized Access", "Data Breach"]
+    severities = ["low", "medium", "high", "critical"]
+    statuses = ["Open", "In Progress", "Resolved"]
+    return [
+        (i, types[i % 5], severities[i % 4], statuses[i % 3], f"Generated incident {i}")
+        for i in range(count)
+    ]
+
+
+def measure(build: Callable[[], object]):
+    """(seconds, bytes) to build a container; timed without tracemalloc or the GC."""
+    gc.collect()
+    # Like timeit: cyclic GC passes over earlier results would skew later runs
+    gc.disable()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = generate_rows(args.rows)
+    results = {
+        "dict-based models": measure(lambda: [DictIncident(*row) for row in rows]),
+        "__slots__ models": measure(lambda: [SecurityIncident(*row) for row in rows]),
+        "IncidentBatch": measure(lambda: IncidentBatch.from_rows(rows)),
+    }
+
+    print(f"Built {args.rows:,} incidents")
+    for name, (elapsed, size) in results.items():
+        print(f"  {name:<18}: {elapsed:6.2f} s  {size / 2**20:8.1f} MB  ({size / args.rows:6.1f} B/row)")
+
+    print("Severity levels for every row")
+    slotted = [SecurityIncident(*row) for row in rows]
+    start = time.perf_counter()
+    [incident.get_severity_level() for incident in slotted]
+    per_object = time.perf_counter() - start
+    batch = IncidentBatch.from_rows(rows)
+    start = time.perf_counter()
+    batch.severity_levels()
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    batch.top(10)
+    ranked = time.perf_counter() - start
+    print(f"  get_severity_level() : {per_object * 1000:8.1f} ms")
+    print(f"  severity_levels()    : {vectorized * 1000:8.1f} ms")
+    print(f"  top(10) by severity  : {ranked * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
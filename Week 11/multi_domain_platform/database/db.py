@@ -1,8 +1,108 @@
 """Database initialization script for the Multi-Domain Intelligence Platform."""
 
+import re
 import sqlite3
+import sys
 from pathlib import Path
 
+# Run as a script from anywhere: make the project packages importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.security_incident import severity_level_sql
+
+# Incident severity as a level (1=low ... 4=critical, 0=unknown). SQLite
+# only uses an expression index for the identical expression, so the index
+# and the app's queries are both built by severity_level_sql()
+SEVERITY_LEVEL_SQL = severity_level_sql()
+
+# Secondary indexes behind the dashboard filters and breakdowns
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_users_role ON users (role)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_severity_status ON security_incidents (severity, status)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_status ON security_incidents (status)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_type_severity ON security_incidents (incident_type, severity)",
+    "CREATE INDEX IF NOT EXISTS idx_incidents_created_at ON security_incidents (created_at)",
+    f"CREATE INDEX IF NOT EXISTS idx_incidents_severity_level ON security_incidents ({SEVERITY_LEVEL_SQL})",
+    "CREATE INDEX IF NOT EXISTS idx_datasets_source ON datasets (source)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_status_priority ON it_tickets (status, priority)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_priority ON it_tickets (priority)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_assigned_to ON it_tickets (assigned_to)",
+    # Open tickets are a small, hot subset: keep them in their own index
+    "CREATE INDEX IF NOT EXISTS idx_tickets_open ON it_tickets (created_at) WHERE status = 'Open'",
+]
+
+# Queries behind the dashboards; each must be answered from an index
+DASHBOARD_QUERIES = [
+    "SELECT severity, COUNT(*) FROM security_incidents GROUP BY severity",
+    "SELECT status, COUNT(*) FROM security_incidents GROUP BY status",
+    "SELECT COUNT(*) FROM security_incidents WHERE severity = 'critical' AND status = 'Open'",
+    "SELECT source, COUNT(*) FROM datasets GROUP BY source",
+    "SELECT status, COUNT(*) FROM it_tickets WHERE status IN ('Open', 'In Progress') AND priority IN ('high', 'critical') GROUP BY status",
+    "SELECT id, title, priority, status, assigned_to FROM it_tickets WHERE status IN ('Open', 'In Progress') AND priority IN ('high', 'critical') ORDER BY id DESC LIMIT 26",
+    "SELECT priority, COUNT(*) FROM it_tickets GROUP BY priority",
+    "SELECT * FROM it_tickets WHERE assigned_to = 'Support Team A'",
+    "SELECT role, COUNT(*) FROM users GROUP BY role",
+]
+
+# Queries that must use one particular index. Without the severity level
+# index the top-5 query falls back to a full scan of another covering
+# index, which the scan rules below let through for a query without WHERE
+INDEXED_QUERIES = [
+    (f"SELECT id, incident_type, severity, status, description FROM security_incidents ORDER BY {SEVERITY_LEVEL_SQL} DESC, id DESC LIMIT 5",
+     "idx_incidents_severity_level"),
+    (f"SELECT COUNT(*) FROM security_incidents WHERE {SEVERITY_LEVEL_SQL} >= 3",
+     "idx_incidents_severity_level"),
+    # Row count under the Cybersecurity page's minimum severity filter
+    (f"SELECT COUNT(*) FROM (SELECT 1 FROM security_incidents WHERE ({SEVERITY_LEVEL_SQL} >= 3) LIMIT 10001)",
+     "idx_incidents_severity_level"),
+]
+
+
+def _scan_is_acceptable(conn: sqlite3.Connection, sql: str, detail: str) -> bool:
+    """Whether a 'SCAN ...' step of sql's plan is acceptable.
+    
+    Only a scan of a partial index (it holds just the rows it covers), or a
+    scan of an index by a query without WHERE (a GROUP BY count reads every
+    row anyway, and the index is narrower and in group order). A scan of the
+    table itself, or of a whole index to filter rows, is not.
+    """
+    index = re.search(r"USING (?:COVERING )?INDEX (\w+)", detail)
+    if index is None:
+        return False
+    if re.search(r"\bWHERE\b", sql, re.IGNORECASE) is None:
+        return True
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?",
+        (index.group(1),),
+    ).fetchone()
+    return row is not None and re.search(r"\bWHERE\b", row[0] or "", re.IGNORECASE) is not None
+
+def verify_query_plans(conn: sqlite3.Connection) -> None:
+    """Fail if any dashboard query would scan a table instead of an index.
+    
+    Runs EXPLAIN QUERY PLAN on each query in DASHBOARD_QUERIES and
+    INDEXED_QUERIES and raises RuntimeError listing every query whose plan
+    has a SCAN that _scan_is_acceptable() rejects or does not use its
+    required index.
+    """
+    problems = []
+    for sql in DASHBOARD_QUERIES:
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+            detail = row[-1]
+            if detail.startswith("SCAN ") and not _scan_is_acceptable(conn, sql, detail):
+                problems.append(f"{sql}  ->  {detail}")
+    
+    for sql, index in INDEXED_QUERIES:
+        details = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        if not any(f"INDEX {index}" in detail for detail in details):
+            problems.append(f"{sql}  ->  {'; '.join(details)} (expected {index})")
+    
+    if problems:
+        raise RuntimeError(
+            "Dashboard queries are not served by their indexes:\n  "
+            + "\n  ".join(problems)
+        )
+
 def init_database():
     """Initialize the SQLite database with required tables."""
     
@@ -66,6 +166,11 @@ def init_database():
     """)
     print("✓ Created it_tickets table")
     
+# Indexes
+    for sql in INDEXES:
+        cur.execute(sql)
+    print("✓ Created indexes")
+    
  
     print("\nInserting test data...")
     
@@ -91,11 +196,10 @@ def init_database():
         ("DDoS Attack", "high", "Resolved", "DDoS attack mitigated, traffic normalized"),
     ]
     
-    for incident_type, severity, status, description in incidents:
-        cur.execute("""
-            INSERT OR IGNORE INTO security_incidents (incident_type, severity, status, description)
-            VALUES (?, ?, ?, ?)
-        """, (incident_type, severity, status, description))
+    cur.executemany("""
+        INSERT OR IGNORE INTO security_incidents (incident_type, severity, status, description)
+        VALUES (?, ?, ?, ?)
+    """, incidents)
     
     print("✓ Inserted test security incidents")
     
@@ -106,11 +210,10 @@ def init_database():
         ("Audit Trails", 1024 * 1024 * 1024, 250000, "CSV Files"),
     ]
     
-    for name, size_bytes, rows, source in datasets:
-        cur.execute("""
-            INSERT OR IGNORE INTO datasets (name, size_bytes, rows, source)
-            VALUES (?, ?, ?, ?)
-        """, (name, size_bytes, rows, source))
+    cur.executemany("""
+        INSERT OR IGNORE INTO datasets (name, size_bytes, rows, source)
+        VALUES (?, ?, ?, ?)
+    """, datasets)
     
     print("✓ Inserted test datasets")
     
@@ -121,16 +224,19 @@ def init_database():
         ("Email Configuration", "medium", "Resolved", "Support Team B"),
     ]
     
-    for title, priority, status, assigned_to in tickets:
-        cur.execute("""
-            INSERT OR IGNORE INTO it_tickets (title, priority, status, assigned_to)
-            VALUES (?, ?, ?, ?)
-        """, (title, priority, status, assigned_to))
+    cur.executemany("""
+        INSERT OR IGNORE INTO it_tickets (title, priority, status, assigned_to)
+        VALUES (?, ?, ?, ?)
+    """, tickets)
     
     print("✓ Inserted test IT tickets")
     
 # Commit changes
     conn.commit()
+    
+# Make sure the dashboards are served from indexes
+    verify_query_plans(conn)
+    print("✓ Verified dashboard query plans")
     conn.close()
     
     print(f"\n✅ Database initialized successfully at: {db_path}")
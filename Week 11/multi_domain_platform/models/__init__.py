@@ -1,8 +1,12 @@
 """Models package containing all entity classes."""
 
 from models.user import User
-from models.security_incident import SecurityIncident
-from models.dataset import Dataset
-from models.it_ticket import ITTicket
+from models.security_incident import SecurityIncident, IncidentBatch
+from models.dataset import Dataset, DatasetBatch
+from models.it_ticket import ITTicket, TicketBatch
+from models.columns import LabelColumn
 
-__all__ = ['User', 'SecurityIncident', 'Dataset', 'ITTicket']
\ No newline at end of file
+__all__ = [
+    'User', 'SecurityIncident', 'Dataset', 'ITTicket',
+    'IncidentBatch', 'DatasetBatch', 'TicketBatch', 'LabelColumn',
+]
\ No newline at end of file
@@ -0,0 +1,114 @@
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class LabelColumn:
+    """A low-cardinality text column (severity, status, ...) held as codes.
+
+    Each row stores a small integer code into ``labels``, the column's
+    distinct values, so a million rows cost a few megabytes and per-label
+    work (lower-casing, mapping to a level) runs once per label rather
+    than once per row. Missing values have code -1.
+    """
+
+    __slots__ = ("codes", "labels")
+
+    def __init__(self, codes: np.ndarray, labels: Sequence[Any]):
+        self.codes = codes
+        self.labels = np.asarray(labels, dtype=object)
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> "LabelColumn":
+        codes, labels = pd.factorize(np.asarray(list(values), dtype=object))
+        return cls(codes.astype(np.int32), labels)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Optional[Any]:
+        code = self.codes[index]
+        return None if code < 0 else self.labels[code]
+
+    def map(self, mapping: Dict[Any, Any], default: Any = None, dtype: Any = object) -> np.ndarray:
+        """Map every row through mapping (applied to the labels only)."""
+        # The default sits at the end so that code -1 picks it up
+        lookup = np.array(
+            [mapping.get(label, default) for label in self.labels] + [default], dtype=dtype
+        )
+        return lookup[self.codes]
+
+    def isin(self, values: Iterable[Any]) -> np.ndarray:
+        """Boolean mask of the rows whose label is one of values."""
+        wanted = set(values)
+        return self.map({label: label in wanted for label in self.labels}, False, bool)
+
+    def counts(self) -> Dict[Any, int]:
+        """Rows per label, for labels that occur."""
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.labels))
+        return {label: int(n) for label, n in zip(self.labels, counts) if n}
+
+    def take(self, selection: np.ndarray) -> "LabelColumn":
+        """Rows picked by an index array or boolean mask (labels are shared)."""
+        column = LabelColumn.__new__(LabelColumn)
+        column.codes = self.codes[selection]
+        column.labels = self.labels
+        return column
+
+
+def _build_column(kind: str, values: Sequence[Any]):
+    if kind == "label":
+        return LabelColumn.from_values(values)
+    if kind == "int":
+        return np.array(values, dtype=np.int64)
+    return np.array(values, dtype=object)
+
+
+class ColumnBatch:
+    """Base for column-oriented collections of one model class.
+
+    Subclasses list their columns in ``_fields`` (in the model's
+    constructor order) with a kind for each in ``_kinds``: "int" for an
+    int64 array, "label" for a LabelColumn, "text" for an object array.
+    Model objects are only built when a row is indexed or iterated.
+    """
+
+    __slots__ = ()
+    _fields: tuple = ()
+    _kinds: tuple = ()
+    _model: Any = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]]) -> "ColumnBatch":
+        """Build from rows in model constructor order (e.g. fetch_all results)."""
+        rows = rows if isinstance(rows, list) else list(rows)
+        batch = cls.__new__(cls)
+        for position, (field, kind) in enumerate(zip(cls._fields, cls._kinds)):
+            # One pass per column; zip(*rows) is several times slower on big results
+            values = list(map(itemgetter(position), rows))
+            setattr(batch, field, _build_column(kind, values))
+        return batch
+
+    def __len__(self) -> int:
+        return len(getattr(self, self._fields[0]))
+
+    def __getitem__(self, index: int):
+        values = []
+        for field in self._fields:
+            value = getattr(self, field)[index]
+            values.append(value.item() if isinstance(value, np.generic) else value)
+        return self._model(*values)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def take(self, selection: np.ndarray) -> "ColumnBatch":
+        """The rows picked by an index array or boolean mask, as a new batch."""
+        batch = type(self).__new__(type(self))
+        for field in self._fields:
+            column = getattr(self, field)
+            setattr(batch, field, column.take(selection) if isinstance(column, LabelColumn) else column[selection])
+        return batch
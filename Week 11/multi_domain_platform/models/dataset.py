@@ -1,6 +1,15 @@
+from typing import Dict
+
+import numpy as np
+
+from models.columns import ColumnBatch
+
+
 class Dataset:
     """Represents a data science dataset in the platform."""
     
+    __slots__ = ("__id", "__name", "__size_bytes", "__rows", "__source")
+    
     def __init__(self, dataset_id: int, name: str, size_bytes: int, 
                  rows: int, source: str):
         self.__id = dataset_id
@@ -48,4 +57,33 @@ class Dataset:
     def __str__(self) -> str:
         size_mb = self.calculate_size_mb()
         return (f"Dataset {self.__id}: {self.__name} "
-                f"({size_mb:.2f} MB, {self.__rows} rows, source: {self.__source})")
\ No newline at end of file
+                f"({size_mb:.2f} MB, {self.__rows} rows, source: {self.__source})")
+
+
+class DatasetBatch(ColumnBatch):
+    """Datasets held column by column.
+    
+    Build one with DatasetBatch.from_rows() from
+    (id, name, size_bytes, rows, source) rows.
+    """
+    
+    __slots__ = ("ids", "names", "sizes_bytes", "row_counts", "sources")
+    _fields = __slots__
+    _kinds = ("int", "text", "int", "int", "label")
+    _model = Dataset
+    
+    def size_mb(self) -> np.ndarray:
+        """Size of every dataset in megabytes (see Dataset.calculate_size_mb)."""
+        return self.sizes_bytes / (1024 * 1024)
+    
+    def size_gb(self) -> np.ndarray:
+        return self.sizes_bytes / (1024 * 1024 * 1024)
+    
+    def total_size_mb(self) -> float:
+        return float(self.sizes_bytes.sum()) / (1024 * 1024)
+    
+    def total_rows(self) -> int:
+        return int(self.row_counts.sum())
+    
+    def source_counts(self) -> Dict[str, int]:
+        return self.sources.counts()
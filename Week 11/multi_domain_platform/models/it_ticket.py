@@ -1,6 +1,15 @@
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from models.columns import ColumnBatch
+
+
 class ITTicket:
     """Represents an IT support ticket."""
     
+    __slots__ = ("__id", "__title", "__priority", "__status", "__assigned_to")
+    
     def __init__(self, ticket_id: int, title: str, priority: str, 
                  status: str, assigned_to: str = "Unassigned"):
         self.__id = ticket_id
@@ -57,4 +66,37 @@ class ITTicket:
     def __str__(self) -> str:
         return (f"Ticket {self.__id}: {self.__title} "
                 f"[{self.__priority}] – {self.__status} "
-                f"(assigned to: {self.__assigned_to})")
\ No newline at end of file
+                f"(assigned to: {self.__assigned_to})")
+
+
+class TicketBatch(ColumnBatch):
+    """IT tickets held column by column.
+    
+    Build one with TicketBatch.from_rows() from
+    (id, title, priority, status, assigned_to) rows.
+    """
+    
+    __slots__ = ("ids", "titles", "priorities", "statuses", "assignees")
+    _fields = __slots__
+    _kinds = ("int", "text", "label", "label", "label")
+    _model = ITTicket
+    
+    def priority_counts(self) -> Dict[str, int]:
+        return self.priorities.counts()
+    
+    def status_counts(self) -> Dict[str, int]:
+        return self.statuses.counts()
+    
+    def workload(self) -> Dict[str, int]:
+        """Tickets per assignee."""
+        return self.assignees.counts()
+    
+    def filter(self, statuses: Optional[Iterable[str]] = None,
+               priorities: Optional[Iterable[str]] = None) -> "TicketBatch":
+        """Tickets whose status and priority are among the given values."""
+        mask = np.ones(len(self), dtype=bool)
+        if statuses is not None:
+            mask &= self.statuses.isin(statuses)
+        if priorities is not None:
+            mask &= self.priorities.isin(priorities)
+        return self.take(mask)
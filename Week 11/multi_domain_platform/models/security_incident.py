@@ -1,6 +1,34 @@
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from models.columns import ColumnBatch
+
+# Severity label (lower case) -> level; anything else is 0 (unknown)
+SEVERITY_LEVELS = {
+    "low": 1,
+    "medium": 2,
+    "high": 3,
+    "critical": 4,
+}
+
+
+def severity_level_sql(column: str = "severity") -> str:
+    """SQL expression giving the SEVERITY_LEVELS level of a severity column.
+    
+    database/db.py builds idx_incidents_severity_level on security_incidents
+    from this function, so ranking or thresholding by it is answered from
+    the index.
+    """
+    cases = " ".join(f"WHEN '{label}' THEN {level}" for label, level in SEVERITY_LEVELS.items())
+    return f"CASE LOWER({column}) {cases} ELSE 0 END"
+
+
 class SecurityIncident:
     """Represents a cybersecurity incident in the platform."""
     
+    __slots__ = ("__id", "__incident_type", "__severity", "__status", "__description")
+    
     def __init__(self, incident_id: int, incident_type: str, severity: str, 
                  status: str, description: str):
         self.__id = incident_id
@@ -39,14 +67,62 @@ class SecurityIncident:
         Returns:
             int: 1=low, 2=medium, 3=high, 4=critical, 0=unknown
         """
-        mapping = {
-            "low": 1,
-            "medium": 2,
-            "high": 3,
-            "critical": 4,
-        }
-        return mapping.get(self.__severity.lower(), 0)
+        level = SEVERITY_LEVELS.get(self.__severity)
+        if level is None:
+            level = SEVERITY_LEVELS.get(self.__severity.lower(), 0)
+        return level
     
     def __str__(self) -> str:
         return (f"Incident {self.__id} [{self.__severity.upper()}] "
-                f"{self.__incident_type} - Status: {self.__status}")
\ No newline at end of file
+                f"{self.__incident_type} - Status: {self.__status}")
+
+
+class IncidentBatch(ColumnBatch):
+    """Security incidents held column by column.
+    
+    Build one with IncidentBatch.from_rows() from
+    (id, incident_type, severity, status, description) rows. Whole-table
+    operations run over the arrays without creating a SecurityIncident
+    per row.
+    """
+    
+    __slots__ = ("ids", "incident_types", "severities", "statuses", "descriptions")
+    _fields = __slots__
+    _kinds = ("int", "label", "label", "label", "text")
+    _model = SecurityIncident
+    
+    def severity_levels(self) -> np.ndarray:
+        """Severity level of every incident (see SecurityIncident.get_severity_level)."""
+        levels = {label: SEVERITY_LEVELS.get(str(label).lower(), 0) for label in self.severities.labels}
+        return self.severities.map(levels, 0, np.int8)
+    
+    def rank_by_severity(self) -> np.ndarray:
+        """Row positions from most to least severe, newest first within a level."""
+        return np.lexsort((-self.ids, -self.severity_levels().astype(np.int16)))
+    
+    def sort_by_severity(self) -> "IncidentBatch":
+        return self.take(self.rank_by_severity())
+    
+    def top(self, n: int) -> "IncidentBatch":
+        """The n most severe incidents."""
+        return self.take(self.rank_by_severity()[:n])
+    
+    def at_least(self, level: int) -> "IncidentBatch":
+        """Incidents whose severity level is level or higher."""
+        return self.take(self.severity_levels() >= level)
+    
+    def severity_counts(self) -> Dict[str, int]:
+        return self.severities.counts()
+    
+    def status_counts(self) -> Dict[str, int]:
+        return self.statuses.counts()
+    
+    def filter(self, severities: Optional[Iterable[str]] = None,
+               statuses: Optional[Iterable[str]] = None) -> "IncidentBatch":
+        """Incidents whose severity and status are among the given values."""
+        mask = np.ones(len(self), dtype=bool)
+        if severities is not None:
+            mask &= self.severities.isin(severities)
+        if statuses is not None:
+            mask &= self.statuses.isin(statuses)
+        return self.take(mask)
@@ -1,6 +1,8 @@
 import streamlit as st
 from services.database_manager import DatabaseManager
-from models.security_incident import SecurityIncident
+from services.paginated_list import PaginatedList
+from repositories.incident_repository import IncidentRepository
+from models.security_incident import SEVERITY_LEVELS
 
 st.set_page_config(page_title="Cybersecurity", page_icon="🛡️")
 
@@ -15,66 +17,77 @@ if st.session_state.get("current_user") is None:
 # Initialize database
 db = DatabaseManager("database/platform.db")
 db.connect()
+incidents = IncidentRepository(db)
 
 tab1, tab2 = st.tabs(["View Incidents", "Create Incident"])
 
 with tab1:
     st.subheader("Security Incidents")
     
+    min_severity = st.selectbox(
+        "Minimum Severity",
+        ["Any", "low", "medium", "high", "critical"]
+    )
+    
     try:
-        rows = db.fetch_all(
-            "SELECT id, incident_type, severity, status, description FROM security_incidents ORDER BY id DESC"
+        # Ranked in SQL on idx_incidents_severity_level, so only five rows are read
+        most_severe = list(incidents.most_severe(5))
+        if most_severe:
+            st.write("**🚨 Most Severe Incidents**")
+            for incident in most_severe:
+                st.caption(str(incident))
+            st.markdown("---")
+        
+        # Only the visible page is read from SQLite and turned into models
+        incident_list = PaginatedList(
+            incidents,
+            key="incident_list",
+            filters=IncidentRepository.severity_at_least(SEVERITY_LEVELS.get(min_severity, 0)),
         )
         
-        if rows:
-            incidents = [
-                SecurityIncident(row[0], row[1], row[2], row[3], row[4])
-                for row in rows
-            ]
-            
-            for incident in incidents:
-                with st.container(border=True):
-                    col1, col2, col3 = st.columns([2, 1, 1])
-                    
-                    with col1:
-                        st.write(f"**{incident.get_incident_type()}**")
-                        st.write(f"Description: {incident.get_description()}")
+        for incident in incident_list.show_page("📭 No security incidents found."):
+            with st.container(border=True):
+                col1, col2, col3 = st.columns([2, 1, 1])
+                
+                with col1:
+                    st.write(f"**{incident.get_incident_type()}**")
+                    st.write(f"Description: {incident.get_description()}")
+                
+                with col2:
+                    severity_color = {
+                        "low": "🟢",
+                        "medium": "🟡",
+                        "high": "🔴",
+                        "critical": "⚫"
+                    }
+                    color = severity_color.get(incident.get_severity().lower(), "⚪")
+                    st.write(f"{color} **{incident.get_severity().upper()}**")
+                    st.write(f"Level: {incident.get_severity_level()}/4")
+                
+                with col3:
+                    status_badge = {
+                        "Open": "🔴",
+                        "In Progress": "🟡",
+                        "Resolved": "🟢"
+                    }
+                    badge = status_badge.get(incident.get_status(), "⚪")
+                    st.write(f"{badge} {incident.get_status()}")
                     
-                    with col2:
-                        severity_color = {
-                            "low": "🟢",
-                            "medium": "🟡",
-                            "high": "🔴",
-                            "critical": "⚫"
-                        }
-                        color = severity_color.get(incident.get_severity().lower(), "⚪")
-                        st.write(f"{color} **{incident.get_severity().upper()}**")
-                        st.write(f"Level: {incident.get_severity_level()}/4")
-                    
-                    with col3:
-                        status_badge = {
-                            "Open": "🔴",
-                            "In Progress": "🟡",
-                            "Resolved": "🟢"
-                        }
-                        badge = status_badge.get(incident.get_status(), "⚪")
-                        st.write(f"{badge} {incident.get_status()}")
-                        
-                        if st.button(f"Update Incident {incident.get_id()}", key=f"update_{incident.get_id()}"):
-                            new_status = st.selectbox(
-                                f"New status for Incident {incident.get_id()}",
-                                ["Open", "In Progress", "Resolved"],
-                                key=f"status_{incident.get_id()}"
+                    if st.button(f"Update Incident {incident.get_id()}", key=f"update_{incident.get_id()}"):
+                        new_status = st.selectbox(
+                            f"New status for Incident {incident.get_id()}",
+                            ["Open", "In Progress", "Resolved"],
+                            key=f"status_{incident.get_id()}"
+                        )
+                        if st.button(f"Confirm Update {incident.get_id()}", key=f"confirm_{incident.get_id()}"):
+                            db.execute_query(
+                                "UPDATE security_incidents SET status = ? WHERE id = ?",
+                                (new_status, incident.get_id())
                             )
-                            if st.button(f"Confirm Update {incident.get_id()}", key=f"confirm_{incident.get_id()}"):
-                                db.execute_query(
-                                    "UPDATE security_incidents SET status = ? WHERE id = ?",
-                                    (new_status, incident.get_id())
-                                )
-                                st.success(f"✅ Incident {incident.get_id()} updated!")
-                                st.rerun()
-        else:
-            st.info("📭 No security incidents found.")
+                            st.success(f"✅ Incident {incident.get_id()} updated!")
+                            st.rerun()
+        
+        incident_list.show_navigation()
     
     except Exception as e:
         st.error(f"❌ Error loading incidents: {str(e)}")
@@ -1,6 +1,7 @@
 import streamlit as st
 from services.database_manager import DatabaseManager
-from models.dataset import Dataset
+from services.paginated_list import PaginatedList
+from repositories.dataset_repository import DatasetRepository
 
 st.set_page_config(page_title="Data Science", page_icon="📊")
 
@@ -15,6 +16,7 @@ if st.session_state.get("current_user") is None:
 # Initialize database
 db = DatabaseManager("database/platform.db")
 db.connect()
+datasets = DatasetRepository(db)
 
 tab1, tab2 = st.tabs(["View Datasets", "Upload Dataset"])
 
@@ -22,34 +24,28 @@ with tab1:
     st.subheader("Available Datasets")
     
     try:
-        rows = db.fetch_all(
-            "SELECT id, name, size_bytes, rows, source FROM datasets ORDER BY id DESC"
-        )
+        # Totals come from one aggregate query instead of summing in Python
+        dataset_count, total_bytes, total_rows = datasets.totals()
         
-        if rows:
-            datasets = [
-                Dataset(row[0], row[1], row[2], row[3], row[4])
-                for row in rows
-            ]
-            
+        if dataset_count:
             # Display as metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Total Datasets", len(datasets))
+                st.metric("Total Datasets", dataset_count)
             with col2:
-                total_mb = sum(d.calculate_size_mb() for d in datasets)
-                st.metric("Total Size", f"{total_mb:.2f} MB")
+                st.metric("Total Size", f"{total_bytes / (1024 * 1024):.2f} MB")
             with col3:
-                total_rows = sum(d.get_rows() for d in datasets)
                 st.metric("Total Rows", f"{total_rows:,}")
             with col4:
-                avg_rows = total_rows // len(datasets) if datasets else 0
+                avg_rows = total_rows // dataset_count
                 st.metric("Avg Rows", f"{avg_rows:,}")
             
             st.markdown("---")
             
+            dataset_list = PaginatedList(datasets, key="dataset_list")
+            
             # Display datasets
-            for dataset in datasets:
+            for dataset in dataset_list.show_page("📭 No datasets found."):
                 with st.container(border=True):
                     col1, col2, col3 = st.columns([2, 1, 1])
                     
@@ -66,6 +62,8 @@ with tab1:
                         if st.button(f"Download {dataset.get_id()}", key=f"download_{dataset.get_id()}"):
                             st.info(f"📥 Downloading {dataset.get_name()}...")
                             st.success("✅ Download started!")
+            
+            dataset_list.show_navigation()
         else:
             st.info("📭 No datasets found.")
     
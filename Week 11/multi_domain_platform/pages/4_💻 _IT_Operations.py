@@ -1,6 +1,8 @@
 import streamlit as st
 from services.database_manager import DatabaseManager
-from models.it_ticket import ITTicket
+from services.paginated_list import PaginatedList
+from services.query_filters import QueryFilter
+from repositories.ticket_repository import TicketRepository
 
 st.set_page_config(page_title="IT Operations", page_icon="💻")
 
@@ -15,6 +17,7 @@ if st.session_state.get("current_user") is None:
 # Initialize database
 db = DatabaseManager("database/platform.db")
 db.connect()
+tickets = TicketRepository(db)
 
 tab1, tab2 = st.tabs(["View Tickets", "Create Ticket"])
 
@@ -37,83 +40,72 @@ with tab1:
         )
     
     try:
-        rows = db.fetch_all(
-            "SELECT id, title, priority, status, assigned_to FROM it_tickets ORDER BY id DESC"
-        )
+        # Filters run in SQL (on idx_tickets_status_priority), so only
+        # matching tickets are counted and paged
+        ticket_filter = QueryFilter({"status": filter_status, "priority": filter_priority})
         
-        if rows:
-            tickets = [
-                ITTicket(row[0], row[1], row[2], row[3], row[4])
-                for row in rows
-            ]
-            
-            # Apply filters
-            filtered_tickets = [
-                t for t in tickets
-                if t.get_status() in filter_status and t.get_priority() in filter_priority
-            ]
+        status_counts = {"Open": 0, "In Progress": 0, "Closed": 0}
+        status_counts.update(tickets.count_by("status", ticket_filter))
+        matched = sum(status_counts.values())
+        
+        if matched:
+            # Display metrics
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Total Tickets", matched)
+            with col2:
+                st.metric("Open", status_counts["Open"])
+            with col3:
+                st.metric("In Progress", status_counts["In Progress"])
+            with col4:
+                st.metric("Closed", status_counts["Closed"])
             
-            if filtered_tickets:
-                # Display metrics
-                col1, col2, col3, col4 = st.columns(4)
+            st.markdown("---")
+        
+        ticket_list = PaginatedList(tickets, key="ticket_list", filters=ticket_filter)
+        
+        for ticket in ticket_list.show_page("📭 No tickets matching the filters."):
+            with st.container(border=True):
+                col1, col2, col3 = st.columns([2, 1, 1])
+                
                 with col1:
-                    st.metric("Total Tickets", len(filtered_tickets))
-                with col2:
-                    open_count = sum(1 for t in filtered_tickets if t.get_status() == "Open")
-                    st.metric("Open", open_count)
-                with col3:
-                    in_progress = sum(1 for t in filtered_tickets if t.get_status() == "In Progress")
-                    st.metric("In Progress", in_progress)
-                with col4:
-                    closed_count = sum(1 for t in filtered_tickets if t.get_status() == "Closed")
-                    st.metric("Closed", closed_count)
+                    st.write(f"**{ticket.get_title()}**")
+                    st.caption(f"Assigned to: {ticket.get_assigned_to()}")
                 
-                st.markdown("---")
+                with col2:
+                    priority_color = {
+                        "low": "🟢",
+                        "medium": "🟡",
+                        "high": "🔴",
+                        "critical": "⚫"
+                    }
+                    color = priority_color.get(ticket.get_priority(), "⚪")
+                    st.write(f"{color} **{ticket.get_priority().upper()}**")
                 
-                for ticket in filtered_tickets:
-                    with st.container(border=True):
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        
-                        with col1:
-                            st.write(f"**{ticket.get_title()}**")
-                            st.caption(f"Assigned to: {ticket.get_assigned_to()}")
-                        
-                        with col2:
-                            priority_color = {
-                                "low": "🟢",
-                                "medium": "🟡",
-                                "high": "🔴",
-                                "critical": "⚫"
-                            }
-                            color = priority_color.get(ticket.get_priority(), "⚪")
-                            st.write(f"{color} **{ticket.get_priority().upper()}**")
-                        
-                        with col3:
-                            status_emoji = {
-                                "Open": "🔴",
-                                "In Progress": "🟡",
-                                "Closed": "🟢"
-                            }
-                            emoji = status_emoji.get(ticket.get_status(), "⚪")
-                            st.write(f"{emoji} {ticket.get_status()}")
-                            
-                            if st.button(f"Update Ticket {ticket.get_id()}", key=f"update_{ticket.get_id()}"):
-                                new_status = st.selectbox(
-                                    f"New status for Ticket {ticket.get_id()}",
-                                    ["Open", "In Progress", "Closed"],
-                                    key=f"status_{ticket.get_id()}"
-                                )
-                                if st.button(f"Confirm Update {ticket.get_id()}", key=f"confirm_{ticket.get_id()}"):
-                                    db.execute_query(
-                                        "UPDATE it_tickets SET status = ? WHERE id = ?",
-                                        (new_status, ticket.get_id())
-                                    )
-                                    st.success(f"✅ Ticket {ticket.get_id()} updated!")
-                                    st.rerun()
-            else:
-                st.info("📭 No tickets matching the filters.")
-        else:
-            st.info("📭 No support tickets found.")
+                with col3:
+                    status_emoji = {
+                        "Open": "🔴",
+                        "In Progress": "🟡",
+                        "Closed": "🟢"
+                    }
+                    emoji = status_emoji.get(ticket.get_status(), "⚪")
+                    st.write(f"{emoji} {ticket.get_status()}")
+                    
+                    if st.button(f"Update Ticket {ticket.get_id()}", key=f"update_{ticket.get_id()}"):
+                        new_status = st.selectbox(
+                            f"New status for Ticket {ticket.get_id()}",
+                            ["Open", "In Progress", "Closed"],
+                            key=f"status_{ticket.get_id()}"
+                        )
+                        if st.button(f"Confirm Update {ticket.get_id()}", key=f"confirm_{ticket.get_id()}"):
+                            db.execute_query(
+                                "UPDATE it_tickets SET status = ? WHERE id = ?",
+                                (new_status, ticket.get_id())
+                            )
+                            st.success(f"✅ Ticket {ticket.get_id()} updated!")
+                            st.rerun()
+        
+        ticket_list.show_navigation()
     
     except Exception as e:
         st.error(f"❌ Error loading tickets: {str(e)}")
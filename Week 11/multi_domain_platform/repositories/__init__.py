@@ -0,0 +1,9 @@
+"""Repositories package: model loading on top of DatabaseManager."""
+
+from repositories.base import Repository
+from repositories.incident_repository import IncidentRepository
+from repositories.ticket_repository import TicketRepository
+from repositories.dataset_repository import DatasetRepository
+from repositories.user_repository import UserRepository
+
+__all__ = ['Repository', 'IncidentRepository', 'TicketRepository', 'DatasetRepository', 'UserRepository']
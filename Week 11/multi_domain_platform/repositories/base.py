@@ -0,0 +1,99 @@
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Union
+
+from services.database_manager import DatabaseManager
+from services.query_filters import QueryFilter
+
+Filters = Union[QueryFilter, Dict[str, Sequence[Any]], None]
+
+
+class Repository:
+    """Reads one model class from its table through a DatabaseManager.
+
+    Subclasses set ``table``, ``model`` and ``columns`` (the columns that
+    fill the model's constructor, in order). Models are built by the
+    cursor's row factory as rows are read, so a query never holds a list
+    of tuples and a list of objects at the same time. Passing ``columns``
+    to find() selects only those columns; the model's other fields are
+    left as None.
+    """
+
+    table: str = ""
+    model: Callable[..., Any] = None
+    columns: Sequence[str] = ()
+    key: str = "id"
+    # Column batch class (models/columns.py) for find_batch(), if any
+    batch_class: Any = None
+
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+
+    def _row_factory(self, columns: Sequence[str]) -> Callable[[Any, tuple], Any]:
+        model = self.model
+        if tuple(columns) == tuple(self.columns):
+            return lambda cursor, row: model(*row)
+
+        positions = {column: index for index, column in enumerate(columns)}
+        picks = [positions.get(column) for column in self.columns]
+        return lambda cursor, row: model(*[None if i is None else row[i] for i in picks])
+
+    def _projection(self, columns: Optional[Sequence[str]]) -> Sequence[str]:
+        if columns is None:
+            return self.columns
+        unknown = set(columns) - set(self.columns)
+        if unknown:
+            raise ValueError(f"Unknown {self.table} columns: {', '.join(sorted(unknown))}")
+        return [column for column in self.columns if column in columns]
+
+    @staticmethod
+    def _filter(filters: Filters) -> QueryFilter:
+        return filters if isinstance(filters, QueryFilter) else QueryFilter(filters)
+
+    def find(self, filters: Filters = None, columns: Optional[Sequence[str]] = None,
+             order_by: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Any]:
+        """Lazily yield the models matching filters (newest first by default).
+
+        Args:
+            filters: QueryFilter, or a {column: allowed values} dict
+            columns: Only read these columns (others are None in the model)
+            order_by: SQL ORDER BY clause; defaults to the key, descending
+            limit: Stop after this many rows
+        """
+        query_filter = self._filter(filters)
+        columns = self._projection(columns)
+        sql = (
+            f"SELECT {', '.join(columns)} FROM {self.table} WHERE {query_filter.where()} "
+            f"ORDER BY {order_by or f'{self.key} DESC'}"
+        )
+        params = query_filter.params()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return self._db.fetch_objects(sql, params, self._row_factory(columns))
+
+    def get_by_id(self, key: Any) -> Optional[Any]:
+        """The model whose key column equals key, or None."""
+        return next(self.find(QueryFilter({self.key: [key]}), limit=1), None)
+
+    def count(self, filters: Filters = None, cap: Optional[int] = None) -> int:
+        """Rows matching filters; with cap, counting stops after cap + 1 rows."""
+        query_filter = self._filter(filters)
+        sql = f"SELECT 1 FROM {self.table} WHERE {query_filter.where()}"
+        params = query_filter.params()
+        if cap is not None:
+            sql += " LIMIT ?"
+            params += (cap + 1,)
+        return self._db.fetch_one(f"SELECT COUNT(*) FROM ({sql})", params)[0]
+
+    def count_by(self, column: str, filters: Filters = None) -> Dict[Any, int]:
+        """Matching rows per value of column, from one GROUP BY."""
+        return self._filter(filters).count_by(self._db, self.table, column)
+
+    def find_batch(self, filters: Filters = None) -> Any:
+        """All matching rows as one column batch (e.g. IncidentBatch)."""
+        query_filter = self._filter(filters)
+        rows = self._db.fetch_all(
+            f"SELECT {', '.join(self.columns)} FROM {self.table} WHERE {query_filter.where()} "
+            f"ORDER BY {self.key} DESC",
+            query_filter.params()
+        )
+        return self.batch_class.from_rows(rows)
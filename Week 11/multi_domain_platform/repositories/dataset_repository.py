@@ -0,0 +1,19 @@
+from typing import Tuple
+
+from models.dataset import Dataset, DatasetBatch
+from repositories.base import Repository
+
+
+class DatasetRepository(Repository):
+    """Datasets, read from datasets."""
+
+    table = "datasets"
+    model = Dataset
+    columns = ("id", "name", "size_bytes", "rows", "source")
+    batch_class = DatasetBatch
+
+    def totals(self) -> Tuple[int, int, int]:
+        """(dataset count, total size in bytes, total rows) from one aggregate query."""
+        return self._db.fetch_one(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0), COALESCE(SUM(rows), 0) FROM datasets"
+        )
@@ -0,0 +1,28 @@
+from typing import Iterator, Optional, Sequence
+
+from models.security_incident import IncidentBatch, SecurityIncident, severity_level_sql
+from repositories.base import Filters, Repository
+from services.query_filters import QueryFilter
+
+
+class IncidentRepository(Repository):
+    """Security incidents, read from security_incidents."""
+
+    table = "security_incidents"
+    model = SecurityIncident
+    columns = ("id", "incident_type", "severity", "status", "description")
+    batch_class = IncidentBatch
+
+    @classmethod
+    def severity_at_least(cls, level: int, filters: Filters = None) -> QueryFilter:
+        """filters narrowed to incidents whose severity level is level or higher."""
+        return cls._filter(filters).and_(f"{severity_level_sql()} >= ?", level)
+
+    def most_severe(self, n: int = 5, filters: Filters = None,
+                    columns: Optional[Sequence[str]] = None) -> Iterator[SecurityIncident]:
+        """The n most severe incidents, newest first within a level.
+
+        Ordered by the indexed severity level expression, so only n rows
+        are read.
+        """
+        return self.find(filters, columns, order_by=f"{severity_level_sql()} DESC, id DESC", limit=n)
@@ -0,0 +1,11 @@
+from models.it_ticket import ITTicket, TicketBatch
+from repositories.base import Repository
+
+
+class TicketRepository(Repository):
+    """IT support tickets, read from it_tickets."""
+
+    table = "it_tickets"
+    model = ITTicket
+    columns = ("id", "title", "priority", "status", "assigned_to")
+    batch_class = TicketBatch
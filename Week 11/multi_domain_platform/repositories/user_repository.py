@@ -0,0 +1,16 @@
+from typing import Optional
+
+from models.user import User
+from repositories.base import Repository
+from services.query_filters import QueryFilter
+
+
+class UserRepository(Repository):
+    """Platform users, read from users."""
+
+    table = "users"
+    model = User
+    columns = ("username", "password_hash", "role")
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        return next(self.find(QueryFilter({"username": [username]}), limit=1), None)
@@ -3,5 +3,6 @@
 from services.database_manager import DatabaseManager
 from services.auth_manager import AuthManager, SimpleHasher
 from services.ai_assistant import AIAssistant
+from services.query_filters import QueryFilter
 
-__all__ = ['DatabaseManager', 'AuthManager', 'SimpleHasher', 'AIAssistant']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'AuthManager', 'SimpleHasher', 'AIAssistant', 'QueryFilter']
\ No newline at end of file
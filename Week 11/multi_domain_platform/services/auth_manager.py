@@ -17,15 +17,16 @@ class SimpleHasher:
 class AuthManager:
     
     def __init__(self, db: DatabaseManager):
+        # Imported here: repositories build on services, so a module-level
+        # import would make the two packages import each other
+        from repositories.user_repository import UserRepository
+        
         self._db = db
+        self._users = UserRepository(db)
     
     def register_user(self, username: str, password: str, role: str = "user") -> bool:
         # Check if user already exists
-        existing = self._db.fetch_one(
-            "SELECT username FROM users WHERE username = ?",
-            (username,)
-        )
-        if existing:
+        if self._users.count({"username": [username]}):
             return False  # User already exists
         
         password_hash = SimpleHasher.hash_password(password)
@@ -40,26 +41,11 @@ class AuthManager:
             return False
     
     def login_user(self, username: str, password: str) -> Optional[User]:
-        row = self._db.fetch_one(
-            "SELECT username, password_hash, role FROM users WHERE username = ?",
-            (username,),
-        )
-        if row is None:
-            return None
-        
-        username_db, password_hash_db, role_db = row
-        if SimpleHasher.check_password(password, password_hash_db):
-            return User(username_db, password_hash_db, role_db)
+        user = self._users.get_by_username(username)
+        if user is not None and user.verify_password(password, SimpleHasher):
+            return user
         
         return None
     
     def get_user_by_username(self, username: str) -> Optional[User]:
-        row = self._db.fetch_one(
-            "SELECT username, password_hash, role FROM users WHERE username = ?",
-            (username,),
-        )
-        if row is None:
-            return None
-        
-        username_db, password_hash_db, role_db = row
-        return User(username_db, password_hash_db, role_db)
\ No newline at end of file
+        return self._users.get_by_username(username)
\ No newline at end of file
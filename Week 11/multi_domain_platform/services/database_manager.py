@@ -1,12 +1,16 @@
 import sqlite3
-from typing import Any, Iterable
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 
 class DatabaseManager:
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, autocommit: bool = True):
         
         self._db_path = db_path
         self._connection: sqlite3.Connection | None = None
+        # When False, writes stay pending until commit() is called
+        self._autocommit = autocommit
+        self._transaction_depth = 0
     
     def connect(self) -> None:
      
@@ -19,12 +23,66 @@ class DatabaseManager:
             self._connection.close()
             self._connection = None
     
+    def set_autocommit(self, enabled: bool) -> None:
+        """Switch deferred-commit mode off (True) or on (False)."""
+        self._autocommit = enabled
+    
+    def commit(self) -> None:
+        if self._connection is not None and self._transaction_depth == 0:
+            self._connection.commit()
+    
+    def rollback(self) -> None:
+        """Roll back pending writes made outside transaction().
+        
+        Inside a transaction() block, raise out of the block instead; that
+        rolls back the whole transaction and keeps the nesting in step.
+        """
+        if self._transaction_depth > 0:
+            raise RuntimeError(
+                "rollback() called inside transaction(); raise out of the block to roll it back"
+            )
+        if self._connection is not None:
+            self._connection.rollback()
+    
+    def _maybe_commit(self) -> None:
+        if self._autocommit and self._transaction_depth == 0:
+            self._connection.commit()
+    
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one transaction (and one fsync).
+        
+        Commits when the outermost block exits normally and rolls back if
+        it raises. Nested blocks join the enclosing transaction.
+        """
+        if self._connection is None:
+            self.connect()
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._connection.rollback()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._connection.commit()
+    
     def execute_query(self, sql: str, params: Iterable[Any] = ()):
         if self._connection is None:
             self.connect()
         cur = self._connection.cursor()
         cur.execute(sql, tuple(params))
-        self._connection.commit()
+        self._maybe_commit()
+        return cur
+    
+    def execute_many(self, sql: str, rows: Iterable[Iterable[Any]]):
+        """Run one statement for every parameter row inside a single transaction."""
+        with self.transaction():
+            cur = self._connection.cursor()
+            cur.executemany(sql, (tuple(row) for row in rows))
         return cur
     
     def fetch_one(self, sql: str, params: Iterable[Any] = ()):
@@ -39,4 +97,42 @@ class DatabaseManager:
             self.connect()
         cur = self._connection.cursor()
         cur.execute(sql, tuple(params))
-        return cur.fetchall()
\ No newline at end of file
+        return cur.fetchall()
+    
+    def fetch_batches(self, sql: str, params: Iterable[Any] = (), size: int = 500) -> Iterator[List[tuple]]:
+        """Stream a query's rows as lists of at most `size` rows (via fetchmany)."""
+        if self._connection is None:
+            self.connect()
+        cur = self._connection.cursor()
+        cur.execute(sql, tuple(params))
+        try:
+            while True:
+                batch = cur.fetchmany(size)
+                if not batch:
+                    break
+                yield batch
+        finally:
+            cur.close()
+    
+    def fetch_objects(self, sql: str, params: Iterable[Any] = (),
+                      row_factory: Optional[Callable[[sqlite3.Cursor, tuple], Any]] = None) -> Iterator[Any]:
+        """Stream a query's rows as the objects row_factory builds from them.
+        
+        row_factory is installed on the cursor (see sqlite3.Cursor.row_factory),
+        so each object is built as its row is read, with no list of tuples
+        in between.
+        """
+        if self._connection is None:
+            self.connect()
+        cur = self._connection.cursor()
+        cur.row_factory = row_factory
+        cur.execute(sql, tuple(params))
+        try:
+            yield from cur
+        finally:
+            cur.close()
+    
+    def fetch_iter(self, sql: str, params: Iterable[Any] = (), batch_size: int = 500) -> Iterator[tuple]:
+        """Stream a query's rows one at a time without materializing the result."""
+        for batch in self.fetch_batches(sql, params, batch_size):
+            yield from batch
\ No newline at end of file
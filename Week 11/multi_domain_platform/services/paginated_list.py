@@ -0,0 +1,114 @@
+from itertools import islice
+from typing import Any, List, Optional, Sequence, Tuple
+
+import streamlit as st
+
+from services.query_filters import QueryFilter
+
+PAGE_SIZES = (10, 25, 50, 100)
+
+# Rows counted before the total is shown as "N+" instead of exactly
+COUNT_CAP = 10_000
+
+
+class PaginatedList:
+    """Newest-first list that fetches and renders one page of rows per run.
+
+    Pages are read from a repository (repositories/) with a keyset query
+    (``id < last id of the previous page ORDER BY id DESC LIMIT
+    page_size + 1``), so only the rows of the visible page are read from
+    SQLite and built into model objects, and a deep page costs the same as
+    the first. The position is kept in ``st.session_state`` under ``key``
+    and goes back to the first page when the filter or the page size
+    changes.
+    """
+
+    def __init__(self, repository: Any, key: str, filters: Optional[QueryFilter] = None,
+                 page_sizes: Sequence[int] = PAGE_SIZES, count_cap: int = COUNT_CAP):
+        self._repository = repository
+        self._key = key
+        self._filters = filters or QueryFilter()
+        self._page_sizes = tuple(page_sizes)
+        self._count_cap = count_cap
+        self._page: Tuple[dict, List[Any], bool] = ({}, [], False)
+
+    def _state(self, page_size: int) -> dict:
+        """Navigation state for this list, reset when the query changes."""
+        signature = (
+            self._repository.table, self._filters.where(), self._filters.params(), page_size
+        )
+        state = st.session_state.get(self._key)
+        if state is None or state["signature"] != signature:
+            # anchors[i] is the id the i-th visited page starts below
+            state = {"signature": signature, "anchors": [None], "last_id": None}
+            st.session_state[self._key] = state
+        return state
+
+    def fetch_page(self, after_id: Optional[int], page_size: int) -> Tuple[List[Any], bool]:
+        """Return (items, has_next) for the page starting below after_id."""
+        filters = self._filters if after_id is None else self._filters.and_("id < ?", after_id)
+        # The extra row only tells whether there is a next page
+        rows = self._repository.find(filters, limit=page_size + 1)
+        items = list(islice(rows, page_size))
+        return items, next(rows, None) is not None
+
+    def count_estimate(self) -> Tuple[int, bool]:
+        """Return (count, capped): matching rows, counted up to count_cap."""
+        count = self._repository.count(self._filters, cap=self._count_cap)
+        return min(count, self._count_cap), count > self._count_cap
+
+    def show_page(self, empty_message: str) -> List[Any]:
+        """Draw the page-size selector and row count; returns the page's items.
+        
+        The caller renders the items, then calls show_navigation().
+        """
+        page_size = st.selectbox(
+            "Rows per page", self._page_sizes, key=f"{self._key}_page_size"
+        )
+        state = self._state(page_size)
+        items, has_next = self.fetch_page(state["anchors"][-1], page_size)
+        if not items and len(state["anchors"]) > 1:
+            # Rows were deleted under us: start again from the first page
+            state["anchors"] = [None]
+            items, has_next = self.fetch_page(None, page_size)
+        self._page = (state, items, has_next)
+
+        if not items:
+            st.info(empty_message)
+            return items
+
+        count, capped = self.count_estimate()
+        first = (len(state["anchors"]) - 1) * page_size + 1
+        total = f"{count:,}+" if capped else f"{count:,}"
+        st.caption(f"Showing {first:,}–{first + len(items) - 1:,} of {total}")
+        return items
+
+    def show_navigation(self) -> None:
+        """Draw the Previous/Next buttons for the page from show_page()."""
+        state, items, has_next = self._page
+        if not items:
+            return
+        state["last_id"] = self._item_id(items[-1])
+        page_number = len(state["anchors"])
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("◀ Previous", key=f"{self._key}_prev", disabled=page_number == 1,
+                      on_click=self._previous_page, args=(state,))
+        with col2:
+            st.caption(f"Page {page_number}")
+        with col3:
+            st.button("Next ▶", key=f"{self._key}_next", disabled=not has_next,
+                      on_click=self._next_page, args=(state,))
+
+    @staticmethod
+    def _item_id(item: Any) -> int:
+        return item.get_id()
+
+    @staticmethod
+    def _next_page(state: dict) -> None:
+        state["anchors"].append(state["last_id"])
+
+    @staticmethod
+    def _previous_page(state: dict) -> None:
+        if len(state["anchors"]) > 1:
+            state["anchors"].pop()
@@ -0,0 +1,56 @@
+import re
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from services.database_manager import DatabaseManager
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class QueryFilter:
+    """Multiselect selections turned into a parameterized WHERE clause.
+
+    Maps each column to the values selected for it, e.g.
+    ``QueryFilter({"status": ["Open"], "priority": ["high", "critical"]})``
+    gives ``status IN (?) AND priority IN (?, ?)``. Like an empty
+    multiselect, an empty selection matches nothing. Selected values are
+    always bound as parameters; column names must be plain identifiers.
+
+    ``conditions`` adds further (sql, params) terms written by the
+    calling code, such as a keyset bound or a computed threshold.
+    """
+
+    def __init__(self, selections: Optional[Dict[str, Sequence[Any]]] = None,
+                 conditions: Sequence[Tuple[str, Sequence[Any]]] = ()):
+        selections = selections or {}
+        for column in selections:
+            if not _IDENTIFIER.match(column):
+                raise ValueError(f"Invalid column name: {column!r}")
+        self._selections = {column: tuple(values) for column, values in selections.items()}
+        self._conditions = tuple((sql, tuple(params)) for sql, params in conditions)
+
+    def and_(self, sql: str, *params: Any) -> "QueryFilter":
+        """A copy of this filter with one more condition."""
+        return QueryFilter(self._selections, self._conditions + ((sql, params),))
+
+    def where(self) -> str:
+        """The WHERE condition (without the keyword); '1' when empty."""
+        terms = [
+            f"{column} IN ({', '.join('?' * len(values))})"
+            for column, values in self._selections.items()
+        ]
+        terms += [f"({sql})" for sql, _ in self._conditions]
+        return " AND ".join(terms) if terms else "1"
+
+    def params(self) -> tuple:
+        params = tuple(value for values in self._selections.values() for value in values)
+        return params + tuple(value for _, values in self._conditions for value in values)
+
+    def count_by(self, db: DatabaseManager, table: str, column: str) -> Dict[Any, int]:
+        """Matching rows per value of column, from one GROUP BY in SQLite."""
+        if not _IDENTIFIER.match(column):
+            raise ValueError(f"Invalid column name: {column!r}")
+        rows = db.fetch_all(
+            f"SELECT {column}, COUNT(*) FROM {table} WHERE {self.where()} GROUP BY {column}",
+            self.params()
+        )
+        return dict(rows)
@@ -0,0 +1,355 @@
+"""
+Incremental CSV -> SQLite sync.
+
+Each CSV gets a checkpoint row (size, mtime, SHA-256 of the bytes already
+loaded, byte offset and row count). When a file only grew, just the new
+rows are appended; when anything before the offset changed, the rows that
+came from the CSV are replaced. Within one process an unchanged file costs
+a single stat() call.
+
+The tables are shared with the CRUD pages, so the rowid of every row
+loaded from a CSV is kept in csv_sync_rows. A reload deletes only those
+rows; a row the app inserted, or updated since, is never touched. The
+first sync of a table that already exists (loaded before checkpoints
+existed) only adopts the rows identical to a CSV row and saves a
+checkpoint - it never reloads.
+"""
+
+import csv
+import hashlib
+import io
+import os
+from collections import Counter
+from pathlib import Path
+
+from app.data.db import connect_database
+from app.data.normalize import add_normalized_columns
+from app.data.schema import create_indexes
+from app.data.snapshots import bump_version, ensure_version_tracking
+
+DATA_DIR = Path("DATA")
+
+CSV_TABLES = {
+    'users_data': 'users.csv',
+    'cyber_incidents': 'cyber_incidents.csv',
+    'it_tickets': 'it_tickets.csv',
+    'datasets_metadata': 'datasets_metadata.csv'
+}
+
+READ_BLOCK = 1024 * 1024
+
+# table -> (size, mtime_ns) of the CSV last synced by this process
+_last_seen = {}
+
+
+def create_checkpoint_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS csv_sync_state (
+            table_name TEXT PRIMARY KEY,
+            file_path TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            content_sha256 TEXT NOT NULL,
+            byte_offset INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            columns TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS csv_sync_rows (
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            PRIMARY KEY (table_name, row_id)
+        ) WITHOUT ROWID
+    """)
+
+
+def ensure_row_tracking(conn, table_name):
+    """
+    Forget a CSV row once the app updates or deletes it, so a reload leaves
+    the app's version alone and a reused rowid is not mistaken for a CSV
+    row (idempotent, no commit).
+    """
+    for event in ("UPDATE", "DELETE"):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table_name}_csv_rows_{event.lower()}
+            AFTER {event} ON {table_name}
+            BEGIN
+                DELETE FROM csv_sync_rows
+                WHERE table_name = '{table_name}' AND row_id = OLD.rowid;
+            END
+        """)
+
+
+def get_checkpoint(conn, table_name):
+    row = conn.execute("""
+        SELECT file_size, mtime_ns, content_sha256, byte_offset, row_count, columns
+        FROM csv_sync_state WHERE table_name = ?
+    """, (table_name,)).fetchone()
+    if row is None:
+        return None
+    return {
+        "file_size": row[0],
+        "mtime_ns": row[1],
+        "content_sha256": row[2],
+        "byte_offset": row[3],
+        "row_count": row[4],
+        "columns": row[5].split(","),
+    }
+
+
+def _save_checkpoint(conn, table_name, csv_path, stat, digest, offset, rows, columns):
+    conn.execute("""
+        INSERT OR REPLACE INTO csv_sync_state
+        (table_name, file_path, file_size, mtime_ns, content_sha256,
+         byte_offset, row_count, columns)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (table_name, str(csv_path), stat.st_size, stat.st_mtime_ns,
+          digest.hexdigest(), offset, rows, ",".join(columns)))
+
+
+def _coerce(value):
+    """Convert a CSV string the way pandas.read_csv would for simple data."""
+    if value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _hash_prefix(f, length):
+    """SHA-256 of the first `length` bytes; the hasher can keep consuming."""
+    digest = hashlib.sha256()
+    f.seek(0)
+    remaining = length
+    while remaining > 0:
+        block = f.read(min(READ_BLOCK, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return digest
+
+
+def _read_complete_lines(f):
+    """Read from the current position up to the last newline, so a row
+    that is still being written is left for the next sync."""
+    data = f.read()
+    end = data.rfind(b"\n") + 1
+    return data[:end]
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _parse_rows(text):
+    return [
+        tuple(_coerce(value) for value in row)
+        for row in csv.reader(io.StringIO(text))
+        if row
+    ]
+
+
+def _insert_rows(conn, table_name, columns, text):
+    """Insert the CSV rows in text and record their rowids as CSV rows."""
+    rows = _parse_rows(text)
+    if rows:
+        column_list = ", ".join(_quote(c) for c in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})"
+        row_ids = [(table_name, conn.execute(sql, row).lastrowid) for row in rows]
+        conn.executemany(
+            "INSERT OR REPLACE INTO csv_sync_rows (table_name, row_id) VALUES (?, ?)",
+            row_ids
+        )
+    return len(rows)
+
+
+def _table_columns(conn, table_name):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
+
+
+def _has_app_rows(conn, table_name):
+    """Whether the table holds any row that didn't come from its CSV."""
+    return conn.execute(f"""
+        SELECT 1 FROM {table_name}
+        WHERE rowid NOT IN (
+            SELECT row_id FROM csv_sync_rows WHERE table_name = ?
+        )
+        LIMIT 1
+    """, (table_name,)).fetchone() is not None
+
+
+def _split_header(data):
+    header_end = data.find(b"\n") + 1
+    columns = next(csv.reader([data[:header_end].decode("utf-8-sig")]))
+    return columns, data[header_end:].decode("utf-8")
+
+
+def _adopt(conn, table_name, csv_path, stat):
+    """
+    First sync of a table loaded before checkpoints existed: record the
+    rows identical to a CSV row as CSV rows and save a checkpoint over the
+    file. Nothing is deleted or inserted.
+    """
+    with open(csv_path, "rb") as f:
+        data = _read_complete_lines(f)
+    if not data:
+        return 0
+    columns, body = _split_header(data)
+    csv_rows = _parse_rows(body)
+
+    if _table_columns(conn, table_name) == columns:
+        unclaimed = Counter(csv_rows)
+        column_list = ", ".join(_quote(c) for c in columns)
+        row_ids = []
+        for row in conn.execute(f"SELECT rowid, {column_list} FROM {table_name} ORDER BY rowid"):
+            values = tuple(row[1:])
+            if unclaimed[values] > 0:
+                unclaimed[values] -= 1
+                row_ids.append((table_name, row[0]))
+        conn.executemany(
+            "INSERT OR REPLACE INTO csv_sync_rows (table_name, row_id) VALUES (?, ?)",
+            row_ids
+        )
+    _save_checkpoint(conn, table_name, csv_path, stat, hashlib.sha256(data),
+                     len(data), len(csv_rows), columns)
+    return 0
+
+
+def _reload(conn, table_name, csv_path, stat):
+    """
+    Replace the table's CSV rows with the whole file, keeping every row
+    the app wrote. Returns None (and changes nothing) when the header no
+    longer matches a table that holds app rows.
+    """
+    with open(csv_path, "rb") as f:
+        data = _read_complete_lines(f)
+    if not data:
+        return 0
+    digest = hashlib.sha256(data)
+    columns, body = _split_header(data)
+
+    existing = _table_columns(conn, table_name)
+    if existing == columns:
+        conn.execute(f"""
+            DELETE FROM {table_name} WHERE rowid IN (
+                SELECT row_id FROM csv_sync_rows WHERE table_name = ?
+            )
+        """, (table_name,))
+        recreated = False
+    elif existing and _has_app_rows(conn, table_name):
+        return None
+    else:
+        conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+        column_list = ", ".join(_quote(c) for c in columns)
+        conn.execute(f"CREATE TABLE {table_name} ({column_list})")
+        recreated = True
+    conn.execute("DELETE FROM csv_sync_rows WHERE table_name = ?", (table_name,))
+
+    rows = _insert_rows(conn, table_name, columns, body)
+    _save_checkpoint(conn, table_name, csv_path, stat, digest, len(data), rows, columns)
+    if recreated:
+        # DROP TABLE took the dashboard indexes and triggers with it
+        add_normalized_columns(conn, [table_name])
+        create_indexes(conn)
+        ensure_version_tracking(conn, [table_name])
+        ensure_row_tracking(conn, table_name)
+        bump_version(conn, table_name)
+    return rows
+
+
+def _append(conn, table_name, csv_path, stat, checkpoint):
+    """
+    Append rows added after the checkpoint offset. Returns None when the
+    already-loaded part of the file changed and a reload is needed.
+    """
+    offset = checkpoint["byte_offset"]
+    if stat.st_size < offset:
+        return None
+
+    with open(csv_path, "rb") as f:
+        digest = _hash_prefix(f, offset)
+        if digest.hexdigest() != checkpoint["content_sha256"]:
+            return None
+        new_data = _read_complete_lines(f)
+    digest.update(new_data)
+
+    columns = checkpoint["columns"]
+    rows = _insert_rows(conn, table_name, columns, new_data.decode("utf-8"))
+    _save_checkpoint(conn, table_name, csv_path, stat, digest,
+                     offset + len(new_data), checkpoint["row_count"] + rows, columns)
+    return rows
+
+
+def sync_csv(conn, table_name, csv_path):
+    """
+    Bring table_name up to date with csv_path. Returns the number of rows
+    written (0 when nothing changed or the table was only adopted).
+    """
+    csv_path = Path(csv_path)
+    stat = os.stat(csv_path)
+
+    create_checkpoint_table(conn)
+    checkpoint = get_checkpoint(conn, table_name)
+    table_exists = bool(_table_columns(conn, table_name))
+
+    if (checkpoint and table_exists
+            and checkpoint["file_size"] == stat.st_size
+            and checkpoint["mtime_ns"] == stat.st_mtime_ns):
+        return 0
+
+    try:
+        rows = None
+        if table_exists:
+            ensure_row_tracking(conn, table_name)
+            if checkpoint is None:
+                rows = _adopt(conn, table_name, csv_path, stat)
+            else:
+                rows = _append(conn, table_name, csv_path, stat, checkpoint)
+        if rows is None:
+            rows = _reload(conn, table_name, csv_path, stat)
+        if rows is None:
+            print(f"  {table_name}: {csv_path.name} has new columns and the table "
+                  f"holds rows written by the app; not reloaded")
+            rows = 0
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return rows
+
+
+def sync_csv_tables(tables=None, data_dir=DATA_DIR):
+    """
+    Sync every table from its CSV in data_dir. Files that haven't changed
+    since this process last synced them cost one stat() and no connection.
+    Returns {table name: rows written} for the tables that were touched.
+    """
+    written = {}
+    conn = None
+    try:
+        for table_name, csv_file in (tables or CSV_TABLES).items():
+            csv_path = Path(data_dir) / csv_file
+            try:
+                stat = os.stat(csv_path)
+            except FileNotFoundError:
+                continue
+
+            if _last_seen.get(table_name) == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            if conn is None:
+                conn = connect_database()
+            written[table_name] = sync_csv(conn, table_name, csv_path)
+            _last_seen[table_name] = (stat.st_size, stat.st_mtime_ns)
+    finally:
+        if conn is not None:
+            conn.close()
+    return written
@@ -1,5 +1,7 @@
 import pandas as pd
 from app.data.db import connect_database
+from app.data.normalize import normalize_label
+from app.data.pagination import keyset_page_query
 
 
 def insert_incident(date, incident_type, severity, status, description, reported_by=None):
@@ -9,7 +11,8 @@ def insert_incident(date, incident_type, severity, status, description, reported
         INSERT INTO cyber_incidents
         (date, incident_type, severity, status, description, reported_by)
         VALUES (?, ?, ?, ?, ?, ?)
-    """, (date, incident_type, severity, status, description, reported_by))
+    """, (date, incident_type, normalize_label(severity), normalize_label(status),
+          description, reported_by))
     conn.commit()
     incident_id = cursor.lastrowid
     conn.close()
@@ -26,12 +29,21 @@ def get_all_incidents():
     return df
 
 
+def get_incidents_page(after_id=None, page_size=50):
+    """Return up to page_size incidents with id < after_id, newest first."""
+    sql, params = keyset_page_query("cyber_incidents", after_id, page_size)
+    conn = connect_database()
+    df = pd.read_sql_query(sql, conn, params=params)
+    conn.close()
+    return df
+
+
 def update_incident_status(incident_id, new_status):
     conn = connect_database()
     cursor = conn.cursor()
     cursor.execute(
         "UPDATE cyber_incidents SET status = ? WHERE id = ?",
-        (new_status, incident_id)
+        (normalize_label(new_status), incident_id)
     )
     conn.commit()
     conn.close()
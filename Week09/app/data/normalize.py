@@ -0,0 +1,123 @@
+"""
+Write-time normalization of the label columns.
+
+The same label arrives as 'High' and 'high', or 'In Progress', 'in_progress'
+and 'in-progress', depending on where the row came from. Each label column
+gets a VIRTUAL generated '<column>_norm' column holding the canonical form
+(lower case, words joined by '-') plus an index on it, so breakdowns and
+filters are indexed lookups instead of LOWER() over every row. Writes made
+through the app are normalized before they reach the database as well.
+
+Labels already stored are left as they are; the '_norm' columns cover them.
+Rewriting them in canonical form is a separate, explicit cleanup:
+
+    python -m app.data.normalize
+"""
+
+from app.data.db import connect_database
+
+# table -> label columns that get a '<column>_norm' column
+NORMALIZED_COLUMNS = {
+    "cyber_incidents": ("severity", "status"),
+    "it_tickets": ("status", "priority"),
+}
+
+_migrated = False
+
+
+def norm_column(column):
+    return f"{column}_norm"
+
+
+def normalize_label(value):
+    """Canonical form of a label; must match normalized_sql()."""
+    if value is None:
+        return None
+    return str(value).strip(" ").replace(" ", "-").replace("_", "-").lower()
+
+
+def normalized_sql(expression):
+    """SQL expression giving the canonical form of expression."""
+    return f"LOWER(REPLACE(REPLACE(TRIM({expression}), ' ', '-'), '_', '-'))"
+
+
+def _all_columns(conn, table):
+    # table_xinfo also lists generated columns, which table_info hides
+    return {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+
+
+def add_normalized_columns(conn, tables=None):
+    """
+    Add the generated '<column>_norm' columns and their indexes to existing
+    tables (idempotent, no commit). Returns the number of columns added.
+    """
+    added = 0
+    for table in tables or NORMALIZED_COLUMNS:
+        columns = _all_columns(conn, table)
+        for column in NORMALIZED_COLUMNS.get(table, ()):
+            if column not in columns:
+                continue
+            norm = norm_column(column)
+            if norm not in columns:
+                conn.execute(f"""
+                    ALTER TABLE {table} ADD COLUMN {norm} TEXT
+                    GENERATED ALWAYS AS ({normalized_sql(column)}) VIRTUAL
+                """)
+                added += 1
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_{norm} ON {table} ({norm})"
+            )
+    return added
+
+
+def normalize_existing(conn, tables=None):
+    """
+    One-off cleanup: rewrite stored labels that aren't in canonical form
+    yet (no commit). The original spelling is lost, so this only runs when
+    asked for, never as part of the migration. Returns the number of rows
+    changed.
+    """
+    changed = 0
+    for table in tables or NORMALIZED_COLUMNS:
+        columns = _all_columns(conn, table)
+        for column in NORMALIZED_COLUMNS.get(table, ()):
+            if column not in columns:
+                continue
+            cursor = conn.execute(f"""
+                UPDATE {table} SET {column} = {normalized_sql(column)}
+                WHERE {column} IS NOT {normalized_sql(column)}
+            """)
+            changed += cursor.rowcount
+    return changed
+
+
+def migrate_normalized_columns(conn):
+    """Add the normalized columns and indexes; stored labels are not changed."""
+    added = add_normalized_columns(conn)
+    if added:
+        print(f" Normalized label columns ({added} added)")
+    conn.commit()
+
+
+def ensure_normalized_columns():
+    """Run the migration once per process on databases created before it."""
+    global _migrated
+    if _migrated:
+        return
+    conn = connect_database()
+    try:
+        migrate_normalized_columns(conn)
+    finally:
+        conn.close()
+    _migrated = True
+
+
+if __name__ == "__main__":
+    conn = connect_database()
+    try:
+        migrate_normalized_columns(conn)
+        changed = normalize_existing(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    print(f" Rewrote {changed} stored labels in canonical form")
@@ -0,0 +1,96 @@
+"""
+SQL-side aggregates for the dashboard metrics and charts.
+
+Each helper is a single GROUP BY (or aggregate) query, so the amount of data
+brought into pandas grows with the number of groups rather than the number
+of rows. Label columns with a '<column>_norm' column (normalize.py) are
+grouped on it through its index; other columns are lower-cased in SQL
+because the data mixes 'High' and 'high'. Columns a table doesn't have
+(CSV-imported vs declared layout) give an empty result instead of an error.
+"""
+
+import pandas as pd
+
+from app.data.db import connect_database
+from app.data.normalize import ensure_normalized_columns, norm_column
+
+
+def read_sql(sql):
+    conn = connect_database()
+    try:
+        return pd.read_sql_query(sql, conn)
+    finally:
+        conn.close()
+
+
+def table_columns(table):
+    ensure_normalized_columns()
+    conn = connect_database()
+    try:
+        # table_xinfo so the generated '<column>_norm' columns are included
+        return {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+    finally:
+        conn.close()
+
+
+def count_by(table, column):
+    """Rows per normalized value of column, largest group first."""
+    columns = table_columns(table)
+    if column not in columns:
+        return pd.DataFrame({column: pd.Series(dtype=str), "count": pd.Series(dtype=int)})
+    value = norm_column(column) if norm_column(column) in columns else f"LOWER({column})"
+    return read_sql(f"""
+        SELECT {value} AS {column}, COUNT(*) AS count
+        FROM {table}
+        GROUP BY {value}
+        ORDER BY count DESC
+    """)
+
+
+def as_counts(frame):
+    """Turn a count_by frame into a Series shaped like value_counts()."""
+    column = frame.columns[0]
+    return frame.set_index(column)["count"]
+
+
+def severity_breakdown():
+    return count_by("cyber_incidents", "severity")
+
+
+def status_breakdown(table="cyber_incidents"):
+    return count_by(table, "status")
+
+
+def incident_type_breakdown():
+    return count_by("cyber_incidents", "incident_type")
+
+
+def priority_breakdown():
+    return count_by("it_tickets", "priority")
+
+
+def category_breakdown():
+    return count_by("datasets_metadata", "category")
+
+
+def source_breakdown():
+    return count_by("datasets_metadata", "source")
+
+
+def format_breakdown():
+    return count_by("datasets_metadata", "format")
+
+
+def dataset_totals():
+    """
+    One-row summary of datasets_metadata: total, distinct categories,
+    sources and owners, and the summed size (in the units of the size column).
+    """
+    columns = table_columns("datasets_metadata")
+    parts = ["COUNT(*) AS total"]
+    for name, column in [("categories", "category"), ("sources", "source"), ("owners", "owner")]:
+        parts.append(f"COUNT(DISTINCT LOWER({column})) AS {name}" if column in columns
+                     else f"0 AS {name}")
+    parts.append("COALESCE(SUM(size), 0) AS total_size" if "size" in columns else "0 AS total_size")
+    row = read_sql(f"SELECT {', '.join(parts)} FROM datasets_metadata").iloc[0]
+    return {key: int(value) for key, value in row.items()}
@@ -2,6 +2,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from app.data.db import connect_database
+from app.data.stats import (
+    as_counts, severity_breakdown, status_breakdown, priority_breakdown,
+    category_breakdown, format_breakdown, dataset_totals
+)
 
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
 
@@ -52,20 +56,20 @@ if "Cybersecurity" in dashboard_type:
         else:
             col1, col2, col3, col4 = st.columns(4)
             
+            severity_counts = as_counts(severity_breakdown())
+            status_counts = as_counts(status_breakdown())
+            
             with col1:
-                st.metric("Total Incidents", len(incidents_df))
+                st.metric("Total Incidents", int(severity_counts.sum()))
             
             with col2:
-                critical = len(incidents_df[incidents_df['severity'].str.lower() == 'critical'])
-                st.metric("Critical", critical)
+                st.metric("Critical", int(severity_counts.get('critical', 0)))
             
             with col3:
-                high = len(incidents_df[incidents_df['severity'].str.lower() == 'high'])
-                st.metric("High", high)
+                st.metric("High", int(severity_counts.get('high', 0)))
             
             with col4:
-                resolved = len(incidents_df[incidents_df['status'].str.lower() == 'resolved'])
-                st.metric("Resolved", resolved)
+                st.metric("Resolved", int(status_counts.get('resolved', 0)))
             
             st.divider()
             
@@ -73,7 +77,6 @@ if "Cybersecurity" in dashboard_type:
             
             with col1:
                 st.subheader("Incidents by Severity")
-                severity_counts = incidents_df['severity'].value_counts()
                 
                 if chart_type == "Bar":
                     fig = px.bar(
@@ -106,7 +109,6 @@ if "Cybersecurity" in dashboard_type:
             
             with col2:
                 st.subheader("Incidents by Status")
-                status_counts = incidents_df['status'].value_counts()
                 fig = px.pie(
                     values=status_counts.values,
                     names=status_counts.index,
@@ -147,20 +149,19 @@ elif "IT Operations" in dashboard_type:
         else:
             col1, col2, col3, col4 = st.columns(4)
             
+            status_counts = as_counts(status_breakdown("it_tickets"))
+            
             with col1:
-                st.metric("Total Tickets", len(tickets_df))
+                st.metric("Total Tickets", int(status_counts.sum()))
             
             with col2:
-                open_tickets = len(tickets_df[tickets_df['status'].str.lower() == 'open'])
-                st.metric("Open", open_tickets)
+                st.metric("Open", int(status_counts.get('open', 0)))
             
             with col3:
-                in_progress = len(tickets_df[tickets_df['status'].str.lower() == 'in progress'])
-                st.metric("In Progress", in_progress)
+                st.metric("In Progress", int(status_counts.get('in-progress', 0)))
             
             with col4:
-                closed = len(tickets_df[tickets_df['status'].str.lower() == 'closed'])
-                st.metric("Closed", closed)
+                st.metric("Closed", int(status_counts.get('closed', 0)))
             
             st.divider()
             
@@ -168,7 +169,6 @@ elif "IT Operations" in dashboard_type:
             
             with col1:
                 st.subheader("Tickets by Status")
-                status_counts = tickets_df['status'].value_counts()
                 
                 if chart_type == "Bar":
                     fig = px.bar(
@@ -178,7 +178,7 @@ elif "IT Operations" in dashboard_type:
                         color=status_counts.index,
                         color_discrete_map={
                             'open': 'red',
-                            'in progress': 'orange',
+                            'in-progress': 'orange',
                             'closed': 'green'
                         }
                     )
@@ -200,7 +200,7 @@ elif "IT Operations" in dashboard_type:
             
             with col2:
                 st.subheader("Tickets by Priority")
-                priority_counts = tickets_df['priority'].value_counts()
+                priority_counts = as_counts(priority_breakdown())
                 fig = px.pie(
                     values=priority_counts.values,
                     names=priority_counts.index,
@@ -241,19 +241,19 @@ elif "Data Analysis" in dashboard_type:
         else:
             col1, col2, col3, col4 = st.columns(4)
             
+            totals = dataset_totals()
+            
             with col1:
-                st.metric("Total Datasets", len(datasets_df))
+                st.metric("Total Datasets", totals['total'])
             
             with col2:
-                unique_categories = datasets_df['category'].nunique()
-                st.metric("Categories", unique_categories)
+                st.metric("Categories", totals['categories'])
             
             with col3:
-                unique_owners = datasets_df['owner'].nunique() if 'owner' in datasets_df.columns else 0
-                st.metric("Owners", unique_owners)
+                st.metric("Owners", totals['owners'])
             
             with col4:
-                st.metric("Records", len(datasets_df))
+                st.metric("Records", totals['total'])
             
             st.divider()
             
@@ -261,7 +261,7 @@ elif "Data Analysis" in dashboard_type:
             
             with col1:
                 st.subheader("Datasets by Category")
-                category_counts = datasets_df['category'].value_counts()
+                category_counts = as_counts(category_breakdown())
                 
                 if chart_type == "Bar":
                     fig = px.bar(
@@ -295,8 +295,8 @@ elif "Data Analysis" in dashboard_type:
             
             with col2:
                 st.subheader("Data Distribution")
-                if 'format' in datasets_df.columns:
-                    format_counts = datasets_df['format'].value_counts()
+                format_counts = as_counts(format_breakdown())
+                if not format_counts.empty:
                     fig = px.pie(
                         values=format_counts.values,
                         names=format_counts.index,
@@ -2,7 +2,9 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from pathlib import Path
-from app.data.db import connect_database
+from app.data.csv_sync import CSV_TABLES, sync_csv_tables
+from app.data.normalize import norm_column
+from app.data.snapshots import load_table
 
 st.set_page_config(page_title="Analytics & Reporting", page_icon="📊", layout="wide")
 
@@ -19,38 +21,25 @@ with st.sidebar:
 
 st.title("Analytics & Reporting")
 
-# Load CSV data into database
+# Sync CSV data into the database; unchanged files cost one stat() per rerun
 def load_csv_data():
-    conn = connect_database()
-    tables = {
-        'users_data': 'users.csv',
-        'cyber_incidents': 'cyber_incidents.csv',
-        'it_tickets': 'it_tickets.csv',
-        'datasets_metadata': 'datasets_metadata.csv'
-    }
-    
-    for table_name, csv_file in tables.items():
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}'")
-        if not cursor.fetchone():
-            csv_path = Path("DATA") / csv_file
-            if csv_path.exists():
-                df = pd.read_csv(csv_path)
-                df.to_sql(table_name, conn, if_exists='replace', index=False)
-    
-    conn.commit()
-    conn.close()
+    sync_csv_tables(CSV_TABLES, data_dir=Path("DATA"))
 
 load_csv_data()
 
+# Count labels by their normalized '<column>_norm' form, so 'High' and 'high' are one bar
+def label_counts(df, column):
+    labels = df[norm_column(column)] if norm_column(column) in df else df[column]
+    counts = labels.value_counts().reset_index()
+    counts.columns = [column, 'count']
+    return counts
+
 # Get data
 try:
-    conn = connect_database()
-    users_df = pd.read_sql_query("SELECT * FROM users_data", conn)
-    incidents_df = pd.read_sql_query("SELECT * FROM cyber_incidents", conn)
-    tickets_df = pd.read_sql_query("SELECT * FROM it_tickets", conn)
-    datasets_df = pd.read_sql_query("SELECT * FROM datasets_metadata", conn)
-    conn.close()
+    users_df = load_table("users_data")
+    incidents_df = load_table("cyber_incidents")
+    tickets_df = load_table("it_tickets")
+    datasets_df = load_table("datasets_metadata")
     
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -169,8 +158,7 @@ try:
                 if st.button("Pie Chart", key="incident_pie", use_container_width=True):
                     st.session_state.incident_graph2 = 'pie'
             
-            severity_counts = incidents_df['severity'].value_counts().reset_index()
-            severity_counts.columns = ['severity', 'count']
+            severity_counts = label_counts(incidents_df, 'severity')
             
             if st.session_state.incident_graph2 == 'bar':
                 fig4 = px.bar(severity_counts, x='severity', y='count', color='severity')
@@ -203,8 +191,7 @@ try:
                     st.session_state.ticket_graph1 = 'pie'
             
            
-            priority_counts = tickets_df['priority'].value_counts().reset_index()
-            priority_counts.columns = ['priority', 'count']
+            priority_counts = label_counts(tickets_df, 'priority')
             
             if st.session_state.ticket_graph1 == 'bar':
                 fig5 = px.bar(priority_counts, x='priority', y='count', color='priority')
@@ -229,8 +216,7 @@ try:
                 if st.button("Donut Chart", key="ticket_donut", use_container_width=True):
                     st.session_state.ticket_graph2 = 'donut'
                     
-            ticket_status_counts = tickets_df['status'].value_counts().reset_index()
-            ticket_status_counts.columns = ['status', 'count']
+            ticket_status_counts = label_counts(tickets_df, 'status')
             
             if st.session_state.ticket_graph2 == 'bar':
                 fig6 = px.bar(ticket_status_counts, x='status', y='count', color='status')
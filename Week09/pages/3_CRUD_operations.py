@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 import sqlite3
 from datetime import datetime
+from app.data.incidents import get_incidents_page
+from app.data.normalize import normalize_label
+from app.data.pagination import PageCursor
 
 st.set_page_config(page_title="CRUD Operations", page_icon="⚙️", layout="wide")
 
@@ -33,7 +36,8 @@ def create_incident(title, description, severity, status, source_ip, target_ip):
         cursor.execute("""
             INSERT INTO cyber_incidents (title, description, severity, status, source_ip, target_ip, created_date)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (title, description, severity, status, source_ip, target_ip, datetime.now()))
+        """, (title, description, normalize_label(severity), normalize_label(status),
+              source_ip, target_ip, datetime.now()))
         conn.commit()
         return True, "Incident created successfully"
     except Exception as e:
@@ -41,17 +45,6 @@ def create_incident(title, description, severity, status, source_ip, target_ip):
     finally:
         conn.close()
 
-def read_incidents(limit=100):
-    conn = connect_db()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT * FROM cyber_incidents LIMIT ?", (limit,))
-        return cursor.fetchall()
-    except Exception as e:
-        return []
-    finally:
-        conn.close()
-
 def update_incident(incident_id, title=None, description=None, severity=None, status=None, source_ip=None, target_ip=None):
     conn = connect_db()
     cursor = conn.cursor()
@@ -61,8 +54,8 @@ def update_incident(incident_id, title=None, description=None, severity=None, st
         
         if title: updates.append("title = ?"); params.append(title)
         if description: updates.append("description = ?"); params.append(description)
-        if severity: updates.append("severity = ?"); params.append(severity)
-        if status: updates.append("status = ?"); params.append(status)
+        if severity: updates.append("severity = ?"); params.append(normalize_label(severity))
+        if status: updates.append("status = ?"); params.append(normalize_label(status))
         if source_ip: updates.append("source_ip = ?"); params.append(source_ip)
         if target_ip: updates.append("target_ip = ?"); params.append(target_ip)
         
@@ -100,7 +93,8 @@ def create_ticket(title, description, status, priority, assigned_to, category):
         cursor.execute("""
             INSERT INTO it_tickets (title, description, status, priority, assigned_to, category, created_date)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (title, description, status, priority, assigned_to, category, datetime.now()))
+        """, (title, description, normalize_label(status), normalize_label(priority),
+              assigned_to, category, datetime.now()))
         conn.commit()
         return True, "Ticket created successfully"
     except Exception as e:
@@ -128,8 +122,8 @@ def update_ticket(ticket_id, title=None, description=None, status=None, priority
         
         if title: updates.append("title = ?"); params.append(title)
         if description: updates.append("description = ?"); params.append(description)
-        if status: updates.append("status = ?"); params.append(status)
-        if priority: updates.append("priority = ?"); params.append(priority)
+        if status: updates.append("status = ?"); params.append(normalize_label(status))
+        if priority: updates.append("priority = ?"); params.append(normalize_label(priority))
         if assigned_to: updates.append("assigned_to = ?"); params.append(assigned_to)
         if category: updates.append("category = ?"); params.append(category)
         
@@ -265,10 +259,24 @@ if crud_type == "Cyber Incidents":
     
     elif operation == "Read":
         st.write("### View All Incidents")
-        incidents = read_incidents(limit=100)
-        if incidents:
-            df = pd.DataFrame([dict(row) for row in incidents])
+        # Keyset-paginated: each page seeks on the primary key
+        if "incident_pages" not in st.session_state:
+            st.session_state.incident_pages = PageCursor(get_incidents_page, page_size=100)
+        pages = st.session_state.incident_pages
+        df = pages.current()
+        if not df.empty:
             st.dataframe(df, use_container_width=True)
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if st.button("Previous", use_container_width=True, disabled=not pages.has_previous):
+                    pages.previous()
+                    st.rerun()
+            with col2:
+                st.caption(f"Page {pages.page_number}")
+            with col3:
+                if st.button("Next", use_container_width=True, disabled=not pages.has_next):
+                    pages.next()
+                    st.rerun()
         else:
             st.info("No incidents found")
     
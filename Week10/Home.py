@@ -1,7 +1,7 @@
 import streamlit as st
-import sqlite3
 from datetime import datetime
 from app.services.user_service import login_user, register_user
+from app.data.platform_stats import get_platform_stats
 
 
 # PAGE CONFIGURATION
@@ -173,27 +173,19 @@ def dashboard_page():
     st.markdown("### 📊 Platform Statistics")
     
     try:
-        conn = sqlite3.connect('intelligence_platform.db')
-        cursor = conn.cursor()
+        # One row of trigger-maintained counters instead of three COUNT(*) scans
+        stats = get_platform_stats()
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            cursor.execute("SELECT COUNT(*) FROM cyber_incidents")
-            incidents = cursor.fetchone()[0]
-            st.metric("🔐 Incidents", incidents)
+            st.metric("🔐 Incidents", stats["incidents"])
         
         with col2:
-            cursor.execute("SELECT COUNT(*) FROM it_tickets")
-            tickets = cursor.fetchone()[0]
-            st.metric("🎫 Tickets", tickets)
+            st.metric("🎫 Tickets", stats["tickets"])
         
         with col3:
-            cursor.execute("SELECT COUNT(*) FROM datasets_metadata")
-            datasets = cursor.fetchone()[0]
-            st.metric("📊 Datasets", datasets)
-        
-        conn.close()
+            st.metric("📊 Datasets", stats["datasets"])
     except Exception as e:
         st.warning("⚠️ Could not load statistics")
 
@@ -0,0 +1,31 @@
+"""Per-run data context shared by the tabs of a domain page."""
+
+from app.data.query_cache import read_sql
+
+
+class DataContext:
+    """
+    Loads each table at most once per script run. Streamlit executes every
+    tab body on each rerun, so a page creates one context at the top and all
+    tabs read through it instead of querying the same table again.
+    """
+
+    def __init__(self):
+        self._tables = {}
+        self.query_count = 0
+
+    def table(self, name):
+        """Return the whole table as a DataFrame (loaded on first use this run)."""
+        df = self._tables.get(name)
+        if df is None:
+            df = read_sql(f"SELECT * FROM {name}")
+            self._tables[name] = df
+            self.query_count += 1
+        return df
+
+    def invalidate(self, name=None):
+        """Forget a table (or all of them) after writing to it in this run."""
+        if name is None:
+            self._tables.clear()
+        else:
+            self._tables.pop(name, None)
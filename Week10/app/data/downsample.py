@@ -0,0 +1,244 @@
+"""
+Server-side downsampling for Plotly figures.
+
+Pages pass every figure through bound_figure() before st.plotly_chart, so
+the chart JSON sent to the browser stays within a fixed point budget
+however many rows are behind it:
+- line traces keep the points chosen by Largest-Triangle-Three-Buckets
+  (LTTB), which preserves peaks and dips that plain striding would drop;
+- marker-only scatter traces keep one point per occupied cell of a grid,
+  so the shape and outliers of the cloud survive;
+- histograms are binned here and sent as bar charts of the counts;
+- scatter traces still above WEBGL_THRESHOLD points render with WebGL.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Points sent to the browser per figure, split evenly between its traces
+POINT_BUDGET = 4000
+
+# Scatter traces with more points than this are drawn with scattergl
+WEBGL_THRESHOLD = 1000
+
+HISTOGRAM_BINS = 100
+
+# Trace properties holding one value per point
+_POINT_ARRAYS = ("x", "y", "text", "hovertext", "customdata", "ids")
+_MARKER_ARRAYS = ("color", "size", "symbol", "opacity")
+
+# Properties carried over when a histogram becomes a bar chart
+_HISTOGRAM_KEEP = (
+    "name", "legendgroup", "showlegend", "marker", "opacity", "hovertemplate",
+    "offsetgroup", "alignmentgroup", "xaxis", "yaxis",
+)
+
+
+def _positions(values):
+    """Values as floats (datetimes as timestamps, text by position); NaN if missing."""
+    series = pd.Series(np.asarray(values))
+    if series.dtype == object:
+        parsed = pd.to_numeric(series, errors="coerce")
+        if parsed.notna().sum() < series.notna().sum():
+            parsed = pd.to_datetime(series, errors="coerce")
+        if parsed.notna().sum() < series.notna().sum():
+            return np.arange(len(series), dtype=float)
+        series = parsed
+    if pd.api.types.is_datetime64_any_dtype(series):
+        missing = series.isna().to_numpy()
+        numbers = series.to_numpy(dtype="datetime64[ns]").astype("int64").astype(float)
+        numbers[missing] = np.nan
+        return numbers
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return np.arange(len(series), dtype=float)
+    return series.to_numpy(dtype=float, na_value=np.nan)
+
+
+def lttb(x, y, threshold):
+    """
+    Indices of the threshold points of a line chosen by Largest-Triangle-
+    Three-Buckets. The first and last points are always kept; each bucket
+    in between keeps the point forming the largest triangle with the point
+    kept before it and the average of the next bucket. x must be sorted.
+    """
+    x = _positions(x)
+    y = _positions(y)
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    n = len(valid)
+    if threshold >= n or threshold < 3:
+        return valid
+    x = x[valid]
+    y = y[valid]
+
+    # bucket i spans [starts[i], starts[i + 1]) of the points between the ends
+    starts = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(int) + 1
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = starts[i], starts[i + 1]
+        if i + 2 < threshold - 1:
+            next_lo, next_hi = starts[i + 1], starts[i + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return valid[selected]
+
+
+def bin_points(x, y, threshold):
+    """
+    Indices of at most threshold points of a scatter: the plot area is cut
+    into a grid of about threshold cells and the first point of each
+    occupied cell is kept.
+    """
+    x = _positions(x)
+    y = _positions(y)
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    if len(valid) <= threshold:
+        return valid
+    side = max(int(np.sqrt(threshold)), 1)
+
+    def cells(values):
+        lo, hi = values.min(), values.max()
+        scaled = (values - lo) / ((hi - lo) or 1) * side
+        return np.clip(scaled.astype(np.int64), 0, side - 1)
+
+    keys = cells(x[valid]) * side + cells(y[valid])
+    _, first = np.unique(keys, return_index=True)
+    return np.sort(valid[first])
+
+
+def _point_count(trace):
+    for key in ("x", "y"):
+        values = trace.get(key)
+        if values is not None and not isinstance(values, str):
+            return len(values)
+    return 0
+
+
+def _take(trace, keep, n):
+    """Copy of a trace dict with its per-point arrays reduced to keep."""
+    def subset(values):
+        if values is None or isinstance(values, (str, dict)) or np.ndim(values) == 0:
+            return values
+        if len(values) != n:
+            return values
+        return np.asarray(values)[keep]
+
+    trace = dict(trace)
+    for key in _POINT_ARRAYS:
+        if key in trace:
+            trace[key] = subset(trace[key])
+    if isinstance(trace.get("marker"), dict):
+        marker = dict(trace["marker"])
+        for key in _MARKER_ARRAYS:
+            if key in marker:
+                marker[key] = subset(marker[key])
+        trace["marker"] = marker
+    return trace
+
+
+def _bound_scatter(trace, budget):
+    n = _point_count(trace)
+    if n <= budget and (trace["type"] == "scattergl" or n <= WEBGL_THRESHOLD):
+        return trace
+    trace = dict(trace)
+    if n > budget and trace.get("x") is not None and trace.get("y") is not None:
+        mode = trace.get("mode") or "lines"
+        if "lines" in mode:
+            keep = lttb(trace["x"], trace["y"], budget)
+        else:
+            keep = bin_points(trace["x"], trace["y"], budget)
+        trace = _take(trace, keep, n)
+        n = len(keep)
+    if trace["type"] == "scatter" and n > WEBGL_THRESHOLD:
+        trace["type"] = "scattergl"
+    return trace
+
+
+def _histogram_values(trace):
+    """(values, horizontal) for a plain count histogram, else None."""
+    if trace.get("histfunc") not in (None, "count"):
+        return None
+    x, y = trace.get("x"), trace.get("y")
+    if x is not None and y is None:
+        return x, False
+    if y is not None and x is None:
+        return y, True
+    return None
+
+
+def _histogram_edges(traces, budget):
+    """Bin edges shared by the numeric histograms of a figure, or None."""
+    low, high, bins = np.inf, -np.inf, HISTOGRAM_BINS
+    for trace in traces:
+        found = _histogram_values(trace)
+        if found is None:
+            continue
+        values = pd.to_numeric(pd.Series(np.asarray(found[0])), errors="coerce").dropna()
+        if values.empty:
+            continue
+        low, high = min(low, values.min()), max(high, values.max())
+        bins = trace.get("nbinsx" if not found[1] else "nbinsy") or bins
+    if low > high:
+        return None
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, min(bins, budget) + 1)
+
+
+def _bound_histogram(trace, edges):
+    values, horizontal = _histogram_values(trace)
+    values = pd.Series(np.asarray(values)).dropna()
+    numbers = pd.to_numeric(values, errors="coerce")
+    if edges is not None and numbers.notna().all():
+        counts, _ = np.histogram(numbers, bins=edges)
+        positions = (edges[:-1] + edges[1:]) / 2
+        bar = {"width": np.diff(edges)}
+    else:
+        counts = values.value_counts(sort=False)
+        positions, counts = counts.index.to_numpy(), counts.to_numpy()
+        bar = {}
+    bar.update({key: trace[key] for key in _HISTOGRAM_KEEP if key in trace})
+    bar["type"] = "bar"
+    if horizontal:
+        bar.update(x=counts, y=positions, orientation="h")
+    else:
+        bar.update(x=positions, y=counts, orientation="v")
+    return bar
+
+
+def bound_figure(fig, budget=POINT_BUDGET):
+    """
+    Return fig with every scatter and histogram trace reduced so the whole
+    figure sends at most about budget points. Figures already within the
+    budget come back unchanged (apart from WebGL for big scatter traces).
+    """
+    traces = [trace.to_plotly_json() for trace in fig.data]
+    if not traces:
+        return fig
+    per_trace = max(budget // len(traces), 3)
+
+    # Histograms are rebinned together so overlaid traces share their bins
+    histograms = [t for t in traces if t["type"] == "histogram"]
+    rebin = any(_point_count(t) > per_trace for t in histograms)
+    edges = _histogram_edges(histograms, per_trace) if rebin else None
+
+    bounded = []
+    for trace in traces:
+        if trace["type"] in ("scatter", "scattergl"):
+            trace = _bound_scatter(trace, per_trace)
+        elif trace["type"] == "histogram" and rebin and _histogram_values(trace):
+            trace = _bound_histogram(trace, edges)
+        bounded.append(trace)
+    if all(new is old for new, old in zip(bounded, traces)):
+        return fig
+    return go.Figure(data=bounded, layout=fig.layout)
@@ -0,0 +1,92 @@
+"""
+Cache of built Plotly figures for the Analysis tabs.
+
+Streamlit reruns the whole page whenever any widget changes, and building
+a px.bar/px.pie figure costs far more than drawing it. Figures are keyed by
+(table, grouping column, chart type, table version): changing an unrelated
+widget, or switching chart types back to one already seen, reuses the
+stored figure, while any write to the table moves its version on so its
+old figures are never served again.
+
+Figures are stored as Plotly JSON and handed back as plain dicts, which
+st.plotly_chart accepts directly. Entries are evicted least-recently-used
+once either the entry count or the total JSON size goes over its limit.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+from app.data.downsample import bound_figure
+from app.data.query_cache import query_cache
+
+MAX_ENTRIES = 64
+MAX_BYTES = 16 * 1024 * 1024
+
+
+class FigureCache:
+    """LRU cache of serialized figures with an entry limit and a size ceiling."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, table, column, chart_type):
+        """The stored figure dict for the table's current version, or None."""
+        key = (table, column, chart_type, query_cache.table_version(table))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(entry[0])
+
+    def put(self, table, column, chart_type, fig):
+        """
+        Downsample and store a freshly built figure; returns what to pass
+        to st.plotly_chart. Tables without a version are not cached.
+        """
+        fig = bound_figure(fig)
+        version = query_cache.table_version(table)
+        if version is None:
+            return fig
+        text = fig.to_json()
+        size = len(text)
+        if size <= self.max_bytes:
+            with self._lock:
+                # Figures of older versions of this table can't be hit again
+                for key in [k for k in self._entries if k[0] == table and k[3] != version]:
+                    self._bytes -= self._entries.pop(key)[1]
+                key = (table, column, chart_type, version)
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._bytes -= old[1]
+                self._entries[key] = (text, size)
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+        return json.loads(text)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+figure_cache = FigureCache()
@@ -1,5 +1,7 @@
-import pandas as pd
 from app.data.db import connect_database
+from app.data.normalize import normalize_label
+from app.data.pagination import keyset_page_query
+from app.data.query_cache import read_sql
 
 
 def insert_incident(date, incident_type, severity, status, description, reported_by=None):
@@ -9,7 +11,8 @@ def insert_incident(date, incident_type, severity, status, description, reported
         INSERT INTO cyber_incidents
         (date, incident_type, severity, status, description, reported_by)
         VALUES (?, ?, ?, ?, ?, ?)
-    """, (date, incident_type, severity, status, description, reported_by))
+    """, (date, incident_type, normalize_label(severity), normalize_label(status),
+          description, reported_by))
     conn.commit()
     incident_id = cursor.lastrowid
     conn.close()
@@ -17,13 +20,13 @@ def insert_incident(date, incident_type, severity, status, description, reported
 
 
 def get_all_incidents():
-    conn = connect_database()
-    df = pd.read_sql_query(
-        "SELECT * FROM cyber_incidents ORDER BY id DESC",
-        conn
-    )
-    conn.close()
-    return df
+    return read_sql("SELECT * FROM cyber_incidents ORDER BY id DESC")
+
+
+def get_incidents_page(after_id=None, page_size=50):
+    """Return up to page_size incidents with id < after_id, newest first."""
+    sql, params = keyset_page_query("cyber_incidents", after_id, page_size)
+    return read_sql(sql, params)
 
 
 def update_incident_status(incident_id, new_status):
@@ -31,7 +34,7 @@ def update_incident_status(incident_id, new_status):
     cursor = conn.cursor()
     cursor.execute(
         "UPDATE cyber_incidents SET status = ? WHERE id = ?",
-        (new_status, incident_id)
+        (normalize_label(new_status), incident_id)
     )
     conn.commit()
     conn.close()
@@ -49,12 +52,9 @@ def delete_incident(incident_id):
 
 
 def get_incidents_by_type():
-    conn = connect_database()
-    df = pd.read_sql_query("""
+    return read_sql("""
         SELECT incident_type, COUNT(*) as count
         FROM cyber_incidents
         GROUP BY incident_type
         ORDER BY count DESC
-    """, conn)
-    conn.close()
-    return df
+    """)
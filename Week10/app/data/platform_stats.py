@@ -0,0 +1,168 @@
+"""
+Trigger-maintained counters for the Home page statistics panel.
+
+platform_stats holds a single row of table totals and platform_breakdowns
+holds per-value counts (incident severity/status, ticket status/priority).
+Triggers update both inside the same transaction as the INSERT, UPDATE or
+DELETE that caused the change, so they are always consistent with the data
+and reading them costs a primary-key lookup whatever the table size.
+"""
+
+import sqlite3
+
+from app.data.db import connect_database
+from app.data.normalize import normalized_sql
+
+# table -> column in platform_stats holding its row count
+TOTAL_COLUMNS = {
+    "cyber_incidents": "incidents",
+    "it_tickets": "tickets",
+    "datasets_metadata": "datasets",
+}
+
+# table -> columns broken down by value
+BREAKDOWN_COLUMNS = {
+    "cyber_incidents": ("severity", "status"),
+    "it_tickets": ("status", "priority"),
+}
+
+
+def _value(row, column):
+    # Same canonical form as the '<column>_norm' columns, so 'High' and
+    # 'high' count together
+    return f"COALESCE({normalized_sql(f'{row}.{column}')}, '')"
+
+
+def _upsert_breakdown(table, column, row, delta):
+    return f"""
+        INSERT INTO platform_breakdowns (table_name, column_name, value, count)
+        VALUES ('{table}', '{column}', {_value(row, column)}, {delta})
+        ON CONFLICT (table_name, column_name, value)
+        DO UPDATE SET count = count + ({delta});
+    """
+
+
+def _create_triggers(conn, table, columns):
+    total = TOTAL_COLUMNS[table]
+    breakdowns = [c for c in BREAKDOWN_COLUMNS.get(table, ()) if c in columns]
+
+    insert_body = f"UPDATE platform_stats SET {total} = {total} + 1 WHERE id = 1;"
+    insert_body += "".join(_upsert_breakdown(table, c, "NEW", 1) for c in breakdowns)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_insert
+        AFTER INSERT ON {table}
+        BEGIN {insert_body} END
+    """)
+
+    delete_body = f"UPDATE platform_stats SET {total} = {total} - 1 WHERE id = 1;"
+    delete_body += "".join(_upsert_breakdown(table, c, "OLD", -1) for c in breakdowns)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_delete
+        AFTER DELETE ON {table}
+        BEGIN {delete_body} END
+    """)
+
+    for column in breakdowns:
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_update_{column}
+            AFTER UPDATE OF {column} ON {table}
+            WHEN {_value("OLD", column)} IS NOT {_value("NEW", column)}
+            BEGIN
+                {_upsert_breakdown(table, column, "OLD", -1)}
+                {_upsert_breakdown(table, column, "NEW", 1)}
+            END
+        """)
+
+
+def rebuild_platform_stats(conn):
+    """Recount everything from the tables (no commit)."""
+    conn.execute("DELETE FROM platform_breakdowns")
+    for table, total in TOTAL_COLUMNS.items():
+        columns = _columns(conn, table)
+        if not columns:
+            continue
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.execute(f"UPDATE platform_stats SET {total} = ? WHERE id = 1", (count,))
+        for column in BREAKDOWN_COLUMNS.get(table, ()):
+            if column not in columns:
+                continue
+            conn.execute(f"""
+                INSERT INTO platform_breakdowns (table_name, column_name, value, count)
+                SELECT '{table}', '{column}', {_value(table, column)}, COUNT(*)
+                FROM {table}
+                GROUP BY {_value(table, column)}
+            """)
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def create_platform_stats(conn):
+    """Create the counter tables and triggers, then fill them with a full recount."""
+    # Hold the write lock so no row changes between adding triggers and recounting
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS platform_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            incidents INTEGER NOT NULL DEFAULT 0,
+            tickets INTEGER NOT NULL DEFAULT 0,
+            datasets INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS platform_breakdowns (
+            table_name TEXT NOT NULL,
+            column_name TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (table_name, column_name, value)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("INSERT OR IGNORE INTO platform_stats (id) VALUES (1)")
+
+    for table in TOTAL_COLUMNS:
+        columns = _columns(conn, table)
+        if columns:
+            _create_triggers(conn, table, columns)
+
+    rebuild_platform_stats(conn)
+    conn.commit()
+    print("✅ Platform statistics created")
+
+
+def get_platform_stats():
+    """
+    Return {'incidents': n, 'tickets': n, 'datasets': n} from the counter
+    row, creating the counters on first use.
+    """
+    conn = connect_database()
+    try:
+        try:
+            row = conn.execute(
+                "SELECT incidents, tickets, datasets FROM platform_stats WHERE id = 1"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is None:
+            create_platform_stats(conn)
+            row = conn.execute(
+                "SELECT incidents, tickets, datasets FROM platform_stats WHERE id = 1"
+            ).fetchone()
+        return dict(row)
+    finally:
+        conn.close()
+
+
+def get_breakdown(table, column):
+    """Return {value: count} for one of the BREAKDOWN_COLUMNS."""
+    conn = connect_database()
+    try:
+        rows = conn.execute("""
+            SELECT value, count FROM platform_breakdowns
+            WHERE table_name = ? AND column_name = ? AND count > 0
+            ORDER BY count DESC
+        """, (table, column)).fetchall()
+    finally:
+        conn.close()
+    return {row["value"]: row["count"] for row in rows}
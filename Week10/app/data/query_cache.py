@@ -0,0 +1,156 @@
+"""
+In-memory query result cache shared by all pages.
+
+Results are keyed by (normalized SQL, params, versions of the tables the
+query reads). Table versions come from the trigger-bumped table_versions
+table in snapshots.py, so a write to one table only invalidates queries on
+that table. Before looking versions up, the cache checks PRAGMA data_version
+on its own connection: if no other connection has committed since the last
+check, the versions can't have changed and the lookup is skipped.
+
+Entries are evicted least-recently-used once either the entry count or the
+total DataFrame memory goes over its limit. Cached DataFrames are shared,
+so callers must not modify them in place.
+"""
+
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from app.data.db import DATABASE_FILE
+from app.data.snapshots import TRACKED_TABLES, ensure_version_tracking, load_table
+
+MAX_ENTRIES = 256
+MAX_BYTES = 128 * 1024 * 1024
+
+_TABLE_PATTERN = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+_FULL_TABLE_PATTERN = re.compile(r"^SELECT \* FROM ([A-Za-z_][A-Za-z0-9_]*)$", re.IGNORECASE)
+
+
+def normalize_sql(sql):
+    """Collapse whitespace and drop a trailing ';' so equivalent SQL shares a key."""
+    return " ".join(sql.split()).rstrip(";").strip()
+
+
+def referenced_tables(sql):
+    return tuple(sorted({name.lower() for name in _TABLE_PATTERN.findall(sql)}))
+
+
+class QueryCache:
+    """LRU cache of DataFrames with an entry limit and a memory ceiling."""
+
+    def __init__(self, db_file=DATABASE_FILE, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.db_file = db_file
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._data_version = None
+        self._versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            ensure_version_tracking(self._conn)
+            self._conn.commit()
+        return self._conn
+
+    def _table_versions(self):
+        """Current {table: version}, re-read only when the database changed."""
+        conn = self._connection()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            versions = dict(conn.execute(
+                "SELECT table_name, version FROM table_versions"
+            ).fetchall())
+            changed = {t for t in versions if versions[t] != self._versions.get(t)}
+            self._invalidate(changed)
+            self._versions = versions
+            self._data_version = data_version
+        return self._versions
+
+    def table_version(self, table):
+        """Current version of a tracked table (None if untracked)."""
+        with self._lock:
+            return self._table_versions().get(table)
+
+    def _invalidate(self, tables):
+        """Drop entries that read any of the given tables (caller holds the lock)."""
+        if not tables:
+            return
+        for key in [k for k, entry in self._entries.items() if tables & entry[2]]:
+            self._bytes -= self._entries.pop(key)[1]
+
+    def read_sql(self, sql, params=()):
+        """Return the query result as a DataFrame, from memory when still current."""
+        sql = normalize_sql(sql)
+        params = tuple(params)
+        tables = referenced_tables(sql)
+
+        with self._lock:
+            versions = self._table_versions()
+            key = (sql, params, tuple(versions.get(t) for t in tables))
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Untracked tables have no version to invalidate on, so don't cache them
+        cacheable = all(t in TRACKED_TABLES for t in tables)
+        match = _FULL_TABLE_PATTERN.match(sql)
+        if match and not params and match.group(1) in TRACKED_TABLES:
+            df = load_table(match.group(1))
+        else:
+            conn = sqlite3.connect(self.db_file)
+            try:
+                df = pd.read_sql_query(sql, conn, params=params)
+            finally:
+                conn.close()
+
+        if cacheable:
+            self._store(key, df, tables)
+        return df
+
+    def _store(self, key, df, tables):
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (df, size, set(tables))
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+query_cache = QueryCache()
+
+
+def read_sql(sql, params=()):
+    """Module-level shortcut for query_cache.read_sql."""
+    return query_cache.read_sql(sql, params)
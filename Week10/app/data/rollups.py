@@ -0,0 +1,160 @@
+"""
+Trigger-maintained time-series rollups for incident trends.
+
+incident_rollups holds one count per (period, bucket, incident type,
+severity), where period is 'day', 'week' (buckets start on Monday) or
+'month'. Triggers adjust the affected buckets in the same transaction as
+each INSERT, UPDATE or DELETE, like the counters in platform_stats.py, so
+a trend chart reads at most a few thousand rollup rows however many
+incidents there are.
+"""
+
+import sqlite3
+
+import pandas as pd
+
+from app.data.db import connect_database
+from app.data.normalize import normalized_sql
+
+# period -> SQL expression turning a date into the start of its bucket
+PERIODS = {
+    "day": "date({value})",
+    "week": "date({value}, '-6 days', 'weekday 1')",
+    "month": "strftime('%Y-%m-01', {value})",
+}
+
+# Incident date column, CSV-imported layout first
+DATE_COLUMNS = ("date", "created_date")
+
+GROUP_COLUMNS = {
+    "severity": "severity",
+    "type": "incident_type",
+}
+
+
+def _date_column(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(cyber_incidents)")}
+    for column in DATE_COLUMNS:
+        if column in columns:
+            return column
+    return None
+
+
+def _keys(row, date_column):
+    """SQL expressions for (incident_type, severity, date) of NEW/OLD or a table."""
+    return (
+        f"COALESCE({row}.incident_type, '')",
+        f"COALESCE({normalized_sql(f'{row}.severity')}, '')",
+        f"{row}.{date_column}",
+    )
+
+
+def _adjust(row, date_column, delta):
+    incident_type, severity, date = _keys(row, date_column)
+    statements = []
+    for period, bucket in PERIODS.items():
+        statements.append(f"""
+            INSERT INTO incident_rollups (period, bucket, incident_type, severity, count)
+            SELECT '{period}', {bucket.format(value=date)}, {incident_type}, {severity}, {delta}
+            WHERE {bucket.format(value=date)} IS NOT NULL
+            ON CONFLICT (period, bucket, incident_type, severity)
+            DO UPDATE SET count = count + ({delta});
+        """)
+    return "".join(statements)
+
+
+def _create_triggers(conn, date_column):
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_cyber_incidents_rollup_insert
+        AFTER INSERT ON cyber_incidents
+        BEGIN {_adjust("NEW", date_column, 1)} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_cyber_incidents_rollup_delete
+        AFTER DELETE ON cyber_incidents
+        BEGIN {_adjust("OLD", date_column, -1)} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_cyber_incidents_rollup_update
+        AFTER UPDATE OF {date_column}, incident_type, severity ON cyber_incidents
+        BEGIN
+            {_adjust("OLD", date_column, -1)}
+            {_adjust("NEW", date_column, 1)}
+        END
+    """)
+
+
+def rebuild_incident_rollups(conn):
+    """Recount every bucket from cyber_incidents (no commit)."""
+    conn.execute("DELETE FROM incident_rollups")
+    date_column = _date_column(conn)
+    if date_column is None:
+        return
+    incident_type, severity, date = _keys("cyber_incidents", date_column)
+    for period, bucket in PERIODS.items():
+        bucket = bucket.format(value=date)
+        conn.execute(f"""
+            INSERT INTO incident_rollups (period, bucket, incident_type, severity, count)
+            SELECT '{period}', {bucket}, {incident_type}, {severity}, COUNT(*)
+            FROM cyber_incidents
+            WHERE {bucket} IS NOT NULL
+            GROUP BY 2, 3, 4
+        """)
+
+
+def create_incident_rollups(conn):
+    """Create the rollup table and triggers, then fill it with a full recount."""
+    # Hold the write lock so no row changes between adding triggers and recounting
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS incident_rollups (
+            period TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            incident_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (period, bucket, incident_type, severity)
+        ) WITHOUT ROWID
+    """)
+    date_column = _date_column(conn)
+    if date_column is not None:
+        _create_triggers(conn, date_column)
+    rebuild_incident_rollups(conn)
+    conn.commit()
+    print("✅ Incident rollups created")
+
+
+def get_incident_trend(period="month", by="severity", start=None, end=None):
+    """
+    Incident counts per bucket of the period, one column per severity (or
+    incident type), indexed by bucket start date. Reads only the rollup
+    table, creating it on first use.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+    group = GROUP_COLUMNS[by]
+    sql = f"""
+        SELECT bucket, {group} AS series, SUM(count) AS count
+        FROM incident_rollups
+        WHERE period = ? AND bucket >= ? AND bucket <= ?
+        GROUP BY bucket, {group}
+        HAVING SUM(count) > 0
+        ORDER BY bucket
+    """
+    params = (period, start or "", end or "9999")
+
+    conn = connect_database()
+    try:
+        try:
+            df = pd.read_sql_query(sql, conn, params=params)
+        except (sqlite3.OperationalError, pd.errors.DatabaseError):
+            create_incident_rollups(conn)
+            df = pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+    if df.empty:
+        return pd.DataFrame()
+    trend = df.pivot(index="bucket", columns="series", values="count").fillna(0).astype(int)
+    trend.index = pd.to_datetime(trend.index)
+    return trend
@@ -1,5 +1,58 @@
+import re
 import sqlite3
 
+from app.data.normalize import migrate_normalized_columns
+from app.data.platform_stats import create_platform_stats
+from app.data.rollups import create_incident_rollups
+from app.data.search import create_search_indexes
+
+# (index name, table, columns, partial-index WHERE clause or None)
+# Columns from both the declared schema and the CSV-imported layout are
+# listed; indexes on columns a table doesn't have are skipped.
+INDEXES = [
+    ("idx_users_role", "users", ("role",), None),
+    ("idx_incidents_status", "cyber_incidents", ("status",), None),
+    ("idx_incidents_type_severity", "cyber_incidents", ("incident_type", "severity"), None),
+    ("idx_incidents_severity_status", "cyber_incidents", ("severity", "status"), None),
+    ("idx_incidents_created_date", "cyber_incidents", ("created_date",), None),
+    ("idx_incidents_date", "cyber_incidents", ("date",), None),
+    ("idx_tickets_status_priority", "it_tickets", ("status", "priority"), None),
+    ("idx_tickets_priority", "it_tickets", ("priority",), None),
+    ("idx_tickets_category", "it_tickets", ("category",), None),
+    ("idx_tickets_created_date", "it_tickets", ("created_date",), None),
+    # Open tickets are a small, hot subset: keep them in their own index
+    ("idx_tickets_open", "it_tickets", ("created_date",), "status = 'open'"),
+    ("idx_datasets_category", "datasets_metadata", ("category",), None),
+    ("idx_datasets_source", "datasets_metadata", ("source",), None),
+    ("idx_datasets_owner", "datasets_metadata", ("owner",), None),
+    ("idx_datasets_format", "datasets_metadata", ("format",), None),
+]
+
+# Queries behind the dashboards; each must be answered from an index
+DASHBOARD_QUERIES = [
+    "SELECT severity, COUNT(*) FROM cyber_incidents GROUP BY severity",
+    "SELECT status, COUNT(*) FROM cyber_incidents GROUP BY status",
+    "SELECT incident_type, COUNT(*) FROM cyber_incidents GROUP BY incident_type",
+    "SELECT COUNT(*) FROM cyber_incidents WHERE severity = 'critical'",
+    "SELECT COUNT(*) FROM cyber_incidents WHERE status = 'resolved'",
+    "SELECT * FROM cyber_incidents WHERE id < 100 ORDER BY id DESC LIMIT 50",
+    "SELECT status, COUNT(*) FROM it_tickets GROUP BY status",
+    "SELECT priority, COUNT(*) FROM it_tickets GROUP BY priority",
+    "SELECT COUNT(*) FROM it_tickets WHERE status = 'open' AND priority = 'high'",
+    "SELECT severity_norm, COUNT(*) FROM cyber_incidents GROUP BY severity_norm",
+    "SELECT status_norm, COUNT(*) FROM cyber_incidents GROUP BY status_norm",
+    "SELECT COUNT(*) FROM cyber_incidents WHERE severity_norm = 'critical'",
+    "SELECT status_norm, COUNT(*) FROM it_tickets GROUP BY status_norm",
+    "SELECT priority_norm, COUNT(*) FROM it_tickets GROUP BY priority_norm",
+    "SELECT COUNT(*) FROM it_tickets WHERE status_norm = 'in-progress'",
+    "SELECT * FROM it_tickets WHERE status = 'open' ORDER BY created_date LIMIT 20",
+    "SELECT category, COUNT(*) FROM datasets_metadata GROUP BY category",
+    "SELECT source, COUNT(*) FROM datasets_metadata GROUP BY source",
+    "SELECT owner, COUNT(*) FROM datasets_metadata GROUP BY owner",
+    "SELECT format, COUNT(*) FROM datasets_metadata GROUP BY format",
+    "SELECT role, COUNT(*) FROM users GROUP BY role",
+]
+
 def create_users_table(conn):
     """Create users table"""
     cursor = conn.cursor()
@@ -70,12 +123,114 @@ def create_datasets_metadata_table(conn):
     conn.commit()
     print("✅ Datasets metadata table created")
 
+def _table_columns(conn, table):
+    """Return {column name: is primary key} for an existing table."""
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return {row[1]: bool(row[5]) for row in rows}
+
+def create_indexes(conn):
+    """
+    Create the secondary indexes the dashboards rely on. Indexes on columns
+    a table doesn't have (older CSV-imported layouts) are skipped.
+    """
+    cursor = conn.cursor()
+    for table in {table for _, table, _, _ in INDEXES}:
+        columns = _table_columns(conn, table)
+        # Tables created by pandas.to_sql have a plain 'id' column, so the
+        # keyset pagination queries need an explicit index on it
+        if "id" in columns and not columns["id"]:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_id ON {table} (id)")
+
+    for name, table, columns, where in INDEXES:
+        if not set(columns) <= set(_table_columns(conn, table)):
+            continue
+        sql = f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        if where:
+            sql += f" WHERE {where}"
+        cursor.execute(sql)
+    conn.commit()
+    print("✅ Indexes created")
+
+def _query_table(sql):
+    return re.search(r"\bFROM\s+(\w+)", sql, re.IGNORECASE).group(1)
+
+
+def _is_partial_index(conn, name):
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None and re.search(r"\bWHERE\b", row[0] or "", re.IGNORECASE) is not None
+
+
+def _scan_is_acceptable(conn, sql, detail):
+    """
+    Whether a 'SCAN ...' step of sql's plan is acceptable. Only two are:
+    - a scan of a partial index, which holds just the rows it covers;
+    - a scan of an index by a query without WHERE (e.g. a GROUP BY count),
+      which has to read every row anyway; the index is narrower than the
+      table and already in group order.
+    A scan of the table itself, or of a whole index to filter rows, is not.
+    """
+    index = re.search(r"USING (?:COVERING )?INDEX (\w+)", detail)
+    if index is None:
+        return False
+    if re.search(r"\bWHERE\b", sql, re.IGNORECASE) is None:
+        return True
+    return _is_partial_index(conn, index.group(1))
+
+
+def verify_query_plans(conn, queries=DASHBOARD_QUERIES):
+    """
+    Run EXPLAIN QUERY PLAN on every dashboard query and raise if any of
+    them would scan a table, or scan a whole index to filter it, instead
+    of searching an index (see _scan_is_acceptable).
+
+    Queries on a table or column this database's layout doesn't have (older
+    CSV-imported layouts) are skipped and reported; any other error is
+    raised.
+    """
+    bad_plans = []
+    skipped = []
+    for sql in queries:
+        table = _query_table(sql)
+        columns = _table_columns(conn, table)
+        if not columns:
+            skipped.append(f"{sql}  ->  no table {table}")
+            continue
+        try:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        except sqlite3.OperationalError as error:
+            missing = re.match(r"no such column: (\w+)$", str(error))
+            if missing is None or missing.group(1) in columns:
+                raise
+            skipped.append(f"{sql}  ->  no column {table}.{missing.group(1)}")
+            continue
+        for row in plan:
+            detail = row[-1]
+            if detail.startswith("SCAN ") and not _scan_is_acceptable(conn, sql, detail):
+                bad_plans.append(f"{sql}  ->  {detail}")
+
+    if bad_plans:
+        raise RuntimeError(
+            "Dashboard queries are not served by an index:\n  "
+            + "\n  ".join(bad_plans)
+        )
+    print(f"✅ Query plans verified ({len(queries) - len(skipped)} of {len(queries)} checked)")
+    if skipped:
+        print("   Skipped, not in this table layout:\n     " + "\n     ".join(skipped))
+
 def create_all_tables(conn):
     """Create all tables"""
     create_users_table(conn)
     create_cyber_incidents_table(conn)
     create_it_tickets_table(conn)
     create_datasets_metadata_table(conn)
+    migrate_normalized_columns(conn)
+    create_indexes(conn)
+    verify_query_plans(conn)
+    create_platform_stats(conn)
+    create_incident_rollups(conn)
+    create_search_indexes(conn)
     print("\n✅ All tables created successfully!")
 
 if __name__ == "__main__":
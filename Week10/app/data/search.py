@@ -0,0 +1,150 @@
+"""
+Full-text search over incident and ticket text.
+
+Each searchable table gets an external-content FTS5 index over whichever
+of its text columns exist (the CSV-imported and declared layouts differ).
+Triggers keep the index in step with every INSERT, UPDATE and DELETE, so
+searches never have to load the table into pandas. Results are ranked with
+BM25 and come with a highlighted snippet of the best-matching column.
+"""
+
+import re
+import sqlite3
+
+import pandas as pd
+
+from app.data.db import connect_database
+
+# table -> (FTS5 table, text columns to index when present)
+SEARCH_INDEXES = {
+    "cyber_incidents": ("cyber_incidents_fts", ("title", "incident_type", "description")),
+    "it_tickets": ("it_tickets_fts", ("title", "subject", "description")),
+}
+
+SNIPPET_TOKENS = 12
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_ready = set()
+
+
+def _indexed_columns(conn, table):
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    return [c for c in SEARCH_INDEXES[table][1] if c in existing]
+
+
+def _create_triggers(conn, table, fts, columns):
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{c}" for c in columns)
+    old_values = ", ".join(f"OLD.{c}" for c in columns)
+    delete_old = f"""
+        INSERT INTO {fts} ({fts}, rowid, {column_list})
+        VALUES ('delete', OLD.rowid, {old_values});
+    """
+    insert_new = f"""
+        INSERT INTO {fts} (rowid, {column_list}) VALUES (NEW.rowid, {new_values});
+    """
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table}
+        BEGIN {insert_new} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table}
+        BEGIN {delete_old} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {column_list} ON {table}
+        BEGIN {delete_old} {insert_new} END
+    """)
+
+
+def create_search_index(conn, table):
+    """
+    Create the FTS5 index and its triggers for one table and fill it from
+    the existing rows. Returns False if the table has no text columns.
+    """
+    fts = SEARCH_INDEXES[table][0]
+    columns = _indexed_columns(conn, table)
+    if not columns:
+        return False
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).fetchone()
+    if not exists:
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE {fts} USING fts5(
+                {', '.join(columns)},
+                content='{table}',
+                content_rowid='rowid',
+                tokenize='porter unicode61'
+            )
+        """)
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    _create_triggers(conn, table, fts, columns)
+    conn.commit()
+    return True
+
+
+def create_search_indexes(conn):
+    for table in SEARCH_INDEXES:
+        create_search_index(conn, table)
+    print("✅ Search indexes created")
+
+
+def rebuild_search_index(conn, table):
+    """Re-read every row into the index (after bulk loads that bypass triggers)."""
+    fts = SEARCH_INDEXES[table][0]
+    conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    conn.commit()
+
+
+def to_match_query(text):
+    """
+    Turn free text from a search box into an FTS5 query: every word must
+    match, and the last one may be a prefix (search-as-you-type). Words are
+    quoted, so punctuation in the input can't break the query syntax.
+    """
+    words = _TOKEN_PATTERN.findall(text or "")
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _search(table, text, limit):
+    fts, _ = SEARCH_INDEXES[table]
+    query = to_match_query(text)
+    if query is None:
+        return pd.DataFrame()
+
+    conn = connect_database()
+    try:
+        if table not in _ready:
+            create_search_index(conn, table)
+            _ready.add(table)
+        try:
+            return pd.read_sql_query(f"""
+                SELECT t.*,
+                       snippet({fts}, -1, '**', '**', '…', {SNIPPET_TOKENS}) AS snippet,
+                       bm25({fts}) AS rank
+                FROM {fts}
+                JOIN {table} AS t ON t.rowid = {fts}.rowid
+                WHERE {fts} MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, conn, params=(query, limit))
+        except (sqlite3.OperationalError, pd.errors.DatabaseError):
+            # Table has no text columns to search
+            return pd.DataFrame()
+    finally:
+        conn.close()
+
+
+def search_incidents(query, limit=20):
+    """Incidents matching query, best match first, with a 'snippet' column."""
+    return _search("cyber_incidents", query, limit)
+
+
+def search_tickets(query, limit=20):
+    """Tickets matching query, best match first, with a 'snippet' column."""
+    return _search("it_tickets", query, limit)
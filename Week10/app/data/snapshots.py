@@ -0,0 +1,151 @@
+"""
+Columnar snapshot cache for the analytics pages.
+
+Each tracked table gets a version number in `table_versions`, bumped by
+triggers on every INSERT/UPDATE/DELETE, and a random token set when the
+table is first tracked. load_table() writes the table to an uncompressed
+Feather (Arrow IPC) file named after token and version, in a folder next
+to the database file, and then reads it back memory-mapped, so as long as
+nothing changes the pages never decode rows from SQLite. A replaced or
+recreated database restarts its versions under new tokens, so it never
+picks up an old database's snapshots. Without pyarrow it falls back to
+read_sql_query.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from app.data.db import DATABASE_FILE, connect_database
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+TRACKED_TABLES = ["cyber_incidents", "it_tickets", "datasets_metadata"]
+
+
+def ensure_version_tracking(conn, tables=TRACKED_TABLES):
+    """Create table_versions and the triggers that bump it (idempotent, no commit)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            token TEXT
+        )
+    """)
+    # table_versions created before snapshots were keyed by token
+    if "token" not in {row[1] for row in conn.execute("PRAGMA table_info(table_versions)")}:
+        conn.execute("ALTER TABLE table_versions ADD COLUMN token TEXT")
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    )}
+    for table in tables:
+        if table not in existing:
+            continue
+        conn.execute(
+            "INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)",
+            (table,)
+        )
+        conn.execute(
+            "UPDATE table_versions SET token = lower(hex(randomblob(8))) "
+            "WHERE table_name = ? AND token IS NULL",
+            (table,)
+        )
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_versions SET version = version + 1
+                    WHERE table_name = '{table}';
+                END
+            """)
+
+
+def bump_version(conn, table):
+    """Mark a table as changed after writes the triggers can't see (DROP/CREATE)."""
+    conn.execute(
+        "UPDATE table_versions SET version = version + 1 WHERE table_name = ?",
+        (table,)
+    )
+
+
+def table_version(conn, table):
+    """(token, version) of a tracked table, or None if it isn't tracked yet."""
+    try:
+        row = conn.execute(
+            "SELECT token, version FROM table_versions WHERE table_name = ?", (table,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # table_versions not created yet, or created before tokens
+        return None
+    if row is None or row[0] is None:
+        return None
+    return row[0], row[1]
+
+
+def snapshot_dir():
+    """Folder for the snapshots of DATABASE_FILE, next to the file itself."""
+    return Path(DATABASE_FILE).resolve().with_suffix(".snapshots")
+
+
+def _snapshot_path(table, version):
+    token, number = version
+    return snapshot_dir() / f"{table}-{token}-v{number}.feather"
+
+
+def _write_snapshot(df, table, version):
+    """Write atomically, then remove the table's other snapshots."""
+    path = _snapshot_path(table, version)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    feather.write_feather(df, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    for old in path.parent.glob(f"{table}-*.feather"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    return path
+
+
+def _read_snapshot(path):
+    # Memory-mapped and uncompressed: numeric columns are used in place
+    with pa.memory_map(str(path), "r") as source:
+        arrow_table = pa.ipc.open_file(source).read_all()
+    return arrow_table.to_pandas(split_blocks=True)
+
+
+def load_table(table):
+    """
+    Return the whole table as a DataFrame, from its snapshot when the
+    table's version hasn't changed since the snapshot was written.
+    """
+    conn = connect_database()
+    try:
+        if pa is None:
+            return pd.read_sql_query(f"SELECT * FROM {table}", conn)
+
+        version = table_version(conn, table)
+        if version is None:
+            ensure_version_tracking(conn, [table])
+            conn.commit()
+            version = table_version(conn, table)
+
+        path = _snapshot_path(table, version)
+        if path.exists():
+            return _read_snapshot(path)
+
+        # Read version and rows in one transaction so they match
+        conn.execute("BEGIN")
+        version = table_version(conn, table)
+        df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    _write_snapshot(df, table, version)
+    return df
@@ -4,6 +4,16 @@ import plotly.express as px
 import sqlite3
 from datetime import datetime
 import openai
+from app.data.context import DataContext
+from app.data.figure_cache import figure_cache
+from app.data.stats import (
+    as_counts, severity_breakdown, status_breakdown, incident_type_breakdown
+)
+from app.data.incidents import get_incidents_page
+from app.data.normalize import normalize_label
+from app.data.pagination import PageCursor
+from app.data.rollups import get_incident_trend
+from app.data.search import search_incidents
 
 # PAGE CONFIG & AUTHENTICATION
 st.set_page_config(page_title="Cybersecurity", page_icon="🔐", layout="wide")
@@ -63,6 +73,10 @@ st.title("🔐 Cybersecurity Domain")
 st.markdown("---")
 
 
+# Tables are loaded at most once per rerun and shared by every tab
+data = DataContext()
+
+
 # TABS STRUCTURE
 
 tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "⚙️ CRUD Operations", "📈 Analysis", "🤖 AI Chatbot"])
@@ -71,28 +85,39 @@ with tab1:
     st.subheader("Cybersecurity Dashboard Overview")
     
     try:
-        conn = connect_db()
-        incidents_df = pd.read_sql_query(
-            "SELECT * FROM cyber_incidents",
-            conn
-        )
-        conn.close()
+        incidents_df = data.table("cyber_incidents")
         
         if not incidents_df.empty:
             # Metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("📊 Total Incidents", len(incidents_df))
+            severity_counts = as_counts(severity_breakdown())
+            status_counts = as_counts(status_breakdown())
             with col2:
-                critical = len(incidents_df[incidents_df['severity'].str.lower() == 'critical'])
-                st.metric("🔴 Critical", critical)
+                st.metric("🔴 Critical", int(severity_counts.get('critical', 0)))
             with col3:
-                high = len(incidents_df[incidents_df['severity'].str.lower() == 'high'])
-                st.metric("🟠 High", high)
+                st.metric("🟠 High", int(severity_counts.get('high', 0)))
             with col4:
-                resolved = len(incidents_df[incidents_df['status'].str.lower() == 'resolved'])
-                st.metric("✅ Resolved", resolved)
+                st.metric("✅ Resolved", int(status_counts.get('resolved', 0)))
             
+            st.divider()
+            st.write("### 🔍 Search Incidents")
+            search_query = st.text_input(
+                "Search descriptions",
+                placeholder="e.g., phishing email",
+                key="incident_search"
+            )
+            if search_query:
+                matches = search_incidents(search_query, limit=50)
+                if matches.empty:
+                    st.info("ℹ️ No matching incidents")
+                else:
+                    st.caption(f"{len(matches)} best matches")
+                    for _, match in matches.iterrows():
+                        label = match.get("title") or match.get("incident_type") or ""
+                        st.markdown(f"**#{match['id']}** {label} — {match['snippet']}")
+
             st.divider()
             st.write("### 📋 All Incidents")
             st.dataframe(incidents_df, use_container_width=True, hide_index=True)
@@ -151,7 +176,8 @@ with tab2:
                             INSERT INTO cyber_incidents 
                             (date, incident_type, severity, status, description, reported_by)
                             VALUES (?, ?, ?, ?, ?, ?)
-                        """, (datetime.now().date(), incident_type, severity, status, description, reported_by))
+                        """, (datetime.now().date(), incident_type, normalize_label(severity),
+                              normalize_label(status), description, reported_by))
                         conn.commit()
                         conn.close()
                         st.success("✅ Incident created successfully!")
@@ -163,13 +189,28 @@ with tab2:
     elif crud_op == "Read":
         st.write("### 📖 View All Incidents")
         
+        # Keyset-paginated: each page seeks on the primary key
+        if "incident_pages" not in st.session_state:
+            st.session_state.incident_pages = PageCursor(get_incidents_page, page_size=50)
+        pages = st.session_state.incident_pages
+        
         try:
-            conn = connect_db()
-            incidents = pd.read_sql_query("SELECT * FROM cyber_incidents", conn)
-            conn.close()
+            incidents = pages.current()
             
             if not incidents.empty:
                 st.dataframe(incidents, use_container_width=True, hide_index=True)
+                
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    if st.button("← Previous", use_container_width=True, disabled=not pages.has_previous):
+                        pages.previous()
+                        st.rerun()
+                with col2:
+                    st.caption(f"Page {pages.page_number}")
+                with col3:
+                    if st.button("Next →", use_container_width=True, disabled=not pages.has_next):
+                        pages.next()
+                        st.rerun()
             else:
                 st.info("ℹ️ No incidents found")
         except Exception as e:
@@ -195,10 +236,10 @@ with tab2:
                     
                     if severity != "skip":
                         updates.append("severity = ?")
-                        params.append(severity)
+                        params.append(normalize_label(severity))
                     if status != "skip":
                         updates.append("status = ?")
-                        params.append(status)
+                        params.append(normalize_label(status))
                     
                     if not updates:
                         st.warning("⚠️ No fields to update")
@@ -249,51 +290,47 @@ with tab3:
     st.divider()
     
     try:
-        conn = connect_db()
-        incidents_df = pd.read_sql_query(
-            "SELECT * FROM cyber_incidents",
-            conn
-        )
-        conn.close()
+        severity_counts = as_counts(severity_breakdown())
         
-        if not incidents_df.empty:
+        if not severity_counts.empty:
             col1, col2 = st.columns(2)
             
 # Chart 1: Incidents by Severity
             with col1:
                 st.write("#### 📊 Incidents by Severity")
                 try:
-                    severity_counts = incidents_df['severity'].value_counts()
-                    
-                    if severity_chart_type == "Bar":
-                        fig1 = px.bar(
-                            x=severity_counts.index,
-                            y=severity_counts.values,
-                            labels={'x': 'Severity', 'y': 'Count'},
-                            color=severity_counts.index,
-                            color_discrete_map={
-                                'critical': '#d62728',
-                                'high': '#ff7f0e',
-                                'medium': '#ffbb78',
-                                'low': '#2ca02c'
-                            }
-                        )
-                        fig1.update_layout(showlegend=False, xaxis_title="Severity", yaxis_title="Count")
-                    elif severity_chart_type == "Pie":
-                        fig1 = px.pie(
-                            values=severity_counts.values,
-                            names=severity_counts.index,
-                            title="Severity Distribution"
-                        )
-                    else:  # Line
-                        fig1 = px.line(
-                            x=severity_counts.index,
-                            y=severity_counts.values,
-                            markers=True,
-                            labels={'x': 'Severity', 'y': 'Count'}
-                        )
-                        fig1.update_layout(xaxis_title="Severity", yaxis_title="Count")
-                    
+                    fig1 = figure_cache.get("cyber_incidents", "severity", severity_chart_type)
+                    if fig1 is None:
+                        if severity_chart_type == "Bar":
+                            fig1 = px.bar(
+                                x=severity_counts.index,
+                                y=severity_counts.values,
+                                labels={'x': 'Severity', 'y': 'Count'},
+                                color=severity_counts.index,
+                                color_discrete_map={
+                                    'critical': '#d62728',
+                                    'high': '#ff7f0e',
+                                    'medium': '#ffbb78',
+                                    'low': '#2ca02c'
+                                }
+                            )
+                            fig1.update_layout(showlegend=False, xaxis_title="Severity", yaxis_title="Count")
+                        elif severity_chart_type == "Pie":
+                            fig1 = px.pie(
+                                values=severity_counts.values,
+                                names=severity_counts.index,
+                                title="Severity Distribution"
+                            )
+                        else:  # Line
+                            fig1 = px.line(
+                                x=severity_counts.index,
+                                y=severity_counts.values,
+                                markers=True,
+                                labels={'x': 'Severity', 'y': 'Count'}
+                            )
+                            fig1.update_layout(xaxis_title="Severity", yaxis_title="Count")
+                        fig1 = figure_cache.put("cyber_incidents", "severity", severity_chart_type, fig1)
+
                     st.plotly_chart(fig1, use_container_width=True)
                 except Exception as e:
                     st.warning(f"⚠️ Could not create severity chart: {str(e)}")
@@ -302,30 +339,32 @@ with tab3:
             with col2:
                 st.write("#### 🔄 Incidents by Status")
                 try:
-                    status_counts = incidents_df['status'].value_counts()
-                    
-                    if status_chart_type == "Pie":
-                        fig2 = px.pie(
-                            values=status_counts.values,
-                            names=status_counts.index,
-                            title="Status Distribution"
-                        )
-                    elif status_chart_type == "Bar":
-                        fig2 = px.bar(
-                            x=status_counts.index,
-                            y=status_counts.values,
-                            labels={'x': 'Status', 'y': 'Count'},
-                            color=status_counts.index
-                        )
-                        fig2.update_layout(showlegend=False)
-                    else:  # Donut
-                        fig2 = px.pie(
-                            values=status_counts.values,
-                            names=status_counts.index,
-                            hole=0.3,
-                            title="Status Distribution"
-                        )
-                    
+                    fig2 = figure_cache.get("cyber_incidents", "status", status_chart_type)
+                    if fig2 is None:
+                        status_counts = as_counts(status_breakdown())
+                        if status_chart_type == "Pie":
+                            fig2 = px.pie(
+                                values=status_counts.values,
+                                names=status_counts.index,
+                                title="Status Distribution"
+                            )
+                        elif status_chart_type == "Bar":
+                            fig2 = px.bar(
+                                x=status_counts.index,
+                                y=status_counts.values,
+                                labels={'x': 'Status', 'y': 'Count'},
+                                color=status_counts.index
+                            )
+                            fig2.update_layout(showlegend=False)
+                        else:  # Donut
+                            fig2 = px.pie(
+                                values=status_counts.values,
+                                names=status_counts.index,
+                                hole=0.3,
+                                title="Status Distribution"
+                            )
+                        fig2 = figure_cache.put("cyber_incidents", "status", status_chart_type, fig2)
+
                     st.plotly_chart(fig2, use_container_width=True)
                 except Exception as e:
                     st.warning(f"⚠️ Could not create status chart: {str(e)}")
@@ -335,35 +374,37 @@ with tab3:
             # Chart 3: Incidents by Type
             st.write("#### 🎯 Incidents by Type")
             try:
-                if 'incident_type' in incidents_df.columns:
-                    type_counts = incidents_df['incident_type'].value_counts()
-                    
-                    if type_chart_type == "Bar":
-                        fig3 = px.bar(
-                            x=type_counts.index,
-                            y=type_counts.values,
-                            labels={'x': 'Type', 'y': 'Count'},
-                            color=type_counts.values,
-                            color_continuous_scale="Reds"
-                        )
-                        fig3.update_layout(xaxis_title="Incident Type", yaxis_title="Count", showlegend=False)
-                    elif type_chart_type == "Pie":
-                        fig3 = px.pie(
-                            values=type_counts.values,
-                            names=type_counts.index,
-                            title="Type Distribution"
-                        )
-                    else:  # Horizontal
-                        fig3 = px.bar(
-                            y=type_counts.index,
-                            x=type_counts.values,
-                            orientation='h',
-                            labels={'x': 'Count', 'y': 'Type'},
-                            color=type_counts.values,
-                            color_continuous_scale="Reds"
-                        )
-                        fig3.update_layout(yaxis_title="Incident Type", xaxis_title="Count", showlegend=False)
-                    
+                type_counts = as_counts(incident_type_breakdown())
+                if not type_counts.empty:
+                    fig3 = figure_cache.get("cyber_incidents", "incident_type", type_chart_type)
+                    if fig3 is None:
+                        if type_chart_type == "Bar":
+                            fig3 = px.bar(
+                                x=type_counts.index,
+                                y=type_counts.values,
+                                labels={'x': 'Type', 'y': 'Count'},
+                                color=type_counts.values,
+                                color_continuous_scale="Reds"
+                            )
+                            fig3.update_layout(xaxis_title="Incident Type", yaxis_title="Count", showlegend=False)
+                        elif type_chart_type == "Pie":
+                            fig3 = px.pie(
+                                values=type_counts.values,
+                                names=type_counts.index,
+                                title="Type Distribution"
+                            )
+                        else:  # Horizontal
+                            fig3 = px.bar(
+                                y=type_counts.index,
+                                x=type_counts.values,
+                                orientation='h',
+                                labels={'x': 'Count', 'y': 'Type'},
+                                color=type_counts.values,
+                                color_continuous_scale="Reds"
+                            )
+                            fig3.update_layout(yaxis_title="Incident Type", xaxis_title="Count", showlegend=False)
+                        fig3 = figure_cache.put("cyber_incidents", "incident_type", type_chart_type, fig3)
+
                     st.plotly_chart(fig3, use_container_width=True)
                 else:
                     st.info("ℹ️ No incident_type column available")
@@ -374,6 +415,33 @@ with tab3:
     except Exception as e:
         st.error(f"❌ Error loading analysis: {str(e)}")
 
+    st.divider()
+
+    # Chart 4: Incident trend, read from the rollup table
+    st.write("#### 📈 Incident Trend")
+    col1, col2 = st.columns(2)
+    with col1:
+        trend_period = st.selectbox("Period", ["Monthly", "Weekly", "Daily"], key="trend_period")
+    with col2:
+        trend_split = st.selectbox("Split By", ["Severity", "Type"], key="trend_split")
+    try:
+        periods = {"Daily": "day", "Weekly": "week", "Monthly": "month"}
+        fig4 = figure_cache.get("cyber_incidents", f"trend_{trend_split}", trend_period)
+        if fig4 is None:
+            trend = get_incident_trend(periods[trend_period], by=trend_split.lower())
+            if not trend.empty:
+                fig4 = px.line(
+                    trend,
+                    labels={'bucket': 'Date', 'value': 'Incidents', 'series': trend_split}
+                )
+                fig4 = figure_cache.put("cyber_incidents", f"trend_{trend_split}", trend_period, fig4)
+        if fig4 is not None:
+            st.plotly_chart(fig4, use_container_width=True)
+        else:
+            st.info("ℹ️ No dated incidents available")
+    except Exception as e:
+        st.warning(f"⚠️ Could not create trend chart: {str(e)}")
+
 
 # TAB 4: AI CHATBOT
 with tab4:
@@ -385,23 +453,20 @@ with tab4:
     with col2:
         if st.button("🧠 Load Context", use_container_width=True):
             try:
-                conn = connect_db()
-                incidents_df = pd.read_sql_query(
-                    "SELECT * FROM cyber_incidents",
-                    conn
-                )
-                conn.close()
+                severity_counts = as_counts(severity_breakdown())
+                status_counts = as_counts(status_breakdown())
+                type_counts = as_counts(incident_type_breakdown())
                 
-                critical_count = len(incidents_df[incidents_df['severity'].str.lower() == 'critical'])
-                high_count = len(incidents_df[incidents_df['severity'].str.lower() == 'high'])
+                critical_count = int(severity_counts.get('critical', 0))
+                high_count = int(severity_counts.get('high', 0))
                 
                 context = f"""
 Current Security Data:
-- Total Incidents: {len(incidents_df)}
+- Total Incidents: {int(severity_counts.sum())}
 - Critical: {critical_count}
 - High: {high_count}
-- Resolved: {len(incidents_df[incidents_df['status'].str.lower() == 'resolved'])}
-- Top Threat Types: {', '.join(incidents_df['incident_type'].value_counts().head(3).index.tolist()) if 'incident_type' in incidents_df.columns else 'N/A'}
+- Resolved: {int(status_counts.get('resolved', 0))}
+- Top Threat Types: {', '.join(type_counts.head(3).index.tolist()) if not type_counts.empty else 'N/A'}
                 """
                 
                 st.session_state.ai_context_cyber = context
@@ -4,6 +4,9 @@ import plotly.express as px
 import sqlite3
 from datetime import datetime
 import openai
+from app.data.context import DataContext
+from app.data.figure_cache import figure_cache
+from app.data.stats import as_counts, category_breakdown, source_breakdown, dataset_totals
 
 
 # PAGE CONFIG & AUTHENTICATION
@@ -64,6 +67,10 @@ st.title("📊 Data Science Domain")
 st.markdown("---")
 
 
+# Tables are loaded at most once per rerun and shared by every tab
+data = DataContext()
+
+
 # TABS STRUCTURE
 tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "⚙️ CRUD Operations", "📈 Analysis", "🤖 AI Chatbot"])
 
@@ -73,26 +80,20 @@ with tab1:
     st.subheader("Data Science Dashboard Overview")
     
     try:
-        conn = connect_db()
-        datasets_df = pd.read_sql_query(
-            "SELECT * FROM datasets_metadata",
-            conn
-        )
-        conn.close()
+        datasets_df = data.table("datasets_metadata")
         
         if not datasets_df.empty:
             # Metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("📊 Total Datasets", len(datasets_df))
+            totals = dataset_totals()
             with col2:
-                categories = datasets_df['category'].nunique() if 'category' in datasets_df.columns else 0
-                st.metric("📁 Categories", categories)
+                st.metric("📁 Categories", totals['categories'])
             with col3:
-                sources = datasets_df['source'].nunique() if 'source' in datasets_df.columns else 0
-                st.metric("📍 Sources", sources)
+                st.metric("📍 Sources", totals['sources'])
             with col4:
-                total_size = datasets_df['size'].sum() if 'size' in datasets_df.columns else 0
+                total_size = totals['total_size']
                 st.metric("💾 Total Size (MB)", int(total_size / 1024) if total_size > 0 else 0)
             
             st.divider()
@@ -158,9 +159,7 @@ with tab2:
         st.write("### 📖 View All Datasets")
         
         try:
-            conn = connect_db()
-            datasets = pd.read_sql_query("SELECT * FROM datasets_metadata", conn)
-            conn.close()
+            datasets = data.table("datasets_metadata")
             
             if not datasets.empty:
                 st.dataframe(datasets, use_container_width=True, hide_index=True)
@@ -244,49 +243,47 @@ with tab3:
     st.divider()
     
     try:
-        conn = connect_db()
-        datasets_df = pd.read_sql_query(
-            "SELECT * FROM datasets_metadata",
-            conn
-        )
-        conn.close()
+        totals = dataset_totals()
         
-        if not datasets_df.empty:
+        if totals['total']:
             col1, col2 = st.columns(2)
             
             # Chart 1: Datasets by Category
             with col1:
                 st.write("#### 📊 Datasets by Category")
                 try:
-                    if 'category' in datasets_df.columns:
-                        category_counts = datasets_df['category'].value_counts()
-                        
-                        if category_chart_type == "Bar":
-                            fig1 = px.bar(
-                                x=category_counts.index,
-                                y=category_counts.values,
-                                labels={'x': 'Category', 'y': 'Count'},
-                                color=category_counts.values,
-                                color_continuous_scale="Blues"
-                            )
-                            fig1.update_layout(xaxis_title="Category", yaxis_title="Count", showlegend=False)
-                        elif category_chart_type == "Pie":
-                            fig1 = px.pie(
-                                values=category_counts.values,
-                                names=category_counts.index,
-                                title="Category Distribution"
-                            )
-                        else:  # Horizontal
-                            fig1 = px.bar(
-                                y=category_counts.index,
-                                x=category_counts.values,
-                                orientation='h',
-                                labels={'x': 'Count', 'y': 'Category'},
-                                color=category_counts.values,
-                                color_continuous_scale="Blues"
-                            )
-                            fig1.update_layout(yaxis_title="Category", xaxis_title="Count", showlegend=False)
+                    category_counts = as_counts(category_breakdown())
+                    if not category_counts.empty:
                         
+                        fig1 = figure_cache.get("datasets_metadata", "category", category_chart_type)
+                        if fig1 is None:
+                            if category_chart_type == "Bar":
+                                fig1 = px.bar(
+                                    x=category_counts.index,
+                                    y=category_counts.values,
+                                    labels={'x': 'Category', 'y': 'Count'},
+                                    color=category_counts.values,
+                                    color_continuous_scale="Blues"
+                                )
+                                fig1.update_layout(xaxis_title="Category", yaxis_title="Count", showlegend=False)
+                            elif category_chart_type == "Pie":
+                                fig1 = px.pie(
+                                    values=category_counts.values,
+                                    names=category_counts.index,
+                                    title="Category Distribution"
+                                )
+                            else:  # Horizontal
+                                fig1 = px.bar(
+                                    y=category_counts.index,
+                                    x=category_counts.values,
+                                    orientation='h',
+                                    labels={'x': 'Count', 'y': 'Category'},
+                                    color=category_counts.values,
+                                    color_continuous_scale="Blues"
+                                )
+                                fig1.update_layout(yaxis_title="Category", xaxis_title="Count", showlegend=False)
+                            fig1 = figure_cache.put("datasets_metadata", "category", category_chart_type, fig1)
+
                         st.plotly_chart(fig1, use_container_width=True)
                     else:
                         st.info("ℹ️ No category column available")
@@ -297,32 +294,35 @@ with tab3:
             with col2:
                 st.write("#### 📍 Datasets by Source")
                 try:
-                    if 'source' in datasets_df.columns:
-                        source_counts = datasets_df['source'].value_counts()
-                        
-                        if source_chart_type == "Pie":
-                            fig2 = px.pie(
-                                values=source_counts.values,
-                                names=source_counts.index,
-                                title="Source Distribution"
-                            )
-                        elif source_chart_type == "Bar":
-                            fig2 = px.bar(
-                                x=source_counts.index,
-                                y=source_counts.values,
-                                labels={'x': 'Source', 'y': 'Count'},
-                                color=source_counts.values,
-                                color_continuous_scale="Greens"
-                            )
-                            fig2.update_layout(xaxis_title="Source", yaxis_title="Count", showlegend=False)
-                        else:  # Donut
-                            fig2 = px.pie(
-                                values=source_counts.values,
-                                names=source_counts.index,
-                                hole=0.3,
-                                title="Source Distribution"
-                            )
+                    source_counts = as_counts(source_breakdown())
+                    if not source_counts.empty:
                         
+                        fig2 = figure_cache.get("datasets_metadata", "source", source_chart_type)
+                        if fig2 is None:
+                            if source_chart_type == "Pie":
+                                fig2 = px.pie(
+                                    values=source_counts.values,
+                                    names=source_counts.index,
+                                    title="Source Distribution"
+                                )
+                            elif source_chart_type == "Bar":
+                                fig2 = px.bar(
+                                    x=source_counts.index,
+                                    y=source_counts.values,
+                                    labels={'x': 'Source', 'y': 'Count'},
+                                    color=source_counts.values,
+                                    color_continuous_scale="Greens"
+                                )
+                                fig2.update_layout(xaxis_title="Source", yaxis_title="Count", showlegend=False)
+                            else:  # Donut
+                                fig2 = px.pie(
+                                    values=source_counts.values,
+                                    names=source_counts.index,
+                                    hole=0.3,
+                                    title="Source Distribution"
+                                )
+                            fig2 = figure_cache.put("datasets_metadata", "source", source_chart_type, fig2)
+
                         st.plotly_chart(fig2, use_container_width=True)
                     else:
                         st.info("ℹ️ No source column available")
@@ -335,9 +335,9 @@ with tab3:
             st.write("#### 📈 Dataset Summary Statistics")
             try:
                 summary_data = {
-                    'Total Datasets': len(datasets_df),
-                    'Unique Sources': datasets_df['source'].nunique() if 'source' in datasets_df.columns else 0,
-                    'Unique Categories': datasets_df['category'].nunique() if 'category' in datasets_df.columns else 0,
+                    'Total Datasets': totals['total'],
+                    'Unique Sources': totals['sources'],
+                    'Unique Categories': totals['categories'],
                 }
                 
                 col1, col2, col3 = st.columns(3)
@@ -365,19 +365,15 @@ with tab4:
     with col2:
         if st.button("🧠 Load Context", use_container_width=True):
             try:
-                conn = connect_db()
-                datasets_df = pd.read_sql_query(
-                    "SELECT * FROM datasets_metadata",
-                    conn
-                )
-                conn.close()
+                totals = dataset_totals()
+                category_counts = as_counts(category_breakdown())
                 
                 context = f"""
 Current Data Science Metrics:
-- Total Datasets: {len(datasets_df)}
-- Categories: {datasets_df['category'].nunique() if 'category' in datasets_df.columns else 0}
-- Sources: {datasets_df['source'].nunique() if 'source' in datasets_df.columns else 0}
-- Top Categories: {', '.join(datasets_df['category'].value_counts().head(3).index.tolist()) if 'category' in datasets_df.columns else 'N/A'}
+- Total Datasets: {totals['total']}
+- Categories: {totals['categories']}
+- Sources: {totals['sources']}
+- Top Categories: {', '.join(category_counts.head(3).index.tolist()) if not category_counts.empty else 'N/A'}
                 """
                 
                 st.session_state.ai_context_ds = context
@@ -4,6 +4,11 @@ import plotly.express as px
 import sqlite3
 from datetime import datetime
 import openai
+from app.data.context import DataContext
+from app.data.figure_cache import figure_cache
+from app.data.normalize import normalize_label
+from app.data.search import search_tickets
+from app.data.stats import as_counts, status_breakdown, priority_breakdown
 
 
 # PAGE CONFIG & AUTHENTICATION
@@ -65,6 +70,10 @@ st.title("🔧 IT Operations Domain")
 st.markdown("---")
 
 
+# Tables are loaded at most once per rerun and shared by every tab
+data = DataContext()
+
+
 # TABS STRUCTURE
 tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "⚙️ CRUD Operations", "📈 Analysis", "🤖 AI Chatbot"])
 
@@ -74,28 +83,37 @@ with tab1:
     st.subheader("IT Operations Dashboard Overview")
     
     try:
-        conn = connect_db()
-        tickets_df = pd.read_sql_query(
-            "SELECT * FROM it_tickets",
-            conn
-        )
-        conn.close()
+        tickets_df = data.table("it_tickets")
         
         if not tickets_df.empty:
             # Metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("🎫 Total Tickets", len(tickets_df))
+            status_counts = as_counts(status_breakdown("it_tickets"))
             with col2:
-                open_tickets = len(tickets_df[tickets_df['status'].str.lower() == 'open'])
-                st.metric("📖 Open", open_tickets)
+                st.metric("📖 Open", int(status_counts.get('open', 0)))
             with col3:
-                in_progress = len(tickets_df[tickets_df['status'].str.lower() == 'in-progress'])
-                st.metric("⏳ In Progress", in_progress)
+                st.metric("⏳ In Progress", int(status_counts.get('in-progress', 0)))
             with col4:
-                closed = len(tickets_df[tickets_df['status'].str.lower() == 'closed'])
-                st.metric("✅ Closed", closed)
+                st.metric("✅ Closed", int(status_counts.get('closed', 0)))
             
+            st.divider()
+            st.write("### 🔍 Search Tickets")
+            search_query = st.text_input(
+                "Search tickets",
+                placeholder="e.g., printer offline",
+                key="ticket_search"
+            )
+            if search_query:
+                matches = search_tickets(search_query, limit=50)
+                if matches.empty:
+                    st.info("ℹ️ No matching tickets")
+                else:
+                    st.caption(f"{len(matches)} best matches")
+                    for _, match in matches.iterrows():
+                        st.markdown(f"**#{match['id']}** {match['snippet']}")
+
             st.divider()
             st.write("### 📋 All Tickets")
             st.dataframe(tickets_df, use_container_width=True, hide_index=True)
@@ -144,7 +162,7 @@ with tab2:
                             INSERT INTO it_tickets 
                             (title, priority, status, created_date)
                             VALUES (?, ?, ?, ?)
-                        """, (title, priority, status, datetime.now()))
+                        """, (title, normalize_label(priority), normalize_label(status), datetime.now()))
                         conn.commit()
                         conn.close()
                         st.success("✅ Ticket created successfully!")
@@ -157,9 +175,7 @@ with tab2:
         st.write("### 📖 View All Tickets")
         
         try:
-            conn = connect_db()
-            tickets = pd.read_sql_query("SELECT * FROM it_tickets", conn)
-            conn.close()
+            tickets = data.table("it_tickets")
             
             if not tickets.empty:
                 st.dataframe(tickets, use_container_width=True, hide_index=True)
@@ -188,10 +204,10 @@ with tab2:
                     
                     if status != "skip":
                         updates.append("status = ?")
-                        params.append(status)
+                        params.append(normalize_label(status))
                     if priority != "skip":
                         updates.append("priority = ?")
-                        params.append(priority)
+                        params.append(normalize_label(priority))
                     
                     if not updates:
                         st.warning("⚠️ No fields to update")
@@ -242,56 +258,52 @@ with tab3:
     st.divider()
     
     try:
-        conn = connect_db()
-        tickets_df = pd.read_sql_query(
-            "SELECT * FROM it_tickets",
-            conn
-        )
-        conn.close()
+        status_counts = as_counts(status_breakdown("it_tickets"))
         
-        if not tickets_df.empty:
+        if not status_counts.empty:
             col1, col2 = st.columns(2)
             
             # Chart 1: Tickets by Status
             with col1:
                 st.write("#### 📊 Tickets by Status")
                 try:
-                    status_counts = tickets_df['status'].value_counts()
-                    
-                    if status_chart_type == "Bar":
-                        fig1 = px.bar(
-                            x=status_counts.index,
-                            y=status_counts.values,
-                            labels={'x': 'Status', 'y': 'Count'},
-                            color=status_counts.index,
-                            color_discrete_map={
-                                'open': '#1f77b4',
-                                'in-progress': '#ff7f0e',
-                                'closed': '#2ca02c'
-                            }
-                        )
-                        fig1.update_layout(xaxis_title="Status", yaxis_title="Count", showlegend=False)
-                    elif status_chart_type == "Pie":
-                        fig1 = px.pie(
-                            values=status_counts.values,
-                            names=status_counts.index,
-                            title="Status Distribution"
-                        )
-                    else:  # Horizontal
-                        fig1 = px.bar(
-                            y=status_counts.index,
-                            x=status_counts.values,
-                            orientation='h',
-                            labels={'x': 'Count', 'y': 'Status'},
-                            color=status_counts.index,
-                            color_discrete_map={
-                                'open': '#1f77b4',
-                                'in-progress': '#ff7f0e',
-                                'closed': '#2ca02c'
-                            }
-                        )
-                        fig1.update_layout(yaxis_title="Status", xaxis_title="Count", showlegend=False)
-                    
+                    fig1 = figure_cache.get("it_tickets", "status", status_chart_type)
+                    if fig1 is None:
+                        if status_chart_type == "Bar":
+                            fig1 = px.bar(
+                                x=status_counts.index,
+                                y=status_counts.values,
+                                labels={'x': 'Status', 'y': 'Count'},
+                                color=status_counts.index,
+                                color_discrete_map={
+                                    'open': '#1f77b4',
+                                    'in-progress': '#ff7f0e',
+                                    'closed': '#2ca02c'
+                                }
+                            )
+                            fig1.update_layout(xaxis_title="Status", yaxis_title="Count", showlegend=False)
+                        elif status_chart_type == "Pie":
+                            fig1 = px.pie(
+                                values=status_counts.values,
+                                names=status_counts.index,
+                                title="Status Distribution"
+                            )
+                        else:  # Horizontal
+                            fig1 = px.bar(
+                                y=status_counts.index,
+                                x=status_counts.values,
+                                orientation='h',
+                                labels={'x': 'Count', 'y': 'Status'},
+                                color=status_counts.index,
+                                color_discrete_map={
+                                    'open': '#1f77b4',
+                                    'in-progress': '#ff7f0e',
+                                    'closed': '#2ca02c'
+                                }
+                            )
+                            fig1.update_layout(yaxis_title="Status", xaxis_title="Count", showlegend=False)
+                        fig1 = figure_cache.put("it_tickets", "status", status_chart_type, fig1)
+
                     st.plotly_chart(fig1, use_container_width=True)
                 except Exception as e:
                     st.warning(f"⚠️ Could not create status chart: {str(e)}")
@@ -300,31 +312,33 @@ with tab3:
             with col2:
                 st.write("#### 🎯 Tickets by Priority")
                 try:
-                    priority_counts = tickets_df['priority'].value_counts()
-                    
-                    if priority_chart_type == "Pie":
-                        fig2 = px.pie(
-                            values=priority_counts.values,
-                            names=priority_counts.index,
-                            title="Priority Distribution"
-                        )
-                    elif priority_chart_type == "Bar":
-                        fig2 = px.bar(
-                            x=priority_counts.index,
-                            y=priority_counts.values,
-                            labels={'x': 'Priority', 'y': 'Count'},
-                            color=priority_counts.values,
-                            color_continuous_scale="Oranges"
-                        )
-                        fig2.update_layout(xaxis_title="Priority", yaxis_title="Count", showlegend=False)
-                    else:  
-                        fig2 = px.pie(
-                            values=priority_counts.values,
-                            names=priority_counts.index,
-                            hole=0.3,
-                            title="Priority Distribution"
-                        )
-                    
+                    fig2 = figure_cache.get("it_tickets", "priority", priority_chart_type)
+                    if fig2 is None:
+                        priority_counts = as_counts(priority_breakdown())
+                        if priority_chart_type == "Pie":
+                            fig2 = px.pie(
+                                values=priority_counts.values,
+                                names=priority_counts.index,
+                                title="Priority Distribution"
+                            )
+                        elif priority_chart_type == "Bar":
+                            fig2 = px.bar(
+                                x=priority_counts.index,
+                                y=priority_counts.values,
+                                labels={'x': 'Priority', 'y': 'Count'},
+                                color=priority_counts.values,
+                                color_continuous_scale="Oranges"
+                            )
+                            fig2.update_layout(xaxis_title="Priority", yaxis_title="Count", showlegend=False)
+                        else:  
+                            fig2 = px.pie(
+                                values=priority_counts.values,
+                                names=priority_counts.index,
+                                hole=0.3,
+                                title="Priority Distribution"
+                            )
+                        fig2 = figure_cache.put("it_tickets", "priority", priority_chart_type, fig2)
+
                     st.plotly_chart(fig2, use_container_width=True)
                 except Exception as e:
                     st.warning(f"⚠️ Could not create priority chart: {str(e)}")
@@ -335,9 +349,9 @@ with tab3:
             st.write("#### 📈 Ticket Summary")
             try:
                 summary_data = {
-                    'Total Tickets': len(tickets_df),
-                    'Open': len(tickets_df[tickets_df['status'].str.lower() == 'open']),
-                    'Closed': len(tickets_df[tickets_df['status'].str.lower() == 'closed']),
+                    'Total Tickets': int(status_counts.sum()),
+                    'Open': int(status_counts.get('open', 0)),
+                    'Closed': int(status_counts.get('closed', 0)),
                 }
                 
                 if summary_metric == "Metrics":
@@ -348,32 +362,35 @@ with tab3:
                         st.metric("📖 Open", summary_data['Open'])
                     with col3:
                         st.metric("✅ Closed", summary_data['Closed'])
-                elif summary_metric == "Bar Chart":
-                    summary_df = pd.DataFrame({
-                        'Status': ['Total', 'Open', 'Closed'],
-                        'Count': [summary_data['Total Tickets'], summary_data['Open'], summary_data['Closed']]
-                    })
-                    fig3 = px.bar(
-                        summary_df,
-                        x='Status',
-                        y='Count',
-                        color='Status',
-                        title="Ticket Summary",
-                        labels={'Count': 'Number of Tickets'}
-                    )
-                    fig3.update_layout(showlegend=False)
-                    st.plotly_chart(fig3, use_container_width=True)
-                else:  # Pie Chart
-                    summary_df = pd.DataFrame({
-                        'Status': ['Open', 'Closed'],
-                        'Count': [summary_data['Open'], summary_data['Closed']]
-                    })
-                    fig3 = px.pie(
-                        summary_df,
-                        values='Count',
-                        names='Status',
-                        title="Ticket Status Distribution"
-                    )
+                else:
+                    fig3 = figure_cache.get("it_tickets", "summary", summary_metric)
+                    if fig3 is None:
+                        if summary_metric == "Bar Chart":
+                            summary_df = pd.DataFrame({
+                                'Status': ['Total', 'Open', 'Closed'],
+                                'Count': [summary_data['Total Tickets'], summary_data['Open'], summary_data['Closed']]
+                            })
+                            fig3 = px.bar(
+                                summary_df,
+                                x='Status',
+                                y='Count',
+                                color='Status',
+                                title="Ticket Summary",
+                                labels={'Count': 'Number of Tickets'}
+                            )
+                            fig3.update_layout(showlegend=False)
+                        else:  # Pie Chart
+                            summary_df = pd.DataFrame({
+                                'Status': ['Open', 'Closed'],
+                                'Count': [summary_data['Open'], summary_data['Closed']]
+                            })
+                            fig3 = px.pie(
+                                summary_df,
+                                values='Count',
+                                names='Status',
+                                title="Ticket Status Distribution"
+                            )
+                        fig3 = figure_cache.put("it_tickets", "summary", summary_metric, fig3)
                     st.plotly_chart(fig3, use_container_width=True)
             except Exception as e:
                 st.warning(f"⚠️ Could not create summary: {str(e)}")
@@ -393,24 +410,20 @@ with tab4:
     with col2:
         if st.button("🧠 Load Context", use_container_width=True):
             try:
-                conn = connect_db()
-                tickets_df = pd.read_sql_query(
-                    "SELECT * FROM it_tickets",
-                    conn
-                )
-                conn.close()
+                status_counts = as_counts(status_breakdown("it_tickets"))
+                priority_counts = as_counts(priority_breakdown())
                 
-                open_count = len(tickets_df[tickets_df['status'].str.lower() == 'open'])
-                closed_count = len(tickets_df[tickets_df['status'].str.lower() == 'closed'])
-                in_progress = len(tickets_df[tickets_df['status'].str.lower() == 'in-progress'])
+                open_count = int(status_counts.get('open', 0))
+                closed_count = int(status_counts.get('closed', 0))
+                in_progress = int(status_counts.get('in-progress', 0))
                 
                 context = f"""
 Current IT Operations Data:
-- Total Tickets: {len(tickets_df)}
+- Total Tickets: {int(status_counts.sum())}
 - Open: {open_count}
 - In Progress: {in_progress}
 - Closed: {closed_count}
-- Priority Breakdown: {dict(tickets_df['priority'].value_counts())}
+- Priority Breakdown: {priority_counts.to_dict()}
                 """
                 
                 st.session_state.ai_context = context